@@ -0,0 +1,131 @@
+"""
+Response serialization microbenchmark: the stock encoders both servers used before versus
+career_flask_api/fast_json.py, on /predict/json and /predict/batch shaped payloads with and
+without "classes" (lean mode). No artifacts or server needed.
+
+  python bench_serialization.py [--classes 24] [--top-k 3] [--batch 32] [--seconds 0.5]
+                                [--out serialization.json]
+
+Encoders compared per payload:
+
+  fastapi_stock  jsonable_encoder + JSONResponse.render (what a returned dict went through)
+  fastapi_fast   FastJSONResponse.render via fast_json.dumps (what the routes return now)
+  flask_stock    DefaultJSONProvider: json.dumps(sort_keys=True, compact) + newline
+  flask_fast     FastJSONProvider: fast_json.dumps(sort_keys=True) + newline
+
+fast_json uses orjson when it is installed; without it the *_fast rows measure the stdlib
+fallback. FastAPI rows are skipped when FastAPI is not installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "career_flask_api"))
+import fast_json  # noqa: E402
+
+_FIELDS = ("Software", "Data", "Health", "Finance", "Design", "Education", "Marketing", "Legal")
+_ROLES = ("Engineering", "Analytics", "Operations", "Research", "Consulting", "Management")
+
+
+def _class_names(n: int) -> list[str]:
+    names = [f"{field} {role}" for role in _ROLES for field in _FIELDS]
+    return [names[i % len(names)] + (f" {i // len(names) + 1}" if i >= len(names) else "") for i in range(n)]
+
+
+def _prediction(rng: random.Random, classes: list[str], top_k: int) -> dict[str, Any]:
+    """One /predict/json body without "classes" (the shape of predict_api._response)."""
+    picks = rng.sample(range(len(classes)), min(top_k, len(classes)))
+    probs = sorted((rng.random() for _ in picks), reverse=True)
+    return {
+        "predicted_category": classes[picks[0]],
+        "label_index": picks[0],
+        "top_predictions": [{"label": classes[i], "probability": p} for i, p in zip(picks, probs)],
+    }
+
+
+def payloads(n_classes: int, top_k: int, batch: int, seed: int = 0) -> dict[str, dict[str, Any]]:
+    rng = random.Random(seed)
+    classes = _class_names(n_classes)
+    single = _prediction(rng, classes, top_k)
+    rows = [_prediction(rng, classes, top_k) for _ in range(batch)]
+    return {
+        "predict_json_full": {**single, "classes": tuple(classes)},
+        "predict_json_lean": single,
+        f"predict_batch_{batch}_full": {"results": rows, "classes": tuple(classes)},
+        f"predict_batch_{batch}_lean": {"results": rows},
+    }
+
+
+def encoders() -> dict[str, Callable[[Any], bytes]]:
+    out: dict[str, Callable[[Any], bytes]] = {}
+    try:
+        from fastapi.encoders import jsonable_encoder
+        from fastapi.responses import JSONResponse
+    except ImportError:
+        pass
+    else:
+        out["fastapi_stock"] = lambda obj: JSONResponse(jsonable_encoder(obj)).body
+        out["fastapi_fast"] = fast_json.dumps
+    out["flask_stock"] = lambda obj: (json.dumps(obj, sort_keys=True, separators=(",", ":")) + "\n").encode()
+    out["flask_fast"] = lambda obj: fast_json.dumps(obj, sort_keys=True) + b"\n"
+    return out
+
+
+def _time_us(fn: Callable[[Any], bytes], obj: Any, min_seconds: float) -> float:
+    for _ in range(50):
+        fn(obj)
+    calls, started = 0, time.perf_counter()
+    while calls < 100 or time.perf_counter() - started < min_seconds:
+        for _ in range(100):
+            fn(obj)
+        calls += 100
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare response serializers on prediction payloads.")
+    parser.add_argument("--classes", type=int, default=24)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=0.5, help="minimum timing per (payload, encoder)")
+    parser.add_argument("--out", type=Path, help="also write the results as JSON")
+    args = parser.parse_args()
+
+    results: list[dict[str, Any]] = []
+    print(f"fast_json backend: {fast_json.BACKEND}")
+    print(f"{'payload':<26} {'encoder':<14} {'us/call':>9} {'bytes':>7} {'speed-up':>9}")
+    for name, obj in payloads(args.classes, args.top_k, args.batch).items():
+        stock: dict[str, float] = {}
+        for enc_name, fn in encoders().items():
+            us = _time_us(fn, obj, args.seconds)
+            framework, kind = enc_name.split("_")
+            if kind == "stock":
+                stock[framework] = us
+            speedup = stock[framework] / us if kind == "fast" and framework in stock else None
+            results.append(
+                {
+                    "payload": name,
+                    "encoder": enc_name,
+                    "us_per_call": round(us, 3),
+                    "bytes": len(fn(obj)),
+                    "speedup_vs_stock": round(speedup, 2) if speedup else None,
+                }
+            )
+            print(f"{name:<26} {enc_name:<14} {us:>9.2f} {len(fn(obj)):>7}" + (f" {speedup:>8.1f}x" if speedup else ""))
+    if args.out:
+        report = {"backend": fast_json.BACKEND, "params": vars(args) | {"out": str(args.out)}, "results": results}
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nWrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
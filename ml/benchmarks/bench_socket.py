@@ -0,0 +1,219 @@
+"""
+Unix-socket binary endpoint (career_flask_api/socket_server.py) against the HTTP path it
+replaces: both servers are started on the same synthetic artifacts with the same worker count,
+and one caller measures each transport in turn on the same texts.
+
+  python bench_socket.py [--http-target flask-prefork|flask-dev] [--workers 1] [--codec msgpack]
+                         [--modes single,pipelined,batch] [--batch-size 32] [--window 16]
+                         [--duration 5] [--out socket.json]
+
+Modes (every request asks for the top 3 careers):
+
+  single     one text per round trip: POST /recommend-top3 vs one frame
+  pipelined  socket only: --window one-text frames written back to back, then read
+             (compare its rows_per_second with HTTP "single"; http.client does not pipeline)
+  batch      --batch-size texts per round trip: POST /recommend-batch vs one frame
+
+Per mode and transport: round trips and rows per second, latency p50 / p95 / p99 / max in ms
+(per round trip; a pipelined window counts as one), and errors. The prediction cache is off
+unless --cache is given. msgpack must be installed for the default codec (or use --codec json).
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent / "career_flask_api"))
+from load_test import (  # noqa: E402
+    FLASK_DIR,
+    _latency_ms,
+    _text,
+    build_request,
+    server_env,
+    start_server,
+    stop_server,
+    synthetic_corpus,
+    wait_ready,
+)
+from run_benchmarks import _git_commit, _versions  # noqa: E402
+from socket_client import CareerSocketClient, CareerSocketError  # noqa: E402
+from synthetic_artifacts import MODEL_KINDS, write_synthetic_artifacts  # noqa: E402
+
+MODES = ("single", "pipelined", "batch")
+
+
+def start_socket_server(path: Path, artifacts: Path, workers: int, codec: str, cache: bool, log_path: Path) -> subprocess.Popen:
+    cmd = [sys.executable, "socket_server.py", "--path", str(path), "--workers", str(workers), "--codec", codec]
+    log = open(log_path, "wb")
+    proc = subprocess.Popen(
+        cmd, cwd=FLASK_DIR, env=server_env(artifacts, workers, cache), stdout=log, stderr=subprocess.STDOUT,
+        start_new_session=True,
+    )
+    log.close()
+    return proc
+
+
+def wait_socket(path: Path, codec: str, proc: subprocess.Popen, timeout: float) -> None:
+    """The socket is bound after the model has loaded, so the first successful info() means ready."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"socket server exited with code {proc.returncode}")
+        try:
+            with CareerSocketClient(str(path), codec, timeout=2) as client:
+                client.info()
+                return
+        except (OSError, CareerSocketError):
+            time.sleep(0.2)
+    raise RuntimeError(f"socket server not ready after {timeout:.0f}s")
+
+
+def measure(call: Callable[[int], int], rows: int, duration: float, warmup: float) -> dict[str, Any]:
+    """Run call(i) (-> errors in that round trip) back to back: `warmup` seconds, then `duration` measured."""
+    i = 0
+    stop_warmup = time.perf_counter() + warmup
+    while time.perf_counter() < stop_warmup:
+        call(i)
+        i += 1
+    times: list[float] = []
+    errors = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        t0 = time.perf_counter()
+        errors += call(i)
+        times.append(time.perf_counter() - t0)
+        i += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "round_trips": len(times),
+        "round_trips_per_second": round(len(times) / elapsed, 1),
+        "rows_per_second": round(len(times) * rows / elapsed, 1),
+        "errors": errors,
+        "latency": _latency_ms(times),
+    }
+
+
+def _http_caller(base_url: str, mode: str, texts: list[list[dict[str, str]]]) -> Callable[[int], int]:
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=25)
+    kind = "batch" if mode == "batch" else "top3"
+    bodies = [build_request("flask", kind, profiles)[:2] for profiles in texts]
+    headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+    def call(i: int) -> int:
+        path, body = bodies[i % len(bodies)]
+        conn.request("POST", path, body, headers)
+        resp = conn.getresponse()
+        resp.read()
+        return 0 if resp.status == 200 else 1
+
+    return call
+
+
+def _socket_caller(client: CareerSocketClient, mode: str, texts: list[list[dict[str, str]]]) -> Callable[[int], int]:
+    if mode == "pipelined":  # one frame per text, all written before the first answer is read
+        trips = [[{"op": "predict", "texts": [_text(p)], "k": 3} for p in profiles] for profiles in texts]
+    else:
+        trips = [[{"op": "predict", "texts": [_text(p) for p in profiles], "k": 3}] for profiles in texts]
+
+    def call(i: int) -> int:
+        responses = client.call(trips[i % len(trips)])
+        return sum(1 for r in responses if not r.get("ok"))
+
+    return call
+
+
+def _round_trips(corpus: list[dict[str, str]], rows: int, seed: int) -> list[list[dict[str, str]]]:
+    """500 round trips' worth of profiles, `rows` each, the same for both transports."""
+    rng = random.Random(seed)
+    return [[rng.choice(corpus) for _ in range(rows)] for _ in range(500)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the Unix-socket endpoint with the HTTP path.")
+    parser.add_argument("--http-target", choices=("flask-prefork", "flask-dev"), default="flask-prefork")
+    parser.add_argument("--workers", type=int, default=1, help="processes for both servers")
+    parser.add_argument("--codec", choices=("msgpack", "json"), default="msgpack")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"comma-separated: {','.join(MODES)}")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--window", type=int, default=16, help="frames per pipelined window")
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per mode and transport")
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument("--model", choices=MODEL_KINDS, default="lr", help="synthetic model kind")
+    parser.add_argument("--classes", type=int, default=12)
+    parser.add_argument("--docs-per-class", type=int, default=150)
+    parser.add_argument("--cache", action="store_true", help="keep the servers' prediction cache on")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ready-timeout", type=float, default=120.0)
+    parser.add_argument("--artifacts-dir", type=Path, help="keep generated artifacts and server logs here")
+    parser.add_argument("--out", type=Path, default=Path("socket_results.json"))
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        raise SystemExit(f"--modes: unknown {', '.join(sorted(unknown))} (use {', '.join(MODES)})")
+    work_dir = args.artifacts_dir or Path(tempfile.mkdtemp(prefix="career-socket-"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    artifacts = work_dir / args.model
+    write_synthetic_artifacts(artifacts, args.model, args.classes, args.docs_per_class, args.seed)
+    corpus = synthetic_corpus(2000, args.classes, args.seed + 1)
+    sock_path = work_dir / "career-api.sock"
+
+    http_proc, base_url = start_server(args.http_target, artifacts, args.workers, args.cache, work_dir / "http.log")
+    sock_proc = start_socket_server(sock_path, artifacts, args.workers, args.codec, args.cache, work_dir / "socket.log")
+    results: list[dict[str, Any]] = []
+    try:
+        wait_ready(base_url, http_proc, args.ready_timeout)
+        wait_socket(sock_path, args.codec, sock_proc, args.ready_timeout)
+        print(f"{'mode':<10} {'transport':<10} {'trips/s':>9} {'rows/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        with CareerSocketClient(str(sock_path), args.codec) as client:
+            for mode in modes:
+                rows = args.batch_size if mode == "batch" else args.window if mode == "pipelined" else 1
+                texts = _round_trips(corpus, rows, args.seed)
+                callers = {} if mode == "pipelined" else {"http": _http_caller(base_url, mode, texts)}
+                callers["socket"] = _socket_caller(client, mode, texts)
+                for transport, call in callers.items():
+                    r = measure(call, rows, args.duration, args.warmup)
+                    results.append({"mode": mode, "transport": transport, "rows_per_round_trip": rows, **r})
+                    lat = r["latency"]
+                    print(
+                        f"{mode:<10} {transport:<10} {r['round_trips_per_second']:>9.1f} {r['rows_per_second']:>9.1f}"
+                        f" {lat['p50_ms']:>8.3f} {lat['p95_ms']:>8.3f} {lat['p99_ms']:>8.3f} {r['errors']:>6}",
+                        flush=True,
+                    )
+    finally:
+        stop_server(sock_proc)
+        stop_server(http_proc)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "cpu_count": os.cpu_count(),
+            "versions": _versions(),
+            "params": vars(args) | {"out": str(args.out), "artifacts_dir": str(work_dir)},
+        },
+        "results": results,
+    }
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nWrote {args.out}")
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
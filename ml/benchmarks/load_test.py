@@ -0,0 +1,438 @@
+"""
+HTTP load test for career_flask_api (app.py) and predict_api.py, standing in for the .NET
+MlInterestPredictService: start a server locally on synthetic artifacts (see
+synthetic_artifacts.py), replay a profile corpus at a given concurrency and request mix, and
+report latency percentiles, throughput and errors.
+
+  python load_test.py [--targets flask-dev,flask-prefork,fastapi,fastapi-batched] [--model lr]
+                      [--concurrency 1,4,16,64] [--duration 10] [--mix best=0.5,top3=0.4,batch=0.1]
+                      [--batch-size 32] [--workers 2] [--corpus profiles.jsonl]
+                      [--out load.json] [--compare earlier.json]
+  python load_test.py --url http://127.0.0.1:5052 --api flask     # a server that is already running
+
+Targets (each started in turn on a free port, stopped after its run):
+
+  flask-dev        python app.py (Werkzeug threaded dev server)
+  flask-prefork    gunicorn -c gunicorn.conf.py app:app, --workers processes x CAREER_THREADS
+  fastapi          uvicorn predict_api:app --workers N
+  fastapi-batched  the same with CAREER_MICROBATCH=1
+
+Request kinds, as the .NET service sends them:
+
+  best   Flask POST /recommend-career {"text"}          FastAPI POST /predict/json (five profile fields)
+  top3   Flask POST /recommend-top3 {"text"}            FastAPI POST /predict/json with top_k 3
+  batch  Flask POST /recommend-batch (--batch-size)     FastAPI POST /predict/batch (--batch-size)
+
+Each concurrency level runs --concurrency client threads in a closed loop (a client sends its
+next request when the previous answer arrives), over keep-alive connections, for --duration
+seconds after a --warmup. Measured per level:
+
+  throughput_rps / rows_per_second   completed requests (and profiles scored) per second
+  latency                            p50 / p95 / p99 / max in ms, overall and per request kind
+  error_rate / status                non-2xx answers and connection errors, by status
+
+The prediction cache is off (CAREER_CACHE_SIZE=0) unless --cache is given, so repeated corpus
+entries are scored again. Client and server share the machine: compare runs from the same box.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+HERE = Path(__file__).resolve().parent
+ML_DIR = HERE.parent
+FLASK_DIR = ML_DIR / "career_flask_api"
+TARGETS = ("flask-dev", "flask-prefork", "fastapi", "fastapi-batched")
+KINDS = ("best", "top3", "batch")
+# Same fields as predict_api.PredictBody, in the order both servers join them.
+PROFILE_FIELDS = ("interests", "skills", "certificate_course_title", "ug_course", "ug_specialization")
+# MlInterestPredictService's HttpClient timeout.
+_CLIENT_TIMEOUT = 25.0
+
+sys.path.insert(0, str(HERE))
+from run_benchmarks import _git_commit, _versions  # noqa: E402
+from synthetic_artifacts import MODEL_KINDS, synthetic_profiles, write_synthetic_artifacts  # noqa: E402
+
+
+# --- corpus and requests -----------------------------------------------------------------------
+
+
+def synthetic_corpus(n: int, n_classes: int, seed: int) -> list[dict[str, str]]:
+    """Profiles the model was not trained on, their words spread over the five survey fields."""
+    rng = random.Random(seed)
+    texts, _ = synthetic_profiles(n, n_classes=n_classes, seed=seed)
+    corpus = []
+    for text in texts:
+        words = text.split()
+        cuts = sorted(rng.randint(0, len(words)) for _ in range(len(PROFILE_FIELDS) - 1))
+        bounds = [0, *cuts, len(words)]
+        corpus.append({f: " ".join(words[a:b]) for f, a, b in zip(PROFILE_FIELDS, bounds, bounds[1:])})
+    return corpus
+
+
+def read_corpus(path: Path) -> list[dict[str, str]]:
+    """JSONL rows with "text" or the profile fields (the score_profiles.py input format)."""
+    corpus = []
+    with open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(row, dict):
+                continue
+            if isinstance(row.get("text"), str):
+                corpus.append({"interests": row["text"], **{f: "" for f in PROFILE_FIELDS[1:]}})
+            else:
+                corpus.append({f: str(row.get(f) or "") for f in PROFILE_FIELDS})
+    if not corpus:
+        raise SystemExit(f"{path}: no profiles")
+    return corpus
+
+
+def _text(profile: dict[str, str]) -> str:
+    """The .NET service's CombinedSurveyText: trimmed non-empty fields, space-joined, lowercased."""
+    return " ".join(p for p in (profile[f].strip() for f in PROFILE_FIELDS) if p).lower()
+
+
+def build_request(api: str, kind: str, profiles: list[dict[str, str]]) -> tuple[str, bytes, int]:
+    """(path, JSON body, rows scored) for one request of `kind`."""
+    if api == "flask":
+        if kind == "batch":
+            return "/recommend-batch", json.dumps({"texts": [_text(p) for p in profiles]}).encode(), len(profiles)
+        path = "/recommend-top3" if kind == "top3" else "/recommend-career"
+        return path, json.dumps({"text": _text(profiles[0])}).encode(), 1
+    if kind == "batch":
+        return "/predict/batch", json.dumps({"items": profiles}).encode(), len(profiles)
+    body = dict(profiles[0], top_k=3) if kind == "top3" else profiles[0]
+    return "/predict/json", json.dumps(body).encode(), 1
+
+
+def parse_mix(raw: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in KINDS:
+            raise SystemExit(f"--mix: unknown request kind {name!r} (use {', '.join(KINDS)})")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise SystemExit("--mix: give at least one positive weight")
+    return mix
+
+
+# --- servers -----------------------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_env(artifacts: Path, workers: int, cache: bool) -> dict[str, str]:
+    """Environment for a server process on `artifacts`, without reloads (and cache unless `cache`)."""
+    env = {
+        **os.environ,
+        "CAREER_MODEL_DIR": str(artifacts),
+        "CAREER_ARTIFACTS_DIR": str(artifacts),
+        "CAREER_RELOAD_INTERVAL": "0",
+        "CAREER_WORKERS": str(workers),
+        "PYTHONUNBUFFERED": "1",
+    }
+    if not cache:
+        env["CAREER_CACHE_SIZE"] = "0"
+    return env
+
+
+def start_server(target: str, artifacts: Path, workers: int, cache: bool, log_path: Path) -> tuple[subprocess.Popen, str]:
+    """Start `target` on a free port; returns (process, base URL). Output goes to log_path."""
+    port = _free_port()
+    env = {**server_env(artifacts, workers, cache), "HOST": "127.0.0.1", "PORT": str(port)}
+    if target == "flask-dev":
+        cmd, cwd = [sys.executable, "app.py"], FLASK_DIR
+    elif target == "flask-prefork":
+        # gunicorn.conf.py logs every request to stdout; that would load the box more than the server.
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--access-logfile", os.devnull, "app:app"]
+        cwd = FLASK_DIR
+    else:
+        cmd = [
+            sys.executable, "-m", "uvicorn", "predict_api:app", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--no-access-log",
+        ]
+        cwd = ML_DIR
+        if target == "fastapi-batched":
+            env["CAREER_MICROBATCH"] = "1"
+    log = open(log_path, "wb")
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    log.close()
+    return proc, f"http://127.0.0.1:{port}"
+
+
+def wait_ready(base_url: str, proc: subprocess.Popen | None, timeout: float) -> None:
+    """Poll GET /readyz until 200 (model loaded and warmed up)."""
+    url = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection(url.hostname, url.port, timeout=2)
+            conn.request("GET", "/readyz")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+            conn.close()
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"not ready after {timeout:.0f}s")
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except (AttributeError, ProcessLookupError):  # no process groups (Windows) / already gone
+        proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# --- load generation ---------------------------------------------------------------------------
+
+
+class _Client(threading.Thread):
+    """One closed-loop caller on one keep-alive connection, like a pooled HttpClient connection."""
+
+    def __init__(self, base_url: str, api: str, corpus: list[dict[str, str]], mix: dict[str, float],
+                 batch_size: int, seed: int, measure_from: float, stop_at: float) -> None:
+        super().__init__(daemon=True)
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port
+        self.api, self.corpus, self.batch_size = api, corpus, batch_size
+        self.kinds, self.weights = list(mix), list(mix.values())
+        self.rng = random.Random(seed)
+        self.measure_from, self.stop_at = measure_from, stop_at
+        # (kind, status or 0 for a connection error, seconds, rows) per measured request.
+        self.samples: list[tuple[str, int, float, int]] = []
+
+    def run(self) -> None:
+        conn: http.client.HTTPConnection | None = None
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        while True:
+            now = time.perf_counter()
+            if now >= self.stop_at:
+                break
+            kind = self.rng.choices(self.kinds, self.weights)[0]
+            n = self.batch_size if kind == "batch" else 1
+            start = self.rng.randrange(len(self.corpus))
+            profiles = [self.corpus[(start + i) % len(self.corpus)] for i in range(n)]
+            path, body, rows = build_request(self.api, kind, profiles)
+            t0 = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection(self.host, self.port, timeout=_CLIENT_TIMEOUT)
+                conn.request("POST", path, body, headers)
+                resp = conn.getresponse()
+                resp.read()
+                status = resp.status
+                if resp.will_close:
+                    conn.close()
+                    conn = None
+            except (OSError, http.client.HTTPException):
+                status = 0
+                if conn is not None:
+                    conn.close()
+                conn = None
+            elapsed = time.perf_counter() - t0
+            if t0 >= self.measure_from:
+                self.samples.append((kind, status, elapsed, rows))
+        if conn is not None:
+            conn.close()
+
+
+def _latency_ms(seconds: list[float]) -> dict[str, float | int | None]:
+    if not seconds:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    s = sorted(seconds)
+
+    def pct(p: float) -> float:
+        return round(s[min(len(s) - 1, int(p / 100 * len(s)))] * 1000, 3)
+
+    return {"count": len(s), "p50_ms": pct(50), "p95_ms": pct(95), "p99_ms": pct(99), "max_ms": round(s[-1] * 1000, 3)}
+
+
+def run_level(base_url: str, api: str, corpus: list[dict[str, str]], mix: dict[str, float], batch_size: int,
+              concurrency: int, duration: float, warmup: float, seed: int) -> dict[str, Any]:
+    """One closed-loop run at `concurrency`; returns its report entry."""
+    begin = time.perf_counter()
+    measure_from, stop_at = begin + warmup, begin + warmup + duration
+    clients = [
+        _Client(base_url, api, corpus, mix, batch_size, seed * 1000 + i, measure_from, stop_at)
+        for i in range(concurrency)
+    ]
+    for c in clients:
+        c.start()
+    for c in clients:
+        c.join()
+    samples = [s for c in clients for s in c.samples]
+    ok = [s for s in samples if 200 <= s[1] < 300]
+    status: dict[str, int] = {}
+    for s in samples:
+        key = str(s[1]) if s[1] else "connection_error"
+        status[key] = status.get(key, 0) + 1
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "throughput_rps": round(len(ok) / duration, 1),
+        "rows_per_second": round(sum(s[3] for s in ok) / duration, 1),
+        "error_rate": round(1 - len(ok) / len(samples), 4) if samples else None,
+        "status": status,
+        "latency": _latency_ms([s[2] for s in ok]),
+        "by_kind": {kind: _latency_ms([s[2] for s in ok if s[0] == kind]) for kind in mix},
+    }
+
+
+def _print_level(target: str, r: dict[str, Any]) -> None:
+    lat = r["latency"]
+    fmt = lambda v: f"{v:.2f}" if v is not None else "-"  # noqa: E731
+    print(
+        f"  {target:<16} c={r['concurrency']:<4} {r['throughput_rps']:>8.1f} req/s {r['rows_per_second']:>9.1f} rows/s"
+        f" | p50 {fmt(lat['p50_ms'])} p95 {fmt(lat['p95_ms'])} p99 {fmt(lat['p99_ms'])} ms"
+        f" | errors {r['error_rate'] if r['error_rate'] is not None else '-'}",
+        flush=True,
+    )
+
+
+def _compare(old: dict, new: dict) -> None:
+    """Throughput and p99 change per (target, concurrency) against an earlier report."""
+    previous = {
+        (t["target"], lv["concurrency"]): lv for t in old.get("results", []) for lv in t.get("levels", [])
+    }
+    print(f"\nCompared with {old.get('meta', {}).get('git_commit')} ({old.get('meta', {}).get('timestamp')}):")
+    for t in new["results"]:
+        for lv in t.get("levels", []):
+            before = previous.get((t["target"], lv["concurrency"]))
+            if before is None:
+                continue
+            for name, a, b in (
+                ("req/s", before["throughput_rps"], lv["throughput_rps"]),
+                ("p99_ms", before["latency"]["p99_ms"], lv["latency"]["p99_ms"]),
+            ):
+                if a and b is not None:
+                    print(f"  {t['target']:<16} c={lv['concurrency']:<4} {name:<7} {a:>10} -> {b:<10} ({(b - a) / a * 100:+.1f}%)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HTTP load test for the career prediction servers.")
+    parser.add_argument("--targets", default="flask-dev,flask-prefork", help=f"comma-separated: {','.join(TARGETS)}")
+    parser.add_argument("--url", help="load an already running server instead of starting targets")
+    parser.add_argument("--api", choices=("flask", "fastapi"), default="flask", help="request style for --url")
+    parser.add_argument("--model", choices=MODEL_KINDS, default="lr", help="synthetic model kind")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each level")
+    parser.add_argument("--mix", default="best=0.5,top3=0.4,batch=0.1", help="request kind weights")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2, help="server processes for flask-prefork / fastapi*")
+    parser.add_argument("--cache", action="store_true", help="keep the server's prediction cache on")
+    parser.add_argument("--corpus", type=Path, help="JSONL profiles to replay (default: synthetic)")
+    parser.add_argument("--corpus-size", type=int, default=2000)
+    parser.add_argument("--classes", type=int, default=12)
+    parser.add_argument("--docs-per-class", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ready-timeout", type=float, default=120.0)
+    parser.add_argument("--artifacts-dir", type=Path, help="keep generated artifacts and server logs here")
+    parser.add_argument("--out", type=Path, default=Path("load_results.json"))
+    parser.add_argument("--compare", type=Path, help="earlier report to diff against")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+    corpus = read_corpus(args.corpus) if args.corpus else synthetic_corpus(args.corpus_size, args.classes, args.seed + 1)
+    work_dir = args.artifacts_dir or Path(tempfile.mkdtemp(prefix="career-load-"))
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.url:
+        runs = [(f"url:{args.api}", args.api, None)]
+    else:
+        targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+        unknown = set(targets) - set(TARGETS)
+        if unknown:
+            raise SystemExit(f"--targets: unknown {', '.join(sorted(unknown))} (use {', '.join(TARGETS)})")
+        artifacts = work_dir / args.model
+        write_synthetic_artifacts(artifacts, args.model, args.classes, args.docs_per_class, args.seed)
+        runs = [(t, "flask" if t.startswith("flask") else "fastapi", artifacts) for t in targets]
+
+    results: list[dict[str, Any]] = []
+    for target, api, artifacts in runs:
+        print(f"[{target}] {'starting' if artifacts is not None else 'connecting'}...", flush=True)
+        proc = None
+        base_url = args.url
+        try:
+            if artifacts is not None:
+                proc, base_url = start_server(target, artifacts, args.workers, args.cache, work_dir / f"{target}.log")
+            started = time.perf_counter()
+            wait_ready(base_url, proc, args.ready_timeout)
+            entry: dict[str, Any] = {"target": target, "api": api, "ready_seconds": round(time.perf_counter() - started, 2)}
+            entry["levels"] = []
+            for concurrency in levels:
+                level = run_level(base_url, api, corpus, mix, args.batch_size, concurrency, args.duration, args.warmup, args.seed)
+                entry["levels"].append(level)
+                _print_level(target, level)
+        except (RuntimeError, OSError) as e:
+            log_hint = f" (see {work_dir / f'{target}.log'})" if proc is not None else ""
+            print(f"  FAIL: {e}{log_hint}", flush=True)
+            entry = {"target": target, "api": api, "error": str(e)}
+        finally:
+            if proc is not None:
+                stop_server(proc)
+        results.append(entry)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "cpu_count": os.cpu_count(),
+            "versions": _versions(),
+            "params": {
+                "model": args.model,
+                "concurrency": levels,
+                "duration": args.duration,
+                "warmup": args.warmup,
+                "mix": mix,
+                "batch_size": args.batch_size,
+                "workers": args.workers,
+                "cache": args.cache,
+                "corpus": str(args.corpus) if args.corpus else f"synthetic:{len(corpus)}",
+            },
+        },
+        "results": results,
+    }
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nWrote {args.out}")
+    if args.compare:
+        _compare(json.loads(args.compare.read_text(encoding="utf-8")), report)
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
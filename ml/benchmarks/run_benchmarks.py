@@ -0,0 +1,290 @@
+"""
+In-process inference benchmarks for career_flask_api (predictor.py) and predict_api.py on
+synthetic artifacts (see synthetic_artifacts.py). No Colab export or running server needed.
+
+  python run_benchmarks.py [--models rf,xgb,lr] [--targets predictor,predict_api]
+                           [--requests 500] [--batch-sizes 1,8,32,128,512]
+                           [--out results.json] [--compare baseline.json]
+
+Each (model, target) pair runs in a fresh subprocess, so cold-load time and peak RSS are not
+polluted by earlier runs. Measured per pair:
+
+  cold_load_seconds    imports + artifact load, as a freshly started server would see it
+  model_load_seconds   the artifact load alone (unpickle + compiled backends)
+  single               latency percentiles of one top-3 prediction per call (ms)
+  batch                rows/second and ms per call for each batch size
+  peak_rss_mb          process peak resident set size (None where unsupported, e.g. Windows)
+
+The prediction cache is disabled (CAREER_CACHE_SIZE=0) so every call is scored. Results are
+written as JSON; --compare prints the change against an earlier results file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+HERE = Path(__file__).resolve().parent
+ML_DIR = HERE.parent
+FLASK_DIR = ML_DIR / "career_flask_api"
+TARGETS = ("predictor", "predict_api")
+
+sys.path.insert(0, str(HERE))
+from synthetic_artifacts import MODEL_KINDS, synthetic_profiles, write_synthetic_artifacts  # noqa: E402
+
+_WARMUP_CALLS = 20
+# Each batch size is repeated until it has run at least this long (and at least 3 times).
+_BATCH_MIN_SECONDS = 0.3
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentiles_ms(samples_ns: list[int]) -> dict[str, float]:
+    s = sorted(samples_ns)
+
+    def pct(p: float) -> float:
+        return round(s[min(len(s) - 1, int(p / 100 * len(s)))] / 1e6, 4)
+
+    return {
+        "calls": len(s),
+        "mean_ms": round(sum(s) / len(s) / 1e6, 4),
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p99_ms": pct(99),
+        "max_ms": round(s[-1] / 1e6, 4),
+    }
+
+
+def _load_target(target: str, artifacts: Path) -> tuple[Callable, Callable, dict[str, Any]]:
+    """Import the serving code the way the server does; return (single, batch, info)."""
+    if target == "predictor":
+        sys.path.insert(0, str(FLASK_DIR))
+        os.environ["CAREER_MODEL_DIR"] = str(artifacts)
+        import predictor
+    else:
+        sys.path.insert(0, str(ML_DIR))
+        os.environ["CAREER_ARTIFACTS_DIR"] = str(artifacts)
+        import predict_api
+    # Both servers load through career_flask_api/model_loader.py and score with inference_engine.py.
+    from inference_engine import get_engine
+    from model_loader import get_bundle, is_ready, last_load_error, load_artifacts
+
+    load_artifacts()
+    if not is_ready():
+        raise RuntimeError(last_load_error())
+    bundle = get_bundle()
+    info = {
+        "model_load_seconds": round(bundle.load_seconds, 4),
+        "source": bundle.source,
+        "compiled_scorer": bundle.scorer_note,
+        "fast_tfidf": bundle.transformer_note,
+    }
+    if target == "predictor":
+        single = predictor.predict_top3 if hasattr(bundle.model, "predict_proba") else predictor.predict_best_career
+        return single, lambda texts: predictor.predict_batch(texts, k=3), info
+    # The work /predict/json and /predict/batch do after request validation.
+    return (
+        lambda text: predict_api._response(get_engine().predict_batch([text], 3)[0]),
+        lambda texts: [predict_api._response(p) for p in get_engine().predict_batch(texts, 3)],
+        info,
+    )
+
+
+def _run_worker(target: str, artifacts: Path, n_requests: int, batch_sizes: list[int], seed: int) -> dict:
+    started = time.perf_counter()
+    single, batch, info = _load_target(target, artifacts)
+    cold = time.perf_counter() - started
+    rss_after_load = _peak_rss_mb()
+
+    # Profiles the model was not trained on (different seed).
+    texts, _ = synthetic_profiles(max(n_requests, max(batch_sizes)) + _WARMUP_CALLS, seed=seed + 1)
+    for t in texts[:_WARMUP_CALLS]:
+        single(t)
+
+    samples: list[int] = []
+    for t in texts[_WARMUP_CALLS : _WARMUP_CALLS + n_requests]:
+        t0 = time.perf_counter_ns()
+        single(t)
+        samples.append(time.perf_counter_ns() - t0)
+
+    batches = []
+    for size in batch_sizes:
+        chunk = texts[:size]
+        batch(chunk)  # warm-up at this size
+        calls, rows = 0, 0
+        t0 = time.perf_counter()
+        while calls < 3 or time.perf_counter() - t0 < _BATCH_MIN_SECONDS:
+            batch(chunk)
+            calls += 1
+            rows += len(chunk)
+        elapsed = time.perf_counter() - t0
+        batches.append(
+            {
+                "batch_size": size,
+                "calls": calls,
+                "rows_per_second": round(rows / elapsed, 1),
+                "ms_per_call": round(elapsed / calls * 1000, 4),
+            }
+        )
+
+    return {
+        "cold_load_seconds": round(cold, 4),
+        **info,
+        "single": _percentiles_ms(samples),
+        "batch": batches,
+        "peak_rss_mb_after_load": rss_after_load,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _versions() -> dict[str, str | None]:
+    from importlib.metadata import PackageNotFoundError, version
+
+    out: dict[str, str | None] = {}
+    for name in ("numpy", "scipy", "scikit-learn", "xgboost", "flask", "fastapi"):
+        try:
+            out[name] = version(name)
+        except PackageNotFoundError:
+            out[name] = None
+    return out
+
+
+def _compare(old: dict, new: dict) -> None:
+    """Print relative change per metric; for latency lower is better, for rows/s higher is."""
+    previous = {(r["model"], r["target"]): r for r in old.get("results", []) if "error" not in r}
+    print(f"\nCompared with {old.get('meta', {}).get('git_commit')} ({old.get('meta', {}).get('timestamp')}):")
+    for r in new["results"]:
+        before = previous.get((r["model"], r["target"]))
+        if before is None or "error" in r:
+            continue
+        rows = [
+            ("cold_load_seconds", before["cold_load_seconds"], r["cold_load_seconds"]),
+            ("single p50_ms", before["single"]["p50_ms"], r["single"]["p50_ms"]),
+            ("single p99_ms", before["single"]["p99_ms"], r["single"]["p99_ms"]),
+            ("peak_rss_mb", before.get("peak_rss_mb"), r.get("peak_rss_mb")),
+        ]
+        old_batches = {b["batch_size"]: b for b in before["batch"]}
+        for b in r["batch"]:
+            if b["batch_size"] in old_batches:
+                rows.append(
+                    (f"batch {b['batch_size']} rows/s", old_batches[b["batch_size"]]["rows_per_second"], b["rows_per_second"])
+                )
+        print(f"  {r['model']} / {r['target']}")
+        for name, a, b in rows:
+            if a and b is not None:
+                print(f"    {name:<24} {a:>12} -> {b:<12} ({(b - a) / a * 100:+.1f}%)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark career model inference on synthetic artifacts.")
+    parser.add_argument("--models", default=",".join(MODEL_KINDS), help="comma-separated: rf,xgb,lr")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="comma-separated: predictor,predict_api")
+    parser.add_argument("--requests", type=int, default=500, help="single-request calls per run")
+    parser.add_argument("--batch-sizes", default="1,8,32,128,512")
+    parser.add_argument("--classes", type=int, default=12)
+    parser.add_argument("--docs-per-class", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to diff against")
+    parser.add_argument("--artifacts-dir", type=Path, help="keep generated artifacts here (default: temp dir)")
+    parser.add_argument("--worker", choices=TARGETS, help=argparse.SUPPRESS)
+    parser.add_argument("--artifacts", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    batch_sizes = [int(x) for x in args.batch_sizes.split(",") if x.strip()]
+
+    if args.worker:
+        result = _run_worker(args.worker, args.artifacts, args.requests, batch_sizes, args.seed)
+        print(json.dumps(result))
+        return 0
+
+    models = [m.strip() for m in args.models.split(",") if m.strip()]
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    work_dir = args.artifacts_dir or Path(tempfile.mkdtemp(prefix="career-bench-"))
+    env = {**os.environ, "CAREER_CACHE_SIZE": "0", "CAREER_RELOAD_INTERVAL": "0"}
+
+    results: list[dict[str, Any]] = []
+    for model in models:
+        artifacts = work_dir / model
+        try:
+            write_synthetic_artifacts(artifacts, model, args.classes, args.docs_per_class, args.seed)
+        except ImportError as e:  # e.g. xgboost not installed
+            print(f"[{model}] skipped: {e}")
+            results.append({"model": model, "target": None, "error": f"skipped: {e}"})
+            continue
+        for target in targets:
+            print(f"[{model} / {target}] running...", flush=True)
+            cmd = [
+                sys.executable, str(Path(__file__).resolve()), "--worker", target, "--artifacts", str(artifacts),
+                "--requests", str(args.requests), "--batch-sizes", args.batch_sizes, "--seed", str(args.seed),
+            ]
+            proc = subprocess.run(cmd, capture_output=True, text=True, env=env)
+            if proc.returncode != 0:
+                err = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+                print(f"  FAIL: {err}")
+                results.append({"model": model, "target": target, "error": err})
+                continue
+            r = {"model": model, "target": target, **json.loads(proc.stdout.strip().splitlines()[-1])}
+            results.append(r)
+            s = r["single"]
+            best = max(r["batch"], key=lambda b: b["rows_per_second"]) if r["batch"] else None
+            print(
+                f"  cold load {r['cold_load_seconds']:.2f}s | single p50 {s['p50_ms']:.3f} ms, p99 {s['p99_ms']:.3f} ms"
+                + (f" | best batch {best['batch_size']}: {best['rows_per_second']:.0f} rows/s" if best else "")
+                + f" | peak RSS {r['peak_rss_mb']} MB"
+            )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "versions": _versions(),
+            "thread_env": {k: os.environ.get(k) for k in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")},
+            "params": {
+                "requests": args.requests,
+                "batch_sizes": batch_sizes,
+                "classes": args.classes,
+                "docs_per_class": args.docs_per_class,
+                "seed": args.seed,
+            },
+        },
+        "results": results,
+    }
+    args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nWrote {args.out}")
+    if args.compare:
+        _compare(json.loads(args.compare.read_text(encoding="utf-8")), report)
+    return 1 if any("error" in r and r.get("target") for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
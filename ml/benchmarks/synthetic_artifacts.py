@@ -0,0 +1,108 @@
+"""
+Train small synthetic TF-IDF + classifier artifacts in the Colab pickle layout
+(vectorizer.pkl, career_model.pkl, label_encoder.pkl), so benchmarks run offline.
+
+  python synthetic_artifacts.py OUT_DIR [--model rf|xgb|lr] [--classes 12] [--docs-per-class 150]
+
+Profiles are drawn from per-career keyword pools plus a shared pool of generic words, so the
+vocabulary size, sparsity and class overlap resemble free-text skills / interests fields.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import random
+from pathlib import Path
+
+MODEL_KINDS = ("rf", "xgb", "lr")
+
+# Generic words every profile can contain (they carry little class signal).
+_SHARED_POOL = 400
+# Career-specific keywords per class.
+_CLASS_POOL = 60
+
+
+def _word(prefix: str, i: int) -> str:
+    # Letters only: TfidfVectorizer's default token pattern drops digits-only tokens and
+    # single characters, and stop-word removal would drop real English filler words.
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    suffix = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        suffix = letters[r] + suffix
+    return f"{prefix}{suffix}"
+
+
+def synthetic_profiles(n: int, n_classes: int = 12, seed: int = 0) -> tuple[list[str], list[str]]:
+    """n (text, career) pairs; the same seed always gives the same profiles."""
+    rng = random.Random(seed)
+    shared = [_word("gen", i) for i in range(_SHARED_POOL)]
+    pools = [[_word(f"c{c}", i) for i in range(_CLASS_POOL)] for c in range(n_classes)]
+    careers = [f"career_{c:02d}" for c in range(n_classes)]
+    texts, labels = [], []
+    for _ in range(n):
+        c = rng.randrange(n_classes)
+        words = rng.sample(pools[c], rng.randint(3, 10)) + rng.sample(shared, rng.randint(2, 12))
+        # A few keywords from another career, like real mixed-skill profiles.
+        words += rng.sample(pools[rng.randrange(n_classes)], rng.randint(0, 3))
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+        labels.append(careers[c])
+    return texts, labels
+
+
+def _make_model(kind: str, seed: int):
+    if kind == "rf":
+        from sklearn.ensemble import RandomForestClassifier
+
+        return RandomForestClassifier(n_estimators=100, random_state=seed, n_jobs=1)
+    if kind == "lr":
+        from sklearn.linear_model import LogisticRegression
+
+        return LogisticRegression(max_iter=1000)
+    if kind == "xgb":
+        from xgboost import XGBClassifier  # optional dependency (requirements-serve.txt)
+
+        return XGBClassifier(n_estimators=100, max_depth=6, tree_method="hist", n_jobs=1, random_state=seed)
+    raise ValueError(f"Unknown model kind {kind!r}; expected one of {', '.join(MODEL_KINDS)}")
+
+
+def write_synthetic_artifacts(
+    out_dir: Path, kind: str = "rf", n_classes: int = 12, docs_per_class: int = 150, seed: int = 0
+) -> Path:
+    """Fit vectorizer + model + label encoder on synthetic profiles and pickle them into out_dir."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import LabelEncoder
+
+    texts, careers = synthetic_profiles(n_classes * docs_per_class, n_classes, seed)
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(careers)
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), max_features=5000, stop_words="english")
+    X = vectorizer.fit_transform(texts)
+    model = _make_model(kind, seed).fit(X, y)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, obj in (("vectorizer.pkl", vectorizer), ("career_model.pkl", model), ("label_encoder.pkl", label_encoder)):
+        with open(out_dir / name, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return out_dir
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--model", choices=MODEL_KINDS, default="rf")
+    parser.add_argument("--classes", type=int, default=12)
+    parser.add_argument("--docs-per-class", type=int, default=150)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    out = write_synthetic_artifacts(args.out_dir, args.model, args.classes, args.docs_per_class, args.seed)
+    print(f"Wrote {args.model} artifacts to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,20 +4,74 @@ Flask API: career recommendation from Colab-exported TF-IDF + classifier + label
 
 from __future__ import annotations
 
+import hmac
+import json
 import logging
 import os
+import time
 import traceback
+from itertools import islice
+from typing import Any, Iterable, Iterator
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
-from model_loader import is_ready, last_load_error, load_artifacts
-from predictor import predict_best_career, predict_top3
+import fast_json
+import readiness
+from inference_executor import TIMEOUT_HEADER, DeadlineExceeded, Overloaded, executor_from_env, request_deadline
+from metrics import METRICS, cache_samples, executor_samples, model_samples, process_samples
+from inference_engine import MODEL_HEADER, InferenceEngine, UnknownModel, get_engine, models_status, route_engine
+from model_loader import (
+    get_bundle,
+    is_ready,
+    last_load_error,
+    model_version,
+    reload_artifacts,
+    reload_status,
+    start_reload_watcher,
+)
+from predictor import predict_batch, predict_best_career, predict_top, prediction_cache
+from request_profiler import PROFILE_HEADER, PROFILE_ID_HEADER, PROFILER
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    jsonify() / app.json through fast_json (orjson when installed). Output keeps Flask's sorted
+    keys and trailing newline; calls with extra json.dumps options and debug-mode pretty printing
+    still go through the stdlib encoder.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return fast_json.dumps(obj, sort_keys=self.sort_keys, default=self.default).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return fast_json.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = fast_json.dumps(obj, sort_keys=self.sort_keys, default=self.default)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+# Upper bound on texts per /recommend-batch call (keeps one request from pinning a worker).
+MAX_BATCH_SIZE = int(os.environ.get("CAREER_MAX_BATCH", "1000"))
+# Bounds concurrent predictions per process; excess requests get 429 instead of piling up.
+EXECUTOR = executor_from_env()
+# Texts scored (and written out) at a time by /recommend-batch/stream.
+STREAM_CHUNK_SIZE = int(os.environ.get("CAREER_STREAM_CHUNK", "256"))
+NDJSON = "application/x-ndjson"
 # Broad origins for local dev; tighten in production (specific origins or env list)
 _default_origins = [
     "http://localhost:5173",
@@ -49,7 +103,8 @@ if os.environ.get("CORS_ALLOW_ALL", "").lower() in ("1", "true", "yes"):
     CORS(
         app,
         resources={r"/*": {"origins": "*"}},
-        allow_headers=["Content-Type", "Authorization"],
+        allow_headers=["Content-Type", "Authorization", TIMEOUT_HEADER, MODEL_HEADER, PROFILE_HEADER],
+        expose_headers=[MODEL_HEADER, PROFILE_ID_HEADER],
         methods=["GET", "POST", "OPTIONS"],
     )
 else:
@@ -57,24 +112,227 @@ else:
         app,
         resources={r"/*": {"origins": _default_origins}},
         supports_credentials=True,
-        allow_headers=["Content-Type", "Authorization"],
+        allow_headers=["Content-Type", "Authorization", TIMEOUT_HEADER, MODEL_HEADER, PROFILE_HEADER],
+        expose_headers=[MODEL_HEADER, PROFILE_ID_HEADER],
         methods=["GET", "POST", "OPTIONS"],
     )
 
 
+def _backend_notes() -> dict[str, str | None]:
+    try:
+        b = get_bundle()
+    except RuntimeError:
+        return {"compiled_scorer": None, "fast_tfidf": None, "compaction": None, "fallback_ranking": None}
+    return {
+        "compiled_scorer": b.scorer_note,
+        "fast_tfidf": b.transformer_note,
+        "compaction": b.compaction_note,
+        "fallback_ranking": b.ranker_note,
+    }
+
+
+@app.before_request
+def _start_profile():
+    """Profile this whole request (X-Career-Profile header or CAREER_PROFILE_SAMPLE); see request_profiler.py."""
+    if not PROFILER.enabled:
+        return
+    session = PROFILER.start(
+        request.url_rule.rule if request.url_rule is not None else "unmatched",
+        request.method,
+        request.headers.get(PROFILE_HEADER),
+    )
+    if session is not None:
+        g.profile = session
+        session.enable()
+
+
+@app.before_request
+def _start_request_metrics():
+    g.request_started = time.perf_counter()
+    METRICS.bind_route(request.url_rule.rule if request.url_rule is not None else "unmatched")
+    if request.method == "POST" and request.is_json:
+        # Parse once here (timed); the route's get_json() reuses the cached result.
+        with METRICS.stage("parse"):
+            request.get_json(silent=True)
+
+
+@app.after_request
+def _finish_request_metrics(response):
+    started = g.get("request_started")
+    if started is not None:
+        code = None
+        if response.status_code >= 400 and response.is_json:
+            code = (response.get_json(silent=True) or {}).get("code")
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        method, status = request.method, response.status_code
+
+        def record() -> None:
+            METRICS.record_request(route, method, status, time.perf_counter() - started, code)
+
+        if response.is_streamed:
+            # /recommend-batch/stream: the body is generated after this hook returns; count the
+            # request when the server closes the response, so its latency covers the whole stream.
+            response.call_on_close(record)
+        else:
+            record()
+    return response
+
+
+@app.after_request
+def _finish_profile(response):
+    session = g.pop("profile", None)
+    if session is not None:
+        response.headers[PROFILE_ID_HEADER] = session.id
+        if response.is_streamed:
+            # /recommend-batch/stream scores while the body is written: profile until it is done.
+            status = response.status_code
+            response.call_on_close(lambda: PROFILER.finish(session, status))
+        else:
+            PROFILER.finish(session, response.status_code)
+    return response
+
+
+@app.teardown_request
+def _drop_profile(_exc):
+    """A request that failed before after_request still ends its profile (and frees the profiler)."""
+    session = g.pop("profile", None)
+    if session is not None:
+        PROFILER.finish(session, 500)
+
+
+@app.after_request
+def _model_header(response):
+    """Tell the client which model answered (set by _route_model)."""
+    model = g.get("model")
+    if model is not None:
+        response.headers[MODEL_HEADER] = model
+    return response
+
+
 @app.route("/", methods=["GET"])
 def root():
-    load_artifacts()
     return jsonify(
         {
             "status": "ok",
             "service": "career-recommendation-api",
+            "json_backend": fast_json.BACKEND,
             "model_loaded": is_ready(),
             "model_error": last_load_error(),
+            "model_version": model_version(),
+            **_backend_notes(),
+            "cache": prediction_cache().stats(),
+            "reload": reload_status(),
+            "executor": EXECUTOR.stats(),
+            "models": models_status(),
+            "profiling": PROFILER.stats(),
         }
     )
 
 
+@app.route("/livez", methods=["GET"])
+def livez():
+    """Liveness: the process answers. No model work, so it stays fast while artifacts load."""
+    return jsonify({"status": "ok"})
+
+
+@app.route("/readyz", methods=["GET"])
+def readyz():
+    """Readiness: 200 once the artifacts are loaded and warmed up, else 503 (never blocks)."""
+    readiness.start()  # no-op once started; begins the background load under `flask run`
+    status = readiness.status()
+    if not status["ready"]:
+        error = status["error"] or f"Model is {status['phase'].replace('_', ' ')}."
+        return jsonify({"error": error, "code": "NOT_READY", **status}), 503
+    return jsonify(status)
+
+
+@app.route("/classes", methods=["GET"])
+def classes():
+    """
+    Display class names of the primary model (or the X-Career-Model header's), with an ETag:
+    clients revalidate with If-None-Match and get 304 until a reload changes the classes.
+    """
+    try:
+        engine = get_engine(request.headers.get(MODEL_HEADER))
+    except UnknownModel as e:
+        return jsonify({"error": str(e), "code": "UNKNOWN_MODEL"}), 404
+    except RuntimeError as e:
+        return jsonify({"error": str(e), "code": "MODEL_NOT_LOADED"}), 503
+    g.model = engine.name
+    body, tag = engine.classes_document()
+    headers = {"ETag": tag, "Cache-Control": "no-cache", "Vary": MODEL_HEADER}
+    if fast_json.etag_matches(request.headers.get("If-None-Match"), tag):
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype="application/json", headers=headers)
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus text format: per-route / per-stage latency, error codes, model load info."""
+    samples = process_samples() + cache_samples(prediction_cache().stats()) + executor_samples(EXECUTOR.stats())
+    samples += model_samples(models_status())
+    samples.append(("model_loaded", "gauge", "1 if model artifacts are loaded.", 1 if is_ready() else 0, {}))
+    try:
+        b = get_bundle()
+    except RuntimeError:
+        b = None
+    if b is not None:
+        samples += [
+            (
+                "model_info",
+                "gauge",
+                "Loaded artifact version and inference backends.",
+                1,
+                {
+                    "version": b.version,
+                    "source": b.source,
+                    "compiled_scorer": b.scorer_note or "",
+                    "fast_tfidf": b.transformer_note or "",
+                },
+            ),
+            ("model_load_duration_seconds", "gauge", "Time to load the current artifacts.", b.load_seconds, {}),
+            ("model_loaded_timestamp_seconds", "gauge", "Unix time the current artifacts were loaded.", b.loaded_at, {}),
+        ]
+    samples.append(("model_reloads_total", "counter", "Successful hot reloads.", reload_status().get("reloads", 0), {}))
+    return Response(METRICS.render(samples), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _admin_error():
+    """403 / 401 response unless the request carries CAREER_ADMIN_TOKEN as X-Admin-Token; else None."""
+    token = os.environ.get("CAREER_ADMIN_TOKEN", "")
+    if not token:
+        return jsonify({"error": "Set CAREER_ADMIN_TOKEN to enable admin endpoints.", "code": "ADMIN_DISABLED"}), 403
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token):
+        return jsonify({"error": "Invalid admin token.", "code": "UNAUTHORIZED"}), 401
+    return None
+
+
+@app.route("/admin/reload", methods=["POST"])
+def admin_reload():
+    """Load the current files from CAREER_MODEL_DIR in the background and swap them in."""
+    error = _admin_error()
+    if error is not None:
+        return error
+
+    started = reload_artifacts()
+    return (
+        jsonify({"reload_started": started, "model_version": model_version(), "reload": reload_status()}),
+        202 if started else 409,
+    )
+
+
+@app.route("/admin/profiles", methods=["GET"])
+def admin_profiles():
+    """Newest request profiles (?limit=, default 50) with durations and hottest functions."""
+    error = _admin_error()
+    if error is not None:
+        return error
+    limit = request.args.get("limit", "50")
+    if not limit.isdigit():
+        return jsonify({"error": 'Query parameter "limit" must be a non-negative integer.', "code": "INVALID_FIELD"}), 400
+    return jsonify({**PROFILER.stats(), "profiles": PROFILER.index(int(limit))})
+
+
 @app.route("/recommend-career", methods=["POST"])
 def recommend_career():
     if not is_ready():
@@ -111,9 +369,15 @@ def recommend_career():
     if not text.strip():
         return jsonify({"error": 'Field "text" must not be empty.', "code": "EMPTY_TEXT"}), 400
 
+    engine, error = _route_model()
+    if error is not None:
+        return error
+
     try:
-        best = predict_best_career(text)
+        best = _infer(predict_best_career, text, engine)
         return jsonify({"best_career": best})
+    except (Overloaded, DeadlineExceeded) as e:
+        return _shed(e)
     except ValueError as e:
         if str(e) == "EMPTY_TEXT":
             return jsonify({"error": 'Field "text" must not be empty.', "code": "EMPTY_TEXT"}), 400
@@ -134,8 +398,66 @@ def recommend_career():
         )
 
 
+def _infer(fn, *args):
+    """Run a predict call through EXECUTOR with this request's deadline (X-Request-Timeout-Ms)."""
+    deadline = request_deadline(request.headers.get(TIMEOUT_HEADER), g.get("request_started"))
+    return EXECUTOR.run(fn, *args, deadline=deadline)
+
+
+def _route_model():
+    """
+    (engine, error response or None): the model named in the X-Career-Model header, else one
+    picked by CAREER_MODELS weight. Unknown names get 404 UNKNOWN_MODEL.
+    """
+    try:
+        engine = route_engine(request.headers.get(MODEL_HEADER))
+    except UnknownModel as e:
+        return None, (jsonify({"error": str(e), "code": "UNKNOWN_MODEL"}), 404)
+    g.model = engine.name
+    return engine, None
+
+
+def _shed(e: Overloaded | DeadlineExceeded):
+    """429 + Retry-After when the executor is full; 504 when the deadline passed while queued."""
+    if isinstance(e, Overloaded):
+        response = jsonify({"error": str(e), "code": "OVERLOADED"})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response
+    return jsonify({"error": str(e), "code": "DEADLINE_EXCEEDED"}), 504
+
+
+def _ranking_params(body: dict, k_field: str, default_k: int):
+    """
+    Validate the top-k size (k larger than the number of classes returns every class) and the
+    optional min_probability. Returns (k, min_probability, error_response or None).
+    """
+    k = body.get(k_field, default_k)
+    if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+        return None, None, (jsonify({"error": f'Field "{k_field}" must be a positive integer.', "code": "INVALID_FIELD"}), 400)
+    min_probability = body.get("min_probability")
+    if min_probability is not None and (
+        isinstance(min_probability, bool)
+        or not isinstance(min_probability, (int, float))
+        or not 0.0 <= min_probability <= 1.0
+    ):
+        return None, None, (jsonify({"error": 'Field "min_probability" must be a number from 0 to 1.', "code": "INVALID_FIELD"}), 400)
+    return k, (float(min_probability) if min_probability is not None else None), None
+
+
+@app.route("/recommend-top", methods=["POST"])
+def recommend_top():
+    """Top "k" careers (default 3), optionally only those with probability >= "min_probability"."""
+    return _recommend_top(fixed_k=None)
+
+
 @app.route("/recommend-top3", methods=["POST"])
 def recommend_top3():
+    """Kept for the .NET client: /recommend-top with k=3."""
+    return _recommend_top(fixed_k=3)
+
+
+def _recommend_top(fixed_k: int | None):
     if not is_ready():
         return (
             jsonify(
@@ -170,30 +492,44 @@ def recommend_top3():
     if not text.strip():
         return jsonify({"error": 'Field "text" must not be empty.', "code": "EMPTY_TEXT"}), 400
 
+    if fixed_k is not None:
+        k, min_probability = fixed_k, None
+    else:
+        k, min_probability, error = _ranking_params(body, "k", 3)
+        if error is not None:
+            return error
+
+    engine, error = _route_model()
+    if error is not None:
+        return error
+
     try:
-        recs = predict_top3(text)
+        recs = _infer(predict_top, text, k, min_probability, engine)
         return jsonify({"recommendations": recs})
+    except (Overloaded, DeadlineExceeded) as e:
+        return _shed(e)
     except RuntimeError as e:
         if str(e) == "MODEL_NO_PROBA":
             return (
                 jsonify(
                     {
-                        "error": "This model does not support probability scores (predict_proba). "
-                        "Train with a classifier that exposes predict_proba (e.g. RandomForest, XGBoost, "
-                        "LogisticRegression) or use SVC(probability=True).",
+                        "error": "This model has neither probability scores (predict_proba) nor "
+                        "decision_function, and no class_centroids.npy to rank careers with. Build the "
+                        "centroids with fallback_ranking.py, or train a classifier that exposes "
+                        "predict_proba or decision_function (e.g. LogisticRegression, LinearSVC).",
                         "code": "MODEL_NO_PROBA",
                     }
                 ),
                 501,
             )
-        logger.exception("Top-3 prediction failed: %s", e)
+        logger.exception("Top-k prediction failed: %s", e)
         return jsonify({"error": str(e), "code": "PREDICTION_ERROR"}), 503
     except ValueError as e:
         if str(e) == "EMPTY_TEXT":
             return jsonify({"error": 'Field "text" must not be empty.', "code": "EMPTY_TEXT"}), 400
         raise
     except Exception:  # noqa: BLE001
-        logger.exception("Unexpected error in recommend-top3")
+        logger.exception("Unexpected error in recommend-top")
         return (
             jsonify(
                 {
@@ -205,6 +541,191 @@ def recommend_top3():
         )
 
 
+@app.route("/recommend-batch", methods=["POST"])
+def recommend_batch():
+    if not is_ready():
+        return (
+            jsonify(
+                {
+                    "error": last_load_error() or "Model not loaded.",
+                    "code": "MODEL_NOT_LOADED",
+                }
+            ),
+            503,
+        )
+
+    if not request.is_json:
+        return jsonify({"error": "Expected Content-Type: application/json", "code": "INVALID_CONTENT_TYPE"}), 415
+
+    try:
+        body = request.get_json(force=False, silent=False)
+    except Exception:  # noqa: BLE001
+        return jsonify({"error": "Invalid JSON body.", "code": "INVALID_JSON"}), 400
+
+    if body is None:
+        return jsonify({"error": "Missing JSON body.", "code": "MISSING_BODY"}), 400
+
+    if "texts" not in body:
+        return jsonify({"error": 'Missing required field "texts".', "code": "MISSING_FIELD"}), 400
+
+    texts = body.get("texts")
+    if not isinstance(texts, list):
+        return jsonify({"error": 'Field "texts" must be a list of strings.', "code": "INVALID_FIELD"}), 400
+    if not texts:
+        return jsonify({"error": 'Field "texts" must not be empty.', "code": "EMPTY_BATCH"}), 400
+    if len(texts) > MAX_BATCH_SIZE:
+        return (
+            jsonify(
+                {
+                    "error": f'Field "texts" has {len(texts)} items; maximum is {MAX_BATCH_SIZE}.',
+                    "code": "BATCH_TOO_LARGE",
+                }
+            ),
+            413,
+        )
+
+    top_k, min_probability, error = _ranking_params(body, "top_k", 3)
+    if error is not None:
+        return error
+    engine, error = _route_model()
+    if error is not None:
+        return error
+
+    # Non-string items are rejected inline; the rest are scored together as one matrix.
+    valid = [i for i, t in enumerate(texts) if isinstance(t, str)]
+    results: list[dict] = [
+        {"error": "Item must be a string.", "code": "INVALID_FIELD"} for _ in texts
+    ]
+
+    try:
+        scored = _infer(predict_batch, [texts[i] for i in valid], top_k, min_probability, engine)
+    except (Overloaded, DeadlineExceeded) as e:
+        return _shed(e)
+    except RuntimeError as e:
+        logger.exception("Batch prediction failed: %s", e)
+        return jsonify({"error": str(e), "code": "PREDICTION_ERROR"}), 503
+    except Exception:  # noqa: BLE001
+        logger.exception("Unexpected error in recommend-batch")
+        return (
+            jsonify(
+                {
+                    "error": "Internal server error during prediction.",
+                    "code": "SERVER_ERROR",
+                }
+            ),
+            500,
+        )
+
+    for i, r in zip(valid, scored):
+        results[i] = r
+    return jsonify({"results": [{"index": i, **r} for i, r in enumerate(results)]})
+
+
+@app.route("/recommend-batch/stream", methods=["POST"])
+def recommend_batch_stream():
+    """
+    /recommend-batch answered as NDJSON, one {"index", ...} line per text, written chunk by chunk
+    as it is scored. With an application/x-ndjson body (one text or {"text": ...} per line;
+    top_k / min_probability as query parameters) the input is read incrementally too, so memory
+    and time to the first result do not grow with the number of texts. No CAREER_MAX_BATCH limit.
+    """
+    if not is_ready():
+        return (
+            jsonify(
+                {
+                    "error": last_load_error() or "Model not loaded.",
+                    "code": "MODEL_NOT_LOADED",
+                }
+            ),
+            503,
+        )
+
+    if request.mimetype == NDJSON:
+        params = {name: _query_value(request.args[name]) for name in ("top_k", "min_probability") if name in request.args}
+        items: Iterable[str | dict] = _ndjson_texts(request.stream)
+    elif request.is_json:
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return jsonify({"error": "Invalid JSON body.", "code": "INVALID_JSON"}), 400
+        texts = body.get("texts")
+        if not isinstance(texts, list):
+            return jsonify({"error": 'Field "texts" must be a list of strings.', "code": "INVALID_FIELD"}), 400
+        params = body
+        items = (t if isinstance(t, str) else {"error": "Item must be a string.", "code": "INVALID_FIELD"} for t in texts)
+    else:
+        return jsonify({"error": f"Expected Content-Type: application/json or {NDJSON}", "code": "INVALID_CONTENT_TYPE"}), 415
+
+    top_k, min_probability, error = _ranking_params(params, "top_k", 3)
+    if error is not None:
+        return error
+    # One engine for the whole stream, so neither routing nor a reload switches models halfway.
+    engine, error = _route_model()
+    if error is not None:
+        return error
+
+    lines = _stream_results(engine, items, top_k, min_probability)
+    try:
+        next(lines)  # admission: 429 must go out before the 200 headers do
+    except Overloaded as e:
+        return _shed(e)
+    return Response(stream_with_context(lines), mimetype=NDJSON)
+
+
+def _query_value(raw: str) -> Any:
+    """Query parameters as JSON numbers ("3", "0.2"); anything else is left for _ranking_params to reject."""
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def _ndjson_texts(stream) -> Iterator[str | dict]:
+    """Texts from an NDJSON body, one line at a time; bad lines become inline {"error", "code"}."""
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield {"error": "Line is not valid JSON.", "code": "INVALID_JSON"}
+            continue
+        if isinstance(item, dict):
+            item = item.get("text")
+        if isinstance(item, str):
+            yield item
+        else:
+            yield {"error": 'Line must be a string or {"text": string}.', "code": "INVALID_FIELD"}
+
+
+def _stream_results(
+    engine: InferenceEngine, items: Iterable[str | dict], k: int, min_probability: float | None
+) -> Iterator[str]:
+    """
+    NDJSON result lines, STREAM_CHUNK_SIZE texts per chunk (one matrix each), always one line per
+    input. The stream holds one EXECUTOR admission while open and takes a slot per chunk; the
+    first, empty yield is admission.
+    """
+    with EXECUTOR.admit():
+        yield ""
+        index = 0
+        it = iter(items)
+        while chunk := list(islice(it, STREAM_CHUNK_SIZE)):
+            texts = [t for t in chunk if isinstance(t, str)]
+            results: list[dict] = []
+            if texts:
+                try:
+                    results = EXECUTOR.run_admitted(predict_batch, texts, k, min_probability, engine)
+                except Exception as e:  # noqa: BLE001 — the 200 is already out: one error line per text
+                    logger.exception("Streamed batch prediction failed: %s", e)
+                    results = [{"error": str(e), "code": "PREDICTION_ERROR"}] * len(texts)
+            scored = iter(results)
+            out = []
+            for item in chunk:
+                out.append(app.json.dumps({"index": index, **(next(scored) if isinstance(item, str) else item)}))
+                index += 1
+            yield "\n".join(out) + "\n"
+
+
 @app.errorhandler(404)
 def not_found(_e):
     return jsonify({"error": "Not found.", "code": "NOT_FOUND"}), 404
@@ -216,7 +737,9 @@ def server_error(_e):
 
 
 if __name__ == "__main__":
-    load_artifacts()
+    # Load + warm up in the background: /livez answers at once, /readyz turns 200 when done.
+    readiness.start()
+    start_reload_watcher()
     # Default 5052: port 5000 is often taken on Windows (IIS / other services).
     port = int(os.environ.get("PORT", "5052"))
     host = os.environ.get("HOST", "127.0.0.1")
@@ -0,0 +1,318 @@
+"""
+Shrink a loaded vectorizer / model pair without changing its predictions. model_loader runs it
+on every pickle / joblib load (CAREER_COMPACT=0 turns that off) and fast_artifacts.py before
+writing the fast-load cache. Run it alone for a size report (nothing is written):
+
+  python compact_artifacts.py [MODEL_DIR]
+
+Steps:
+  stop_words_    TfidfVectorizer keeps every term cut by min_df / max_df / max_features, for
+                 introspection only; often larger than the vocabulary itself. Dropped.
+  fit leftovers  oob_decision_function_ / oob_prediction_ (forests fitted with oob_score=True)
+                 and evals_result_ (XGBoost). Dropped.
+  idf float32    idf_ rounded to float32. Opt-in only (float32_idf=True; CAREER_COMPACT_FLOAT32=1
+                 for the loader and the converters): the check below uses synthetic texts, which
+                 say nothing about real inputs near a label or top-k tie.
+  prune          vocabulary terms that no tree split / non-zero coefficient reads are removed and
+                 the model's feature indices remapped (linear models, sklearn trees / forests,
+                 XGBoost gbtree). Only when the vectorizer does not normalize rows (norm=None):
+                 with l1 / l2 every term, used or not, changes the row norm and so every value.
+
+Steps that can change numbers are checked against the original pair on check_corpus texts
+(same labels, predict_proba within 1e-6, like compiled_scorer.py) and skipped otherwise. A
+vectorizer shared by several models (model_loader.py, CAREER_MODELS) keeps its idf and
+vocabulary: those steps are only checked against one model.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import pickle
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from compiled_scorer import check_corpus
+
+_FIT_LEFTOVERS = ("oob_decision_function_", "oob_prediction_", "evals_result_")
+
+
+@dataclass
+class CompactionReport:
+    applied: list[str] = field(default_factory=list)
+    # Step -> why it was not applied.
+    skipped: dict[str, str] = field(default_factory=dict)
+    # Pickled bytes per object, with compact(measure=True) only.
+    size_before: dict[str, int] = field(default_factory=dict)
+    size_after: dict[str, int] = field(default_factory=dict)
+    check_texts: int = 0
+    # What the checks ran on; recorded in the fast-load current.json as their limit.
+    check_corpus: str = ""
+    # The returned pair against the original on the check corpus.
+    identical: bool = False
+
+    @property
+    def note(self) -> str:
+        return ", ".join(self.applied) or "nothing to compact"
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _scores(model: Any, X: Any) -> np.ndarray:
+    if hasattr(model, "predict_proba"):
+        return np.asarray(model.predict_proba(X))
+    return np.asarray(model.predict(X))
+
+
+def _same_predictions(expected: np.ndarray, got: np.ndarray) -> bool:
+    if got.shape != expected.shape:
+        return False
+    if expected.ndim == 1:
+        return bool(np.array_equal(expected, got))
+    return bool(
+        np.array_equal(expected.argmax(axis=1), got.argmax(axis=1))
+        and np.allclose(expected, got, rtol=0, atol=1e-6)
+    )
+
+
+def _pickled_size(obj: Any) -> int:
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _drop(obj: Any, names: tuple[str, ...]) -> list[str]:
+    dropped = [name for name in names if name in getattr(obj, "__dict__", {})]
+    for name in dropped:
+        delattr(obj, name)
+    return dropped
+
+
+def _used_features(model: Any) -> np.ndarray | None:
+    """Sorted feature indices the model can read, or None for model types that cannot be pruned."""
+    name = type(model).__name__
+    if hasattr(model, "get_booster") and name.startswith("XGB"):
+        trees = _xgboost_trees(json.loads(model.get_booster().save_raw("json")))
+        if trees is None:
+            return None
+        used = [
+            np.asarray(t["split_indices"])[np.asarray(t["left_children"]) != -1] for t in trees
+        ]
+        return np.unique(np.concatenate(used)) if used else np.zeros(0, dtype=np.int64)
+    trees = _sklearn_trees(model)
+    if trees is not None:
+        return np.unique(np.concatenate([t.feature[t.children_left != -1] for t in trees]))
+    coef = getattr(model, "coef_", None)
+    if isinstance(coef, np.ndarray) and coef.ndim == 2 and hasattr(model, "intercept_"):
+        return np.flatnonzero(np.any(coef != 0, axis=0))
+    return None
+
+
+def _sklearn_trees(model: Any) -> list[Any] | None:
+    if type(model).__name__ == "DecisionTreeClassifier" and hasattr(model, "tree_"):
+        return [model.tree_]
+    estimators = getattr(model, "estimators_", None)
+    if isinstance(estimators, list) and estimators and all(hasattr(e, "tree_") for e in estimators):
+        return [e.tree_ for e in estimators]
+    return None
+
+
+def _xgboost_trees(config: dict[str, Any]) -> list[dict[str, Any]] | None:
+    booster = config["learner"]["gradient_booster"]
+    return booster["model"]["trees"] if booster.get("name") == "gbtree" else None
+
+
+def _remap_tree(tree: Any, n_features: int, remap: np.ndarray) -> Any:
+    cls, args, state = tree.__reduce__()
+    nodes = state["nodes"].copy()
+    internal = nodes["left_child"] != -1
+    nodes["feature"][internal] = remap[nodes["feature"][internal]]
+    pruned = cls(n_features, *args[1:])
+    pruned.__setstate__({**state, "nodes": nodes})
+    return pruned
+
+
+def _remap_estimator(estimator: Any, n_features: int, remap: np.ndarray) -> Any:
+    pruned = copy.copy(estimator)
+    pruned.tree_ = _remap_tree(estimator.tree_, n_features, remap)
+    pruned.n_features_in_ = n_features
+    if hasattr(pruned, "max_features_"):
+        pruned.max_features_ = min(pruned.max_features_, n_features)
+    return pruned
+
+
+def _remap_model(model: Any, used: np.ndarray, remap: np.ndarray) -> Any:
+    """Copy of `model` reading column remap[j] where it read column j (only `used` columns are read)."""
+    n = len(used)
+    if hasattr(model, "get_booster") and type(model).__name__.startswith("XGB"):
+        import xgboost as xgb
+
+        config = json.loads(model.get_booster().save_raw("json"))
+        for t in _xgboost_trees(config) or ():
+            split = np.asarray(t["split_indices"])
+            internal = np.asarray(t["left_children"]) != -1
+            split[internal] = remap[split[internal]]
+            t["split_indices"] = split.tolist()
+            t["tree_param"]["num_feature"] = str(n)
+        learner = config["learner"]
+        learner["learner_model_param"]["num_feature"] = str(n)
+        for key in ("feature_names", "feature_types"):
+            if learner.get(key):
+                learner[key] = [learner[key][j] for j in used]
+        booster = xgb.Booster()
+        booster.load_model(bytearray(json.dumps(config).encode()))
+        pruned = copy.copy(model)
+        pruned._Booster = booster
+        return pruned
+
+    pruned = copy.copy(model)
+    if type(model).__name__ == "DecisionTreeClassifier":
+        pruned = _remap_estimator(model, n, remap)
+    elif _sklearn_trees(model) is not None:
+        pruned.estimators_ = [_remap_estimator(e, n, remap) for e in model.estimators_]
+    else:
+        pruned.coef_ = np.ascontiguousarray(model.coef_[:, used])
+    pruned.n_features_in_ = n
+    return pruned
+
+
+def _prune(vectorizer: Any, model: Any) -> tuple[Any, Any, str] | str:
+    """(vectorizer, model, note) without the unused vocabulary columns, or why that is not possible."""
+    vocabulary = getattr(vectorizer, "vocabulary_", None)
+    if not vocabulary:
+        return f"no vocabulary_ on {type(vectorizer).__name__}"
+    norm = getattr(vectorizer, "norm", None)
+    if norm is not None:
+        return f"rows are {norm}-normalized over every term"
+    used = _used_features(model)
+    if used is None:
+        return f"unsupported model type {type(model).__name__}"
+    n_before = len(vocabulary)
+    if len(used) == n_before:
+        return "model reads every feature"
+
+    remap = np.full(n_before, -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    pruned_model = _remap_model(model, used, remap)
+    pruned_vectorizer = copy.copy(vectorizer)
+    pruned_vectorizer.vocabulary_ = {t: int(remap[j]) for t, j in vocabulary.items() if remap[j] >= 0}
+    tfidf = getattr(vectorizer, "_tfidf", None)
+    if tfidf is not None and getattr(tfidf, "idf_", None) is not None:
+        tfidf = copy.copy(tfidf)
+        tfidf.idf_ = np.asarray(tfidf.idf_)[used]
+        tfidf.n_features_in_ = len(used)
+        pruned_vectorizer._tfidf = tfidf
+    return pruned_vectorizer, pruned_model, f"pruned vocabulary {n_before} -> {len(used)} terms"
+
+
+def float32_idf_enabled() -> bool:
+    return os.environ.get("CAREER_COMPACT_FLOAT32", "0").lower() in ("1", "true", "yes")
+
+
+def compact(
+    vectorizer: Any,
+    model: Any,
+    measure: bool = False,
+    shared_vectorizer: bool = False,
+    float32_idf: bool = False,
+) -> tuple[Any, Any, CompactionReport]:
+    """
+    Return compacted (vectorizer, model) and a report. The given objects may be changed in place
+    (dropped attributes); always use the returned ones. measure=True also records pickled sizes.
+    shared_vectorizer=True skips the steps that change the vectorizer's output (idf, prune);
+    float32_idf=True opts in to the idf downcast.
+    """
+    report = CompactionReport()
+    if measure:
+        report.size_before = {"vectorizer": _pickled_size(vectorizer), "model": _pickled_size(model)}
+    corpus = check_corpus(vectorizer)
+    report.check_texts = len(corpus)
+    report.check_corpus = f"{len(corpus)} synthetic texts from the vocabulary, not real inputs"
+    expected = _scores(model, vectorizer.transform(corpus))
+
+    def unchanged(v: Any, m: Any) -> bool:
+        return _same_predictions(expected, _scores(m, v.transform(corpus)))
+
+    stop_words = getattr(vectorizer, "stop_words_", None)
+    if _drop(vectorizer, ("stop_words_",)):
+        report.applied.append(f"dropped stop_words_ ({len(stop_words or ())} terms)")
+    dropped = _drop(model, _FIT_LEFTOVERS)
+    if dropped:
+        report.applied.append(f"dropped {', '.join(dropped)}")
+
+    idf = getattr(vectorizer, "idf_", None) if getattr(vectorizer, "use_idf", False) else None
+    if not float32_idf:
+        report.skipped["idf float32"] = "not enabled (CAREER_COMPACT_FLOAT32=1)"
+    elif shared_vectorizer:
+        report.skipped["idf float32"] = "vectorizer shared with other models"
+    elif idf is None:
+        report.skipped["idf float32"] = "no idf_"
+    elif np.asarray(idf).dtype == np.float32:
+        report.skipped["idf float32"] = "already float32"
+    else:
+        vectorizer.idf_ = np.asarray(idf, dtype=np.float32)
+        if unchanged(vectorizer, model):
+            report.applied.append("idf float32")
+        else:
+            vectorizer.idf_ = idf
+            report.skipped["idf float32"] = "predictions changed on the check corpus"
+
+    if shared_vectorizer:
+        pruned = "vectorizer shared with other models"
+    else:
+        try:
+            pruned = _prune(vectorizer, model)
+        except Exception as e:  # noqa: BLE001 — unusual model internals: keep the unpruned pair
+            pruned = f"failed: {e}"
+    if isinstance(pruned, str):
+        report.skipped["prune"] = pruned
+    elif unchanged(pruned[0], pruned[1]):
+        vectorizer, model = pruned[0], pruned[1]
+        report.applied.append(pruned[2])
+    else:
+        report.skipped["prune"] = "predictions changed on the check corpus"
+
+    report.identical = unchanged(vectorizer, model)
+    if measure:
+        report.size_after = {"vectorizer": _pickled_size(vectorizer), "model": _pickled_size(model)}
+    return vectorizer, model, report
+
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.2f} MB"
+
+
+def main(argv: list[str]) -> int:
+    from model_loader import artifact_paths, artifacts_directory, load_pickle_or_joblib
+
+    base = Path(argv[1]) if len(argv) > 1 else artifacts_directory()
+    paths = artifact_paths(base)
+    missing = [p.name for p in paths if not p.is_file()]
+    if missing:
+        print(f"FAIL: missing files in {base}: {', '.join(missing)}")
+        return 1
+    vectorizer, model = (load_pickle_or_joblib(p) for p in paths[:2])
+    print(f"Compacting artifacts in {base} (report only, nothing is written) ...")
+    t0 = time.perf_counter()
+    _, _, report = compact(vectorizer, model, measure=True, float32_idf=float32_idf_enabled())
+    print(f"  applied: {report.note}")
+    for step, reason in report.skipped.items():
+        print(f"  skipped {step}: {reason}")
+    for name in ("vectorizer", "model"):
+        before, after = report.size_before[name], report.size_after[name]
+        print(f"  {name:<10} {_mb(before)} -> {_mb(after)} ({(1 - after / before) * 100 if before else 0:.1f}% smaller)")
+    verdict = "identical" if report.identical else "DIFFERENT"
+    print(f"  predictions on {report.check_texts} check texts: {verdict} ({time.perf_counter() - t0:.2f}s)")
+    if not report.identical:
+        return 2
+    print("  Run fast_artifacts.py to write the compacted fast-load cache.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
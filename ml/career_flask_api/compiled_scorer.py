@@ -0,0 +1,222 @@
+"""
+Compiled inference backends built once from the loaded model, bypassing sklearn / XGBoost
+per-call overhead (input validation, DMatrix construction, joblib dispatch over trees):
+
+  linear  — LogisticRegression-style coef_ / intercept_: one sparse dot + softmax or sigmoid
+  xgboost — Booster.inplace_predict on the CSR matrix (no DMatrix, no feature-name checks)
+  forest  — RandomForest / ExtraTrees / DecisionTree flattened into node arrays, all trees
+            walked together with NumPy
+
+build_scorer() only returns a backend whose predict_proba matches the original model on a
+check corpus; anything else keeps using the model itself. CAREER_COMPILED_SCORER=0 disables it.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rows densified at a time by the forest walker (bounds memory to chunk x n_features float32).
+_FOREST_CHUNK = 64
+
+
+def check_corpus(vectorizer: Any, n: int = 64) -> list[str]:
+    """Deterministic texts built from the fitted vocabulary (no user data needed)."""
+    terms = sorted(getattr(vectorizer, "vocabulary_", {}))
+    if not terms:
+        return ["python sql machine learning data analysis"]
+    step = max(1, len(terms) // n)
+    return [" ".join(terms[i : i + 6]) for i in range(0, len(terms), step)][:n]
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+class LinearScorer:
+    kind = "linear"
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray, mode: str) -> None:
+        self.coef_t = np.ascontiguousarray(np.asarray(coef, dtype=np.float64).T)
+        self.intercept = np.asarray(intercept, dtype=np.float64).ravel()
+        self.mode = mode  # "binary" | "softmax" | "ovr"
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        z = np.asarray(X @ self.coef_t) + self.intercept
+        if self.mode == "binary":
+            p = _sigmoid(z[:, 0])
+            return np.column_stack([1.0 - p, p])
+        if self.mode == "softmax":
+            z = z - z.max(axis=1, keepdims=True)
+            e = np.exp(z)
+            return e / e.sum(axis=1, keepdims=True)
+        p = _sigmoid(z)
+        return p / p.sum(axis=1, keepdims=True)
+
+
+class XGBoostScorer:
+    kind = "xgboost"
+
+    def __init__(self, model: Any) -> None:
+        self.booster = model.get_booster()
+        try:
+            best = int(model.best_iteration)
+            self.iteration_range = (0, best + 1)
+        except (AttributeError, TypeError, ValueError):
+            self.iteration_range = (0, 0)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        p = np.asarray(
+            self.booster.inplace_predict(X, iteration_range=self.iteration_range, validate_features=False)
+        )
+        if p.ndim == 1:  # binary:logistic returns P(class 1)
+            return np.column_stack([1.0 - p, p])
+        return p
+
+
+class ForestScorer:
+    kind = "forest"
+
+    def __init__(self, trees: list[Any]) -> None:
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for t in trees:
+            left = t.children_left.astype(np.int64)
+            right = t.children_right.astype(np.int64)
+            leaf = left == -1
+            lefts.append(np.where(leaf, -1, left + offset))
+            rights.append(np.where(leaf, -1, right + offset))
+            features.append(np.where(leaf, 0, t.feature).astype(np.int64))
+            thresholds.append(t.threshold.astype(np.float64))
+            v = t.value[:, 0, :].astype(np.float64)
+            norm = v.sum(axis=1, keepdims=True)
+            norm[norm == 0.0] = 1.0
+            values.append(v / norm)
+            roots.append(offset)
+            offset += t.node_count
+            depth = max(depth, int(t.max_depth))
+        self.left = np.concatenate(lefts)
+        self.right = np.concatenate(rights)
+        self.feature = np.concatenate(features)
+        self.threshold = np.concatenate(thresholds)
+        self.value = np.concatenate(values)
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.max_depth = depth
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        n = X.shape[0]
+        out = np.empty((n, self.value.shape[1]), dtype=np.float64)
+        for start in range(0, n, _FOREST_CHUNK):
+            chunk = X[start : start + _FOREST_CHUNK]
+            # sklearn compares float32 feature values against the float64 thresholds.
+            dense = chunk.toarray().astype(np.float32) if hasattr(chunk, "toarray") else np.asarray(chunk, np.float32)
+            rows = np.arange(dense.shape[0])[:, None]
+            node = np.broadcast_to(self.roots, (dense.shape[0], self.roots.size)).copy()
+            for _ in range(self.max_depth):
+                left = self.left[node]
+                is_leaf = left == -1
+                if is_leaf.all():
+                    break
+                go_left = dense[rows, self.feature[node]] <= self.threshold[node]
+                node = np.where(is_leaf, node, np.where(go_left, left, self.right[node]))
+            out[start : start + dense.shape[0]] = self.value[node].mean(axis=1)
+        return out
+
+
+class FlatForestClassifier:
+    """
+    A tree classifier reduced to ForestScorer's node arrays plus classes_: the form fast_artifacts.py
+    stores, so a fast-load memory-maps a handful of flat arrays instead of unpickling every tree.
+    predict / predict_proba are the compiled forest walk (parity checked against the original when
+    the cache is written).
+    """
+
+    def __init__(self, scorer: ForestScorer, classes: np.ndarray, n_features_in: int | None, source: str) -> None:
+        self.scorer = scorer
+        self.classes_ = classes
+        self.n_features_in_ = n_features_in
+        self.source = source  # original estimator class name
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return self.scorer.predict_proba(X)
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+
+def _trees(model: Any) -> list[Any] | None:
+    """The fitted sklearn Tree objects of a single-output tree classifier, else None."""
+    name = type(model).__name__
+    estimators = getattr(model, "estimators_", None)
+    if name in ("RandomForestClassifier", "ExtraTreesClassifier") and estimators:
+        return [e.tree_ for e in estimators]
+    if name == "DecisionTreeClassifier" and hasattr(model, "tree_"):
+        return [model.tree_]
+    return None
+
+
+def flat_forest(model: Any) -> FlatForestClassifier | None:
+    """`model` as a FlatForestClassifier, or None when it is not a supported tree classifier."""
+    trees = _trees(model)
+    if trees is None or getattr(model, "n_outputs_", 1) != 1:
+        return None
+    n_features = getattr(model, "n_features_in_", None)
+    return FlatForestClassifier(ForestScorer(trees), np.asarray(model.classes_), n_features, type(model).__name__)
+
+
+def _candidates(model: Any) -> list[Any]:
+    """Possible compiled backends for `model`, most specific first (parity decides)."""
+    name = type(model).__name__
+    if hasattr(model, "get_booster") and name.startswith("XGB"):
+        return [XGBoostScorer(model)]
+    trees = _trees(model)
+    if trees is not None:
+        return [ForestScorer(trees)]
+    coef = getattr(model, "coef_", None)
+    if coef is not None and hasattr(model, "predict_proba") and hasattr(model, "intercept_"):
+        coef = coef.toarray() if hasattr(coef, "toarray") else np.asarray(coef)
+        if coef.shape[0] == 1:
+            return [LinearScorer(coef, model.intercept_, "binary")]
+        return [LinearScorer(coef, model.intercept_, m) for m in ("softmax", "ovr")]
+    return []
+
+
+def build_scorer(model: Any, vectorizer: Any) -> tuple[Any | None, str | None]:
+    """
+    Return (scorer, note). scorer is None when disabled, unsupported, or when no candidate matches
+    model.predict_proba (same argmax, |diff| <= 1e-6) on the check corpus; note says why.
+    """
+    if os.environ.get("CAREER_COMPILED_SCORER", "1").lower() in ("0", "false", "no"):
+        return None, "disabled"
+    if not hasattr(model, "predict_proba"):
+        return None, "model has no predict_proba"
+    if isinstance(model, FlatForestClassifier):  # its predict_proba is this scorer: nothing to check
+        return model.scorer, model.scorer.kind
+    try:
+        candidates = _candidates(model)
+    except Exception as e:  # noqa: BLE001 — unusual model internals: keep the original model
+        return None, f"build failed: {e}"
+    if not candidates:
+        return None, f"unsupported model type {type(model).__name__}"
+
+    X = vectorizer.transform(check_corpus(vectorizer))
+    expected = np.asarray(model.predict_proba(X))
+    for scorer in candidates:
+        try:
+            got = scorer.predict_proba(X)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Compiled %s scorer failed on check corpus: %s", scorer.kind, e)
+            continue
+        if (
+            got.shape == expected.shape
+            and np.array_equal(got.argmax(axis=1), expected.argmax(axis=1))
+            and np.allclose(got, expected, rtol=0, atol=1e-6)
+        ):
+            return scorer, scorer.kind
+    return None, "parity check failed"
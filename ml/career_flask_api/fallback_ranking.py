@@ -0,0 +1,331 @@
+"""
+Top-k ranking for models without predict_proba (LinearSVC, SVC without probability=True,
+RidgeClassifier, ...), so /recommend-top3, top_k and /recommend-batch recommendations work
+instead of answering 501 MODEL_NO_PROBA. Built once per load, next to compiled_scorer.py:
+
+  decision_function  the model's own decision scores; for linear models (coef_ / intercept_)
+                     compiled to one sparse dot product, used only if it matches
+                     model.decision_function on the check corpus
+  centroid           without decision_function: cosine similarity to per-class TF-IDF centroids
+                     precomputed into class_centroids.npy (python fallback_ranking.py centroids)
+
+Either way one matrix operation scores every class for every row; ranking.py then picks the
+top k. Raw scores are turned into probability-like values (rows sum to 1) by a calibration,
+optionally fitted on labelled data and stored next to the artifacts in score_calibration.json:
+
+  {"method": "softmax", "temperature": 0.4}       softmax(scores / temperature)
+  {"method": "platt", "a": [...], "b": [...]}     sigmoid(a_j * score_j + b_j) per class, normalized
+  {"method": "normalize"}                         scores clipped at 0, divided by the row sum
+
+Defaults: softmax with temperature 1 for decision scores, normalize for centroids.
+best_career is still the model's prediction: when the ranking's top class differs from
+model.predict (always possible with centroids), the predicted class is listed first.
+CAREER_FALLBACK_RANKING=0 turns this off (models without predict_proba then answer 501 again).
+
+  python fallback_ranking.py centroids labelled.jsonl [--model-dir DIR] [--label-field career]
+  python fallback_ranking.py calibrate labelled.jsonl [--method softmax|platt] [--model-dir DIR]
+
+Labelled rows are JSONL or CSV with "text" (or the profile fields, like score_profiles.py) and
+the career in --label-field. Rerun `calibrate` after `centroids` or a model change; either file
+changing triggers a reload like the artifacts themselves.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from compiled_scorer import check_corpus
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_FILE = "score_calibration.json"
+CENTROIDS_FILE = "class_centroids.npy"
+# Optional ranking files of a model directory; part of its version (model_loader._version_paths).
+RANKING_FILES = (CALIBRATION_FILE, CENTROIDS_FILE)
+CALIBRATION_METHODS = ("softmax", "platt", "normalize")
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+class Calibration:
+    """Raw per-class scores -> probability-like rows that sum to 1 (order-preserving for softmax / normalize)."""
+
+    def __init__(
+        self,
+        method: str = "softmax",
+        temperature: float = 1.0,
+        a: list[float] | None = None,
+        b: list[float] | None = None,
+    ) -> None:
+        if method not in CALIBRATION_METHODS:
+            raise ValueError(f"unknown calibration method {method!r}")
+        if method == "softmax" and not temperature > 0:
+            raise ValueError("temperature must be positive")
+        if method == "platt" and (a is None or b is None or len(a) != len(b)):
+            raise ValueError('platt calibration needs "a" and "b" lists of equal length')
+        self.method = method
+        self.temperature = float(temperature)
+        self.a = np.asarray(a, dtype=np.float64) if a is not None else None
+        self.b = np.asarray(b, dtype=np.float64) if b is not None else None
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> Calibration:
+        return cls(raw.get("method", "softmax"), raw.get("temperature", 1.0), raw.get("a"), raw.get("b"))
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"method": self.method}
+        if self.method == "softmax":
+            out["temperature"] = self.temperature
+        elif self.method == "platt":
+            out["a"], out["b"] = self.a.tolist(), self.b.tolist()
+        return out
+
+    def describe(self) -> str:
+        return f"softmax T={self.temperature:g}" if self.method == "softmax" else self.method
+
+    def apply(self, scores: np.ndarray) -> np.ndarray:
+        if self.method == "softmax":
+            z = scores / self.temperature
+            e = np.exp(z - z.max(axis=1, keepdims=True))
+            return e / e.sum(axis=1, keepdims=True)
+        if self.method == "platt":
+            if self.a.size != scores.shape[1]:
+                raise ValueError(f"platt calibration has {self.a.size} classes, scores have {scores.shape[1]}")
+            p = _sigmoid(scores * self.a + self.b)
+        else:
+            p = np.clip(scores, 0.0, None)
+        total = p.sum(axis=1, keepdims=True)
+        # A row with no positive score (no known term near any centroid) ranks every class equally.
+        return np.divide(p, total, out=np.full_like(p, 1.0 / p.shape[1]), where=total > 0)
+
+
+class LinearDecision:
+    """decision_function of a linear model as one sparse dot product (no sklearn input validation)."""
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray) -> None:
+        self.coef_t = np.ascontiguousarray(np.asarray(coef, dtype=np.float64).T)
+        self.intercept = np.asarray(intercept, dtype=np.float64).ravel()
+
+    def __call__(self, X: Any) -> np.ndarray:
+        return np.asarray(X @ self.coef_t) + self.intercept
+
+
+class CentroidSimilarity:
+    """Cosine similarity of each row to each class centroid (rows of `centroids`, L2-normalized)."""
+
+    def __init__(self, centroids: np.ndarray) -> None:
+        c = np.asarray(centroids, dtype=np.float64)
+        norms = np.linalg.norm(c, axis=1, keepdims=True)
+        self.centroids_t = np.ascontiguousarray(np.divide(c, norms, out=np.zeros_like(c), where=norms > 0).T)
+
+    def __call__(self, X: Any) -> np.ndarray:
+        sims = np.asarray(X @ self.centroids_t)
+        # TF-IDF rows are usually L2-normalized already; divide anyway so norm=None vectorizers work.
+        squares = X.multiply(X).sum(axis=1) if hasattr(X, "multiply") else (np.asarray(X) ** 2).sum(axis=1, keepdims=True)
+        norms = np.sqrt(np.asarray(squares))
+        return np.divide(sims, norms, out=np.zeros_like(sims), where=norms > 0)
+
+
+class Ranker:
+    """Calibrated class scores for a model without predict_proba."""
+
+    def __init__(self, kind: str, raw: Any, calibration: Calibration, exact_label: bool = False) -> None:
+        self.kind = kind  # "decision_function", "linear decision_function" or "centroid"
+        self.raw = raw
+        self.calibration = calibration
+        # True when the top-scored class matched model.predict on the check corpus at load, so the
+        # label can come from the scores without a second model call.
+        self.exact_label = exact_label
+
+    def raw_scores(self, X: Any) -> np.ndarray:
+        s = np.asarray(self.raw(X), dtype=np.float64)
+        if s.ndim == 1 or s.shape[1] == 1:  # binary decision_function: positive means classes_[1]
+            s = s.reshape(-1)
+            s = np.column_stack([-s, s])
+        return s
+
+    def scores(self, X: Any) -> np.ndarray:
+        return self.calibration.apply(self.raw_scores(X))
+
+    @property
+    def note(self) -> str:
+        return f"{self.kind} ({self.calibration.describe()})"
+
+
+def _decision_source(model: Any, X: Any) -> tuple[str, Any]:
+    """The compiled linear decision function if it matches model.decision_function on X, else the model's."""
+    coef, intercept = getattr(model, "coef_", None), getattr(model, "intercept_", None)
+    if coef is not None and intercept is not None:
+        try:
+            linear = LinearDecision(coef.toarray() if hasattr(coef, "toarray") else coef, intercept)
+            got = linear(X)
+            expected = np.asarray(model.decision_function(X), dtype=np.float64)
+            if got.shape[1] == 1:
+                got = got[:, 0]
+            if got.shape == expected.shape and np.allclose(got, expected, rtol=0, atol=1e-6):
+                return "linear decision_function", linear
+        except Exception as e:  # noqa: BLE001 — unusual internals: call the model itself
+            logger.warning("Compiled decision_function failed on check corpus: %s", e)
+    return "decision_function", model.decision_function
+
+
+def build_ranker(model: Any, vectorizer: Any, base: Path, class_values: np.ndarray) -> tuple[Ranker | None, str | None]:
+    """
+    Return (ranker, note) for a model without predict_proba; (None, None) when the model has it.
+    ranker is None when disabled or when there is nothing to rank with; note says why.
+    """
+    if hasattr(model, "predict_proba"):
+        return None, None
+    if os.environ.get("CAREER_FALLBACK_RANKING", "1").lower() in ("0", "false", "no"):
+        return None, "disabled"
+    calibration = None
+    calibration_path = base / CALIBRATION_FILE
+    try:
+        if calibration_path.is_file():
+            calibration = Calibration.from_dict(json.loads(calibration_path.read_text(encoding="utf-8")))
+        X = vectorizer.transform(check_corpus(vectorizer))
+        if hasattr(model, "decision_function"):
+            kind, raw = _decision_source(model, X)
+            ranker = Ranker(kind, raw, calibration or Calibration("softmax"))
+        elif (base / CENTROIDS_FILE).is_file():
+            centroids = np.load(base / CENTROIDS_FILE)
+            if centroids.shape != (len(class_values), X.shape[1]):
+                return None, f"{CENTROIDS_FILE} is {centroids.shape}, expected {(len(class_values), X.shape[1])}; rebuild it"
+            ranker = Ranker("centroid", CentroidSimilarity(centroids), calibration or Calibration("normalize"))
+        else:
+            return None, f"no decision_function and no {CENTROIDS_FILE}"
+        scores = ranker.scores(X)
+    except Exception as e:  # noqa: BLE001 — bad file or odd model: serve labels only, as before
+        logger.warning("Fallback ranking unavailable: %s", e)
+        return None, f"failed: {e}"
+    if scores.shape != (X.shape[0], len(class_values)):
+        return None, f"scores have shape {scores.shape}, expected {(X.shape[0], len(class_values))}"
+    if ranker.kind != "centroid":
+        predicted = np.asarray(model.predict(X)).ravel()
+        ranker.exact_label = bool(np.array_equal(np.asarray(class_values)[scores.argmax(axis=1)], predicted))
+    return ranker, ranker.note
+
+
+# --- offline tools: build centroids, fit calibration ---------------------------------------------
+
+
+def _labelled(path: str, label_field: str, bundle: Any) -> tuple[list[str], np.ndarray]:
+    """Texts and class column per usable row; labels are career names or raw model class values."""
+    from model_loader import label_key
+    from score_profiles import profile_text, read_rows
+
+    column = {str(label): j for j, label in enumerate(bundle.class_labels)}
+    column.update({str(label_key(v)): j for j, v in enumerate(bundle.class_values)})
+    texts, ys, skipped = [], [], 0
+    fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+    for _, rec in read_rows(path, fmt):
+        text = profile_text(rec).strip().lower() if rec else ""
+        j = column.get(str((rec or {}).get(label_field, "")).strip())
+        if not text or j is None:
+            skipped += 1
+            continue
+        texts.append(text)
+        ys.append(j)
+    if skipped:
+        print(f"  skipped {skipped} rows without text or a known {label_field!r}", file=sys.stderr)
+    if not texts:
+        raise SystemExit(f"{path}: no usable labelled rows")
+    return texts, np.asarray(ys)
+
+
+def build_centroids(X: Any, y: np.ndarray, n_classes: int) -> np.ndarray:
+    """Mean TF-IDF row per class as one sparse product (class indicator x X); float32, unnormalized."""
+    from scipy import sparse
+
+    indicator = sparse.csr_matrix((np.ones(len(y)), (y, np.arange(len(y)))), shape=(n_classes, len(y)))
+    counts = np.maximum(np.asarray(indicator.sum(axis=1)), 1)
+    return (np.asarray((indicator @ X).todense()) / counts).astype(np.float32)
+
+
+def fit_calibration(scores: np.ndarray, y: np.ndarray, method: str) -> Calibration:
+    """Temperature (grid search on log-loss) or per-class Platt scaling fitted on raw scores."""
+    if method == "softmax":
+        rows = np.arange(len(y))
+        best_t, best_loss = 1.0, np.inf
+        for t in np.geomspace(0.001, 1000, 181):
+            z = scores / t
+            m = z.max(axis=1)
+            loss = float(np.mean(m + np.log(np.exp(z - m[:, None]).sum(axis=1)) - z[rows, y]))
+            if loss < best_loss:
+                best_t, best_loss = float(t), loss
+        return Calibration("softmax", temperature=best_t)
+    if method == "platt":
+        from sklearn.linear_model import LogisticRegression
+
+        a, b = [], []
+        for j in range(scores.shape[1]):
+            target = y == j
+            if target.all() or not target.any():
+                a.append(1.0)
+                b.append(0.0)
+                continue
+            lr = LogisticRegression(C=1e4).fit(scores[:, j : j + 1], target)
+            a.append(float(lr.coef_[0, 0]))
+            b.append(float(lr.intercept_[0]))
+        return Calibration("platt", a=a, b=b)
+    return Calibration(method)
+
+
+def _log_loss(probs: np.ndarray, y: np.ndarray) -> float:
+    return float(-np.mean(np.log(np.clip(probs[np.arange(len(y)), y], 1e-12, None))))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build class centroids / fit score calibration for fallback ranking.")
+    parser.add_argument("command", choices=("centroids", "calibrate"))
+    parser.add_argument("corpus", help="labelled JSONL or CSV")
+    parser.add_argument("--model-dir", type=Path, help="default: CAREER_MODEL_DIR or ./models")
+    parser.add_argument("--label-field", default="career")
+    parser.add_argument("--method", choices=CALIBRATION_METHODS, default="softmax", help="calibrate only")
+    args = parser.parse_args(argv)
+
+    from model_loader import _read_bundle, artifacts_directory
+
+    base = args.model_dir or artifacts_directory()
+    bundle = _read_bundle(base)
+    texts, y = _labelled(args.corpus, args.label_field, bundle)
+    X = bundle.transform(texts)
+    n_classes = len(bundle.class_labels)
+
+    if args.command == "centroids":
+        centroids = build_centroids(X, y, n_classes)
+        np.save(base / CENTROIDS_FILE, centroids)
+        empty = [str(bundle.class_labels[j]) for j in range(n_classes) if not (y == j).any()]
+        print(f"Wrote {base / CENTROIDS_FILE}: {n_classes} classes x {centroids.shape[1]} terms from {len(texts)} rows")
+        if empty:
+            print(f"  no rows for: {', '.join(empty)} (never ranked above 0)")
+        if hasattr(bundle.model, "predict_proba") or hasattr(bundle.model, "decision_function"):
+            print("  note: this model has predict_proba / decision_function, so the centroids are not used")
+        return 0
+
+    if bundle.ranker is None:
+        raise SystemExit(f"Nothing to calibrate: {bundle.ranker_note or 'the model has predict_proba'}")
+    raw = bundle.ranker.raw_scores(X)
+    before = bundle.ranker.scores(X)
+    calibration = fit_calibration(raw, y, args.method)
+    after = calibration.apply(raw)
+    (base / CALIBRATION_FILE).write_text(json.dumps(calibration.to_dict(), indent=1), encoding="utf-8")
+    print(f"Wrote {base / CALIBRATION_FILE}: {calibration.describe()} for {bundle.ranker.kind} scores, {len(texts)} rows")
+    print(f"  log-loss {_log_loss(before, y):.4f} ({bundle.ranker.calibration.describe()}) -> {_log_loss(after, y):.4f}")
+    print(f"  top-1 agreement with labels: {float(np.mean(after.argmax(axis=1) == y)):.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+One-time converter: write a compact fast-load cache next to the Colab .pkl files.
+Run from this folder:  python fast_artifacts.py [MODEL_DIR]
+
+The cache lives in MODEL_DIR/.fastload/<sha256 of the sources>/. Each object is pickled without
+its numpy arrays; the arrays (idf, linear-model coefficients, ...) are written as flat .npy
+files under arrays/ and memory-mapped on load, so every worker process shares them through the
+page cache. The vocabulary dict is stored as one term array in column order and rebuilt from it.
+RandomForest / ExtraTrees / DecisionTree models are stored as compiled_scorer.py's flat node
+arrays (FlatForestClassifier) instead of one pickled Tree per estimator.
+
+The trio is compacted first (compact_artifacts.py: stop_words_ dropped, unused vocabulary pruned
+where exact, float32 idf with CAREER_COMPACT_FLOAT32=1; every step verified on a check corpus),
+the written cache is loaded back and checked against it, and current.json records the compaction
+report (before/after sizes, what the checks ran on). model_loader picks the cache automatically
+while the .pkl files are unchanged (set CAREER_FASTLOAD=0 to ignore it). If loading the cache is not faster than unpickling the .pkl files, the converter fails and
+removes current.json, so the server keeps loading the .pkl files.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from compact_artifacts import CompactionReport, compact, float32_idf_enabled
+from compiled_scorer import check_corpus, flat_forest
+from model_loader import (
+    FASTLOAD_ARRAYS,
+    FASTLOAD_DIRNAME,
+    FASTLOAD_FILES,
+    FASTLOAD_FORMAT,
+    artifact_paths,
+    artifacts_directory,
+    fresh_fastload_dir,
+    load_fastload_trio,
+    load_pickle_or_joblib,
+    source_stats,
+)
+
+# Smaller arrays stay inside the pickle: one more file to open costs more than it shares.
+MIN_FLAT_BYTES = 4096
+
+
+def _sha256(paths: list[Path]) -> str:
+    h = hashlib.sha256()
+    for p in paths:
+        with open(p, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def _terms_by_column(vocabulary: dict) -> np.ndarray | None:
+    """The vocabulary as terms[column], or None unless its columns are exactly 0..n-1 (str terms)."""
+    terms = np.empty(len(vocabulary), dtype=object)
+    seen = np.zeros(len(vocabulary), dtype=bool)
+    for term, column in vocabulary.items():
+        if not isinstance(term, str) or not 0 <= column < len(vocabulary) or seen[column]:
+            return None
+        terms[column] = term
+        seen[column] = True
+    return terms.astype(str) if len(terms) else None
+
+
+class _FlatPickler(pickle.Pickler):
+    """
+    Pickles one artifact with its large numpy arrays written to arrays/<prefix>-<n>.npy instead,
+    and `vocabulary` (the vectorizer's vocabulary_) as a term array; model_loader's _FlatUnpickler
+    resolves both persistent ids.
+    """
+
+    def __init__(self, f, arrays: Path, prefix: str, vocabulary: dict | None = None) -> None:
+        super().__init__(f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._arrays = arrays
+        self._prefix = prefix
+        self._vocabulary = vocabulary
+        self._written: dict[int, tuple[str, str]] = {}
+
+    def _save(self, kind: str, obj: object, array: np.ndarray) -> tuple[str, str]:
+        if id(obj) not in self._written:
+            name = f"{self._prefix}-{len(self._written)}.npy"
+            np.save(self._arrays / name, array, allow_pickle=False)
+            self._written[id(obj)] = (kind, name)
+        return self._written[id(obj)]
+
+    def persistent_id(self, obj: object) -> tuple[str, str] | None:
+        if self._vocabulary is not None and obj is self._vocabulary:
+            terms = _terms_by_column(obj)
+            return self._save("vocabulary", obj, terms) if terms is not None else None
+        if type(obj) is np.ndarray and not obj.dtype.hasobject and obj.nbytes >= MIN_FLAT_BYTES:
+            return self._save("array", obj, obj)
+        return None
+
+
+def _write(target: Path, vectorizer: object, model: object, label_encoder: object) -> None:
+    arrays = target / FASTLOAD_ARRAYS
+    arrays.mkdir(parents=True)
+    vocabulary = getattr(vectorizer, "vocabulary_", None)
+    for obj, name in zip((vectorizer, model, label_encoder), FASTLOAD_FILES):
+        with open(target / name, "wb") as f:
+            _FlatPickler(f, arrays, name.split(".")[0], vocabulary if obj is vectorizer else None).dump(obj)
+
+
+def _check_loaded(target: Path, vectorizer: object, model: object) -> None:
+    """The cache as the server will load it must transform and predict like the compacted pair."""
+    loaded_vectorizer, loaded_model, _ = load_fastload_trio(target)
+    texts = check_corpus(vectorizer)
+    X = vectorizer.transform(texts)
+    if (loaded_vectorizer.transform(texts) != X).nnz:
+        raise RuntimeError("the cached vectorizer transforms differently on the check corpus")
+    same = np.array_equal(np.asarray(loaded_model.predict(X)), np.asarray(model.predict(X)))
+    if same and hasattr(model, "predict_proba"):
+        expected, got = np.asarray(model.predict_proba(X)), np.asarray(loaded_model.predict_proba(X))
+        same = got.shape == expected.shape and np.allclose(got, expected, rtol=0, atol=1e-6)
+    if not same:
+        raise RuntimeError("the cached model predicts differently on the check corpus")
+
+
+def convert(base: Path) -> tuple[Path, CompactionReport]:
+    """Write the fast-load cache for the .pkl trio in `base` and point current.json at it."""
+    paths = artifact_paths(base)
+    missing = [p.name for p in paths if not p.is_file()]
+    if missing:
+        raise FileNotFoundError(f"Missing files in {base}: {', '.join(missing)}")
+
+    stats = source_stats(paths)
+    digest = _sha256(paths)
+    root = base / FASTLOAD_DIRNAME
+    target = root / digest[:16]
+
+    vectorizer, model, label_encoder = (load_pickle_or_joblib(p) for p in paths)
+    vectorizer, model, report = compact(vectorizer, model, measure=True, float32_idf=float32_idf_enabled())
+    if not report.identical:
+        raise RuntimeError("compacted artifacts predict differently on the check corpus")
+    idf = getattr(vectorizer, "idf_", None) if getattr(vectorizer, "use_idf", False) else None
+    idf_dtype = np.asarray(idf).dtype.name if idf is not None else "none"
+    flat = flat_forest(model)
+
+    tmp = root / f".tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    try:
+        _write(tmp, vectorizer, flat if flat is not None else model, label_encoder)
+        _check_loaded(tmp, vectorizer, model)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+    manifest = {
+        "format": FASTLOAD_FORMAT,
+        "dir": target.name,
+        "sha256": digest,
+        "source": stats,
+        "idf_dtype": idf_dtype,
+        "model_layout": f"flat forest ({flat.source})" if flat is not None else type(model).__name__,
+        "compaction": report.as_dict(),
+        "created_at": time.time(),
+    }
+    pointer_tmp = root / f"current.json.{os.getpid()}"
+    pointer_tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(pointer_tmp, root / "current.json")
+
+    # Drop caches built from older exports.
+    for old in root.iterdir():
+        if old.is_dir() and old != target:
+            shutil.rmtree(old, ignore_errors=True)
+    return target, report
+
+
+def _best_ms(load: Callable[[], object], repeat: int = 3) -> float:
+    """Fastest of `repeat` loads after one untimed one (both formats measured with a warm page cache)."""
+    load()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        load()
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1000
+
+
+def main(argv: list[str]) -> int:
+    base = Path(argv[1]) if len(argv) > 1 else artifacts_directory()
+    print(f"Converting artifacts in {base} ...")
+    t0 = time.perf_counter()
+    try:
+        target, report = convert(base)
+    except Exception as e:  # noqa: BLE001
+        print(f"  FAIL: {e}")
+        return 1
+    print(f"  wrote {target} in {time.perf_counter() - t0:.2f}s")
+    print(f"  compaction: {report.note}")
+    for name in ("vectorizer", "model"):
+        print(f"  {name} pickled: {report.size_before[name]:,} -> {report.size_after[name]:,} bytes")
+
+    if fresh_fastload_dir(base) != target:
+        print("  FAIL: cache written but not detected as fresh (CAREER_FASTLOAD=0?)")
+        return 2
+    fast = _best_ms(lambda: load_fastload_trio(target))
+    slow = _best_ms(lambda: [load_pickle_or_joblib(p) for p in artifact_paths(base)])
+    print(f"  load time: pickle {slow:.1f} ms -> fast-load {fast:.1f} ms")
+    if fast >= slow:
+        (base / FASTLOAD_DIRNAME / "current.json").unlink()
+        print("  FAIL: fast-load is not faster than pickle here; removed current.json, the .pkl files stay in use")
+        return 3
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,71 @@
+"""
+Response serialization shared by app.py (as Flask's JSON provider) and ../predict_api.py.
+
+dumps() encodes with orjson when it is installed: compact UTF-8 bytes, NumPy scalars and arrays
+written directly, several times faster than the stdlib encoder on prediction payloads. Without
+orjson (or with CAREER_FAST_JSON=0) it falls back to json.dumps with the same compact output, so
+responses are equivalent either way. Objects orjson refuses (non-string keys, integers past 64
+bits) are retried with the stdlib encoder instead of failing the request.
+
+ETag helpers for static documents (GET /classes) live here too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Callable
+
+try:
+    if os.environ.get("CAREER_FAST_JSON", "1").lower() in ("0", "false", "no"):
+        raise ImportError("disabled by CAREER_FAST_JSON")
+    import orjson
+except ImportError:
+    orjson = None
+
+# "orjson" or "json"; reported by GET / and /health.
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(obj: Any, sort_keys: bool = False, default: Callable[[Any], Any] | None = None) -> bytes:
+    """
+    Compact JSON as UTF-8 bytes. `default` converts types neither encoder knows; with orjson,
+    datetimes are passed to it too, so they come out as they would from the stdlib path.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if default is not None:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            pass  # orjson.JSONEncodeError; the stdlib encoder below handles the rest or raises
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=default
+    ).encode()
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON text or UTF-8 bytes; errors are ValueError (json.JSONDecodeError) either way."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def etag(body: bytes) -> str:
+    """Strong validator for a response body (same bytes, same tag)."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, tag: str) -> bool:
+    """True when an If-None-Match header lists `tag` (weak comparison) or is "*"."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == tag:
+            return True
+    return False
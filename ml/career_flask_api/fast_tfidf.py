@@ -0,0 +1,178 @@
+"""
+Compiled TF-IDF transform: the fitted TfidfVectorizer's settings (vocabulary, token pattern,
+lowercase / strip_accents, stop words, ngram_range, binary, sublinear_tf, idf, norm) are read
+once and applied in a single pass per text, building the CSR arrays directly instead of going
+through CountVectorizer + TfidfTransformer + sklearn.preprocessing.normalize.
+
+compile_vectorizer() only returns the compiled transformer when its output is bit-for-bit
+equal to vectorizer.transform on a check corpus; unsupported settings (custom analyzer /
+tokenizer / preprocessor, char analyzers, non-text input) keep the original vectorizer.
+CAREER_FAST_TFIDF=0 disables it.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from typing import Any
+
+import numpy as np
+
+from compiled_scorer import check_corpus
+
+
+class CompiledTfidf:
+    """Drop-in for TfidfVectorizer.transform(list[str]) on supported word-analyzer settings."""
+
+    def __init__(self, vectorizer: Any, matrix_type: type) -> None:
+        self.vocabulary: dict[str, int] = dict(vectorizer.vocabulary_)
+        self.n_features = len(self.vocabulary)
+        pattern = vectorizer.token_pattern
+        self.token_re = re.compile(pattern) if pattern is not None else None
+        self.lowercase = bool(vectorizer.lowercase)
+        self.strip_accents = _accent_function(vectorizer.strip_accents)
+        stop = vectorizer.get_stop_words()
+        self.stop_words = frozenset(stop) if stop else None
+        self.min_n, self.max_n = vectorizer.ngram_range
+        self.binary = bool(vectorizer.binary)
+        self.sublinear_tf = bool(vectorizer.sublinear_tf)
+        # Python floats: a float32 idf_ (fast-load cache) is upcast exactly like sklearn's
+        # float64 X.data *= idf_[X.indices], instead of pulling the product down to float32.
+        self.idf = np.asarray(vectorizer.idf_, dtype=np.float64).tolist() if vectorizer.use_idf else None
+        self.norm = vectorizer.norm
+        self.matrix_type = matrix_type
+
+    def _tokens(self, doc: str) -> list[str]:
+        if self.lowercase:
+            doc = doc.lower()
+        if self.strip_accents is not None:
+            doc = self.strip_accents(doc)
+        tokens = self.token_re.findall(doc)
+        if self.stop_words is not None:
+            tokens = [w for w in tokens if w not in self.stop_words]
+        min_n, max_n = self.min_n, self.max_n
+        if max_n == 1:
+            return tokens
+        # Same n-gram order as sklearn's _word_ngrams (order does not affect counts).
+        grams = list(tokens) if min_n == 1 else []
+        n_tokens = len(tokens)
+        for n in range(max(min_n, 2), min(max_n + 1, n_tokens + 1)):
+            for i in range(n_tokens - n + 1):
+                grams.append(" ".join(tokens[i : i + n]))
+        return grams
+
+    def transform(self, raw_documents: list[str]) -> Any:
+        vocab = self.vocabulary
+        indices: list[int] = []
+        data: list[float] = []
+        indptr = [0]
+        for doc in raw_documents:
+            counts: dict[int, int] = {}
+            for gram in self._tokens(doc):
+                j = vocab.get(gram)
+                if j is not None:
+                    counts[j] = counts.get(j, 0) + 1
+            row = sorted(counts.items())
+            values = [1.0 if self.binary else float(c) for _, c in row]
+            if self.sublinear_tf:
+                values = [math.log(v) + 1.0 for v in values]
+            if self.idf is not None:
+                values = [v * self.idf[j] for (j, _), v in zip(row, values)]
+            values = self._normalize(values)
+            indices.extend(j for j, _ in row)
+            data.extend(values)
+            indptr.append(len(indices))
+
+        return self.matrix_type(
+            (
+                np.asarray(data, dtype=np.float64),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(indptr, dtype=np.int32),
+            ),
+            shape=(len(raw_documents), self.n_features),
+        )
+
+    def _normalize(self, values: list[float]) -> list[float]:
+        # Sequential sum like sklearn's inplace_csr_row_normalize_{l1,l2} (not numpy pairwise sum).
+        if self.norm is None or not values:
+            return values
+        total = 0.0
+        if self.norm == "l2":
+            for v in values:
+                total += v * v
+            if total == 0.0:
+                return values
+            total = math.sqrt(total)
+        else:
+            for v in values:
+                total += abs(v)
+            if total == 0.0:
+                return values
+        return [v / total for v in values]
+
+
+def _accent_function(strip_accents: Any) -> Any:
+    if strip_accents is None:
+        return None
+    from sklearn.feature_extraction.text import strip_accents_ascii, strip_accents_unicode
+
+    return {"ascii": strip_accents_ascii, "unicode": strip_accents_unicode}[strip_accents]
+
+
+def _unsupported_reason(vectorizer: Any) -> str | None:
+    if not hasattr(vectorizer, "vocabulary_") or not hasattr(vectorizer, "ngram_range"):
+        return f"unsupported vectorizer type {type(vectorizer).__name__}"
+    if getattr(vectorizer, "analyzer", None) != "word":
+        return f"analyzer={vectorizer.analyzer!r}"
+    for attr in ("tokenizer", "preprocessor"):
+        if getattr(vectorizer, attr, None) is not None:
+            return f"custom {attr}"
+    if getattr(vectorizer, "input", "content") != "content":
+        return f"input={vectorizer.input!r}"
+    if getattr(vectorizer, "token_pattern", None) is None or re.compile(vectorizer.token_pattern).groups > 1:
+        return "token_pattern"
+    if vectorizer.strip_accents not in (None, "ascii", "unicode"):
+        return "custom strip_accents"
+    if np.dtype(getattr(vectorizer, "dtype", np.float64)) != np.float64:
+        return f"dtype={np.dtype(vectorizer.dtype).name}"
+    if getattr(vectorizer, "norm", None) not in (None, "l1", "l2"):
+        return f"norm={vectorizer.norm!r}"
+    if getattr(vectorizer, "use_idf", False) and getattr(vectorizer, "idf_", None) is None:
+        return "idf_ not fitted"
+    return None
+
+
+def _same_csr(a: Any, b: Any) -> bool:
+    return (
+        a.shape == b.shape
+        and a.data.dtype == b.data.dtype
+        and a.data.tobytes() == b.data.tobytes()
+        and np.array_equal(a.indices, b.indices)
+        and np.array_equal(a.indptr, b.indptr)
+    )
+
+
+def compile_vectorizer(vectorizer: Any) -> tuple[CompiledTfidf | None, str]:
+    """Return (compiled transformer or None, note) after a bit-for-bit parity check."""
+    if os.environ.get("CAREER_FAST_TFIDF", "1").lower() in ("0", "false", "no"):
+        return None, "disabled"
+    reason = _unsupported_reason(vectorizer)
+    if reason is not None:
+        return None, f"unsupported: {reason}"
+
+    corpus = check_corpus(vectorizer) + [
+        "",
+        "Python, SQL & Machine-Learning!! python python",
+        "Café résumé naïve — DATA   science\tand\nanalytics",
+    ]
+    expected = vectorizer.transform(corpus)
+    expected.sort_indices()
+    try:
+        compiled = CompiledTfidf(vectorizer, type(expected))
+        got = compiled.transform(corpus)
+    except Exception as e:  # noqa: BLE001 — odd pickled settings: keep sklearn
+        return None, f"build failed: {e}"
+    if not _same_csr(got, expected):
+        return None, "parity check failed"
+    return compiled, "compiled"
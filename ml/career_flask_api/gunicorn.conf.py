@@ -0,0 +1,60 @@
+"""
+Pre-fork production serving (Linux/macOS):  gunicorn -c gunicorn.conf.py app:app
+
+The app and model artifacts are loaded once in the master before forking, so every worker
+shares the model memory copy-on-write instead of unpickling its own copy. Settings come from
+the environment, like PORT/HOST for `python app.py`:
+
+  HOST / PORT              bind address (default 127.0.0.1:5052)
+  CAREER_WORKERS           worker processes (default: CPU count)
+  CAREER_THREADS           threads per worker (default 2)
+  CAREER_TIMEOUT           seconds before a silent worker is restarted (default 30)
+  CAREER_GRACEFUL_TIMEOUT  seconds to finish in-flight requests on shutdown/restart (default 30)
+  CAREER_MAX_REQUESTS      recycle a worker after N requests, 0 = never (default 0)
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+
+# One native thread per worker for BLAS / OpenMP (XGBoost): parallelism comes from the workers.
+# Must be set before numpy / sklearn are imported by the preloaded app.
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+bind = f"{os.environ.get('HOST', '127.0.0.1')}:{os.environ.get('PORT', '5052')}"
+workers = int(os.environ.get("CAREER_WORKERS", "0") or 0) or (os.cpu_count() or 1)
+threads = int(os.environ.get("CAREER_THREADS", "2"))
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.environ.get("CAREER_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("CAREER_GRACEFUL_TIMEOUT", "30"))
+max_requests = int(os.environ.get("CAREER_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+keepalive = 5
+preload_app = True
+accesslog = "-"
+
+
+def on_starting(server):
+    """Runs in the master after the app is imported: load + warm up the model once, before any fork."""
+    import readiness
+    from model_loader import is_ready, last_load_error, model_version
+
+    # In the calling thread: no loader thread may be running when the workers are forked.
+    readiness.start(background=False)
+    if is_ready():
+        server.log.info("Model artifacts loaded in master (version %s)", model_version())
+    else:
+        server.log.warning("Model not loaded in master: %s", last_load_error())
+    # Move everything loaded so far out of the GC's generations: collections in the workers then
+    # do not touch (and un-share) the pages holding the model objects.
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Threads do not survive fork: start the optional artifact watcher in each worker."""
+    from model_loader import start_reload_watcher
+
+    start_reload_watcher()
@@ -0,0 +1,386 @@
+"""
+Shared inference engine behind both HTTP front ends (app.py via predictor.py, and ../predict_api.py).
+
+An InferenceEngine wraps one immutable ArtifactBundle and scores lists of texts:
+preprocess -> prediction cache -> one transform -> one model call -> label / top-k decode.
+Batching, caching and the compiled backends (fast_tfidf.py, compiled_scorer.py) plug in here,
+so both servers get every speed-up and return the same labels for the same text.
+
+Label rule: when the model has predict_proba, the label is the argmax column of that one call,
+so it always matches the first top-k entry; models without predict_proba use model.predict. Their
+top-k lists come from the bundle's fallback ranker (decision_function or class centroids,
+fallback_ranking.py), with the predicted class first.
+
+With several models (CAREER_MODELS / CAREER_SHADOW_MODELS, model_loader.py) there is one engine
+per model. route_engine() picks the one a request asked for in the X-Career-Model header, else
+one of the served models by weight. Served engines hand every scored matrix to the shadow
+models' background thread (shadow_scoring.py); that never delays the response.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+import fast_json
+from metrics import METRICS
+from model_loader import DEFAULT_MODEL, ArtifactBundle, ModelSet, get_models, label_key, peek_models
+from prediction_cache import MISSING, PredictionCache, cache_from_env
+from ranking import above_threshold, top_k_indices
+from shadow_scoring import SHADOW
+
+# Request header naming the model to answer (any loaded one, shadows included); echoed on responses.
+MODEL_HEADER = "X-Career-Model"
+
+# Keyed on (k, min_probability, model version, preprocessed text); one cache for every adapter.
+_cache = cache_from_env()
+
+
+def prediction_cache() -> PredictionCache:
+    return _cache
+
+
+def preprocess_text(text: str) -> str:
+    """Normalize input: strip and lowercase."""
+    return (text or "").strip().lower()
+
+
+@dataclass(frozen=True)
+class Prediction:
+    """One scored text. Immutable, so cached instances are shared between requests."""
+
+    label: str
+    # Raw model class value behind `label` (int for label-encoded targets).
+    label_value: Any
+    # (label, probability) pairs, highest first; None when top-k was not requested / not available.
+    top: tuple[tuple[str, float], ...] | None = None
+
+
+class UnknownModel(LookupError):
+    """A request asked for a model name that is not loaded."""
+
+    def __init__(self, name: str, loaded: Sequence[str]) -> None:
+        super().__init__(f"Unknown model {name!r}; loaded models: {', '.join(loaded)}.")
+
+
+class InferenceEngine:
+    """Scores texts against one ArtifactBundle. Holds no per-request state, so it is thread-safe."""
+
+    def __init__(
+        self,
+        bundle: ArtifactBundle,
+        cache: PredictionCache | None = None,
+        name: str = DEFAULT_MODEL,
+        on_scored: Callable[[InferenceEngine, list[str], Any, list[Prediction]], None] | None = None,
+    ) -> None:
+        self.bundle = bundle
+        self.cache = cache if cache is not None else PredictionCache(0)
+        self.name = name
+        # Called with (engine, preprocessed texts, matrix, predictions) after each scored matrix.
+        self.on_scored = on_scored
+        self.has_proba = hasattr(bundle.model, "predict_proba")
+        # Top-k without predict_proba (fallback_ranking.py); None -> such a model returns labels only.
+        self.ranker = None if self.has_proba else bundle.ranker
+        self.can_rank = self.has_proba or self.ranker is not None
+        # model.predict value -> column, to put the predicted class first in a fallback ranking.
+        self._column_of = {label_key(v): j for j, v in enumerate(bundle.class_values)}
+        self.n_classes = len(bundle.class_labels)
+        self.cache.bind_version(bundle.version)
+        self._classes_document: tuple[bytes, str] | None = None
+
+    @property
+    def version(self) -> str:
+        return self.bundle.version
+
+    def classes_document(self) -> tuple[bytes, str]:
+        """(JSON body, ETag) for GET /classes; built once, since the bundle never changes."""
+        if self._classes_document is None:
+            body = fast_json.dumps({"model": self.name, "classes": self.bundle.display_classes})
+            self._classes_document = (body, fast_json.etag(body))
+        return self._classes_document
+
+    def predict(self, texts: list[str]) -> list[Prediction | None]:
+        """Best label per text; None for texts that are empty after preprocessing."""
+        return self._score(texts, [None] * len(texts), [None] * len(texts))
+
+    def predict_topk(
+        self, texts: list[str], k: int, min_probability: float | None = None
+    ) -> list[Prediction | None]:
+        """
+        Label plus up to k (label, probability) pairs per text, highest first; pairs below
+        min_probability are left out. Raises RuntimeError("MODEL_NO_PROBA") for a model with
+        neither predict_proba nor a fallback ranker.
+        """
+        if not self.can_rank:
+            raise RuntimeError("MODEL_NO_PROBA")
+        return self.predict_batch(texts, k, min_probability)
+
+    def predict_batch(
+        self,
+        texts: list[str],
+        k: int | None | Sequence[int | None] = None,
+        min_probability: float | None | Sequence[float | None] = None,
+    ) -> list[Prediction | None]:
+        """
+        Like predict_topk, but a model that cannot rank returns labels only instead of failing.
+        k and min_probability are one value for every text or a sequence with one per text; the
+        whole list is still scored as one matrix.
+        """
+        return self._score(texts, _per_text(k, len(texts)), _per_text(min_probability, len(texts)))
+
+    def predict_uncached(
+        self,
+        texts: list[str],
+        k: int | None | Sequence[int | None] = None,
+        min_probability: float | None | Sequence[float | None] = None,
+    ) -> list[Prediction | None]:
+        """predict_batch for texts that already missed cached(): scores all of them, still caches the results."""
+        return self._score(texts, _per_text(k, len(texts)), _per_text(min_probability, len(texts)), lookup=False)
+
+    def cached(self, text: str, k: int | None = None, min_probability: float | None = None) -> Any:
+        """The cached predict_batch result for one text, or MISSING (a cheap check before queueing work)."""
+        processed = preprocess_text(text)
+        if not processed:
+            return MISSING
+        return self.cache.get(self._key(processed, self._clip(k), min_probability))
+
+    def best_labels(self, X: Any) -> list[str]:
+        """Best label per row of an already transformed matrix (no cache, no stage metrics)."""
+        bundle = self.bundle
+        if self.has_proba:
+            return list(bundle.class_labels[bundle.predict_proba(X).argmax(axis=1)])
+        return [bundle.label_for_value(v) for v in np.asarray(bundle.model.predict(X)).ravel()]
+
+    def _clip(self, k: int | None) -> int | None:
+        """None for a model that cannot rank; larger k means "every class", so it shares one cache entry."""
+        if k is None or not self.can_rank:
+            return None
+        return max(1, min(k, self.n_classes))
+
+    def _key(self, processed: str, k: int | None, min_probability: float | None) -> tuple:
+        # The cache is shared by every model of the set, and two model directories can have the same
+        # fingerprint (copied files keep name, size and mtime): the model name keeps them apart.
+        return (k, min_probability if k is not None else None, self.name, self.bundle.version, processed)
+
+    def _score(
+        self,
+        texts: list[str],
+        ks: list[int | None],
+        min_probs: list[float | None],
+        lookup: bool = True,
+    ) -> list[Prediction | None]:
+        results: list[Prediction | None] = [None] * len(texts)
+        rows: list[int] = []
+        processed: list[str] = []
+        keys: list[tuple] = []
+        preprocess_started = time.perf_counter()
+        for i, text in enumerate(texts):
+            p = preprocess_text(text)
+            if not p:
+                continue
+            key = self._key(p, self._clip(ks[i]), min_probs[i])
+            cached = self.cache.get(key) if lookup else MISSING
+            if cached is not MISSING:
+                results[i] = cached
+                continue
+            rows.append(i)
+            processed.append(p)
+            keys.append(key)
+        # Includes the cache lookups: they are part of getting rows ready to score.
+        METRICS.observe("preprocess", time.perf_counter() - preprocess_started)
+
+        if processed:
+            scored = self._score_matrix(processed, [key[0] for key in keys], [key[1] for key in keys])
+            for i, key, pred in zip(rows, keys, scored):
+                results[i] = pred
+                self.cache.put(key, pred)
+        return results
+
+    def _score_matrix(
+        self, texts: list[str], ks: list[int | None], min_probs: list[float | None]
+    ) -> list[Prediction]:
+        """Score non-empty preprocessed texts as one matrix: one transform and one model call."""
+        with METRICS.stage("transform"):
+            X = self.bundle.transform(texts)
+        out = self._decode(X, ks, min_probs)
+        if self.on_scored is not None:
+            self.on_scored(self, texts, X, out)
+        return out
+
+    def _decode(self, X: Any, ks: list[int | None], min_probs: list[float | None]) -> list[Prediction]:
+        bundle = self.bundle
+        labels, values = bundle.class_labels, bundle.class_values
+        if not self.has_proba:
+            # With exact_label the ranker's argmax is the prediction: one dot product for a
+            # linear model instead of model.predict's validation overhead, even without top-k.
+            if self.ranker is not None and (self.ranker.exact_label or any(k is not None for k in ks)):
+                return self._decode_ranked(X, ks, min_probs)
+            with METRICS.stage("predict"):
+                preds = np.asarray(bundle.model.predict(X)).ravel()
+            with METRICS.stage("decode"):
+                return [Prediction(bundle.label_for_value(v), label_key(v)) for v in preds]
+
+        with METRICS.stage("predict"):
+            probs = bundle.predict_proba(X)
+        with METRICS.stage("decode"):
+            max_k = max((k or 0) for k in ks)
+            if max_k == 0:
+                return [Prediction(labels[j], label_key(values[j])) for j in probs.argmax(axis=1)]
+            # One selection at the largest requested k, highest first; each row's top-k is a
+            # prefix of it and column 0 is the argmax / best label.
+            order = top_k_indices(probs, max_k)
+            out = []
+            for r, (k, min_p) in enumerate(zip(ks, min_probs)):
+                cols = order[r]
+                top = None
+                if k is not None:
+                    top = tuple((labels[j], float(probs[r, j])) for j in above_threshold(probs[r], cols[:k], min_p))
+                out.append(Prediction(labels[cols[0]], label_key(values[cols[0]]), top))
+            return out
+
+    def _decode_ranked(self, X: Any, ks: list[int | None], min_probs: list[float | None]) -> list[Prediction]:
+        """Top-k from the fallback ranker's scores; the label is still the model's prediction."""
+        bundle, ranker = self.bundle, self.ranker
+        labels, values = bundle.class_labels, bundle.class_values
+        with METRICS.stage("predict"):
+            scores = ranker.scores(X)
+            if ranker.exact_label:
+                best = scores.argmax(axis=1)
+            else:
+                preds = np.asarray(bundle.model.predict(X)).ravel()
+                best = np.array([self._column_of.get(label_key(v), -1) for v in preds])
+                best = np.where(best < 0, scores.argmax(axis=1), best)
+        with METRICS.stage("decode"):
+            max_k = max((k or 0) for k in ks)
+            order = top_k_indices(scores, max(max_k, 1))
+            out = []
+            for r, (k, min_p) in enumerate(zip(ks, min_probs)):
+                b, cols = best[r], order[r]
+                if cols[0] != b:  # the ranking disagrees with predict: the predicted class leads
+                    cols = np.concatenate(([b], cols[cols != b]))[: len(order[r])]
+                top = None
+                if k is not None:
+                    top = tuple((labels[j], float(scores[r, j])) for j in above_threshold(scores[r], cols[:k], min_p))
+                out.append(Prediction(labels[b], label_key(values[b]), top))
+            return out
+
+
+def _per_text(value: Any, n: int) -> list:
+    if isinstance(value, (list, tuple)):
+        if len(value) != n:
+            raise ValueError(f"Expected {n} values, got {len(value)}")
+        return list(value)
+    return [value] * n
+
+
+def _mirror_to_shadows(shadows: list[InferenceEngine]) -> Callable[..., None]:
+    def on_scored(engine: InferenceEngine, texts: list[str], X: Any, preds: list[Prediction]) -> None:
+        SHADOW.submit(engine, texts, X, [p.label for p in preds], shadows)
+
+    return on_scored
+
+
+class _EngineSet:
+    """The engines of one ModelSet: weighted routing, per-model request counts, shadow wiring."""
+
+    def __init__(self, models: ModelSet, cache: PredictionCache) -> None:
+        self.models = models
+        shadows = {name: InferenceEngine(models.bundles[name], cache, name) for name in models.shadows}
+        on_scored = _mirror_to_shadows(list(shadows.values())) if shadows else None
+        self.engines = {
+            name: shadows.get(name) or InferenceEngine(bundle, cache, name, on_scored)
+            for name, bundle in models.bundles.items()
+        }
+        cache.bind_version(models.version)  # entries are keyed per model name and version as well
+        weighted = [(name, w) for name, w in models.weights.items() if w > 0] or [(models.primary, 1.0)]
+        self._names = [name for name, _ in weighted]
+        self._cum_weights = list(accumulate(w for _, w in weighted))
+        self._lock = threading.Lock()
+        self._routed = dict.fromkeys(self.engines, 0)
+
+    def get(self, name: str) -> InferenceEngine:
+        engine = self.engines.get(name)
+        if engine is None:
+            raise UnknownModel(name, list(self.engines))
+        return engine
+
+    def route(self, requested: str | None) -> InferenceEngine:
+        if requested:
+            engine = self.get(requested)
+        elif len(self._names) == 1:
+            engine = self.engines[self._names[0]]
+        else:
+            engine = self.engines[random.choices(self._names, cum_weights=self._cum_weights)[0]]
+        with self._lock:
+            self._routed[engine.name] += 1
+        return engine
+
+    def routed(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._routed)
+
+
+_engines: _EngineSet | None = None
+_engine_lock = threading.Lock()
+
+
+def _engine_set(models: ModelSet) -> _EngineSet:
+    global _engines
+    engines = _engines
+    if engines is None or engines.models is not models:
+        with _engine_lock:
+            if _engines is None or _engines.models is not models:
+                _engines = _EngineSet(models, _cache)
+            engines = _engines
+    return engines
+
+
+def get_engine(name: str | None = None) -> InferenceEngine:
+    """
+    Engine for the primary (or the named) live model; raises RuntimeError when none is loaded and
+    UnknownModel for a name that is not. A reload swaps the models; the next call builds new
+    engines around them. Read it once per request.
+    """
+    models = get_models()
+    return _engine_set(models).get(name or models.primary)
+
+
+def route_engine(requested: str | None = None) -> InferenceEngine:
+    """
+    Engine to answer one request: the model named in the X-Career-Model header (`requested`),
+    else a served model picked by CAREER_MODELS weight. Same errors as get_engine().
+    """
+    return _engine_set(get_models()).route((requested or "").strip() or None)
+
+
+def models_status() -> dict[str, Any]:
+    """The "models" block of GET / and /health: loaded models, roles, routing and shadow agreement."""
+    models = peek_models()
+    if models is None:
+        return {"primary": None, "models": {}, "errors": {}, "shadow": SHADOW.stats()}
+    routed = _engine_set(models).routed()
+    out: dict[str, Any] = {}
+    for name, bundle in models.bundles.items():
+        if name == models.primary:
+            role = "primary"
+        elif name in models.shadows:
+            role = "shadow"
+        else:
+            role = "served"
+        out[name] = {
+            "role": role,
+            "weight": models.weights.get(name),
+            "version": bundle.version,
+            "source": bundle.source,
+            "routed": routed.get(name, 0),
+            "shares_vectorizer_with": [
+                other for other, b in models.bundles.items() if other != name and b.vectorizer is bundle.vectorizer
+            ],
+        }
+    return {"primary": models.primary, "models": out, "errors": dict(models.errors), "shadow": SHADOW.stats()}
@@ -0,0 +1,217 @@
+"""
+Bounded inference executor shared by app.py and ../predict_api.py.
+
+At most `max_concurrency` predictions run at once per process and at most `max_queue` more wait
+for a slot. Past that, requests are rejected at once with Overloaded (HTTP 429 + Retry-After)
+instead of queueing without bound until the caller times out. Queued work whose deadline has
+passed is dropped before it runs (DeadlineExceeded, HTTP 504).
+
+  CAREER_MAX_CONCURRENCY     predictions running at once (default: CPU count; 0 = no limit)
+  CAREER_MAX_QUEUE           predictions waiting for a slot (default 64)
+  CAREER_RETRY_AFTER         seconds sent in Retry-After with a 429 (default 1)
+  CAREER_REQUEST_TIMEOUT_MS  default deadline per request (default 0 = none); a request's
+                             X-Request-Timeout-Ms header overrides it
+
+Deadlines are time.perf_counter() values, like the request start times in both servers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Coroutine, Iterator, TypeVar
+
+R = TypeVar("R")
+
+TIMEOUT_HEADER = "X-Request-Timeout-Ms"
+
+
+class Overloaded(Exception):
+    """Every slot is busy and the queue is full."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Server is busy; retry later.")
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """The request's deadline passed while its prediction was queued."""
+
+    def __init__(self) -> None:
+        super().__init__("Request deadline passed; the prediction was dropped.")
+
+
+class InferenceExecutor:
+    """Admission control (running + queued <= max_concurrency + max_queue) plus a concurrency limit."""
+
+    def __init__(self, max_concurrency: int, max_queue: int = 64, retry_after: int = 1) -> None:
+        self.max_concurrency = max(0, int(max_concurrency))
+        self.max_queue = max(0, int(max_queue))
+        self.retry_after = max(1, int(retry_after))
+        self._slots = threading.BoundedSemaphore(self.max_concurrency) if self.max_concurrency else None
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+        self._admitted = 0  # queued + running
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.expired = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._slots is not None
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """Hold a place (queued or running) for one request, or raise Overloaded."""
+        self._enter()
+        try:
+            yield
+        finally:
+            self._leave()
+
+    def _enter(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._admitted >= self.max_concurrency + self.max_queue:
+                self.rejected += 1
+                raise Overloaded(self.retry_after)
+            self._admitted += 1
+
+    def _leave(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._admitted -= 1
+
+    def run(self, fn: Callable[..., R], *args: Any, deadline: float | None = None) -> R:
+        """Run fn(*args) in the calling thread once a slot is free (sync handlers: Flask, def routes)."""
+        with self.admit():
+            return self.run_admitted(fn, *args, deadline=deadline)
+
+    async def run_async(self, fn: Callable[..., R], *args: Any, deadline: float | None = None) -> R:
+        """
+        Like run() for async handlers. Queued work waits on this executor's own threads, not the
+        event loop's threadpool; if the awaiting request is cancelled, queued work is dropped.
+        """
+        with self.admit():
+            return await self.run_admitted_async(fn, *args, deadline=deadline)
+
+    async def await_admitted(self, aw: Coroutine[Any, Any, R], deadline: float | None = None) -> R:
+        """
+        Await `aw` (e.g. a MicroBatcher submit) as one admitted request; at the deadline it is
+        cancelled, so a micro-batch that has not been scored yet leaves it out.
+        """
+        try:
+            self._enter()
+        except Overloaded:
+            aw.close()  # never started
+            raise
+        try:
+            if deadline is None:
+                return await aw
+            try:
+                return await asyncio.wait_for(aw, max(0.0, deadline - time.perf_counter()))
+            except asyncio.TimeoutError:
+                self._expire()
+        finally:
+            self._leave()
+
+    def run_admitted(self, fn: Callable[..., R], *args: Any, deadline: float | None = None) -> R:
+        """
+        run() for a caller already inside admit(), e.g. a streamed response that holds one
+        admission for its whole lifetime and takes a slot per chunk.
+        """
+        if self._slots is None:
+            if deadline is not None and time.perf_counter() >= deadline:
+                self._expire()
+            return fn(*args)
+        if deadline is None:
+            self._slots.acquire()
+        else:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not self._slots.acquire(timeout=remaining):
+                self._expire()
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+            self._slots.release()
+
+    async def run_admitted_async(self, fn: Callable[..., R], *args: Any, deadline: float | None = None) -> R:
+        """run_admitted() for async callers, on this executor's own threads."""
+        if not self.enabled:
+            return await asyncio.to_thread(fn, *args)
+        ctx = contextvars.copy_context()  # keep the metrics route label
+        fut = self._get_pool().submit(ctx.run, self.run_admitted, fn, *args, deadline=deadline)
+        try:
+            return await asyncio.wrap_future(fut)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+
+    def _expire(self) -> None:
+        with self._lock:
+            self.expired += 1
+        raise DeadlineExceeded()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="inference")
+        return self._pool
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            admitted, running = self._admitted, self._running
+        return {
+            "enabled": self.enabled,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queue_depth": admitted - running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "expired": self.expired,
+        }
+
+
+def executor_from_env() -> InferenceExecutor:
+    """Build an executor from CAREER_MAX_CONCURRENCY / CAREER_MAX_QUEUE / CAREER_RETRY_AFTER."""
+    raw = os.environ.get("CAREER_MAX_CONCURRENCY", "").strip()
+    concurrency = int(raw) if raw else (os.cpu_count() or 1)
+    return InferenceExecutor(
+        concurrency,
+        max_queue=int(os.environ.get("CAREER_MAX_QUEUE", "64")),
+        retry_after=int(os.environ.get("CAREER_RETRY_AFTER", "1")),
+    )
+
+
+def request_deadline(header_value: str | None, started: float | None) -> float | None:
+    """
+    perf_counter() deadline for a request that arrived at `started`, from the X-Request-Timeout-Ms
+    header or CAREER_REQUEST_TIMEOUT_MS; None means no deadline. Unparseable or non-positive
+    header values are ignored.
+    """
+    timeout_ms = 0.0
+    for raw in (header_value, os.environ.get("CAREER_REQUEST_TIMEOUT_MS")):
+        try:
+            timeout_ms = float(raw) if raw else 0.0
+        except ValueError:
+            timeout_ms = 0.0
+        if timeout_ms > 0:
+            break
+    if timeout_ms <= 0:
+        return None
+    return (started if started is not None else time.perf_counter()) + timeout_ms / 1000
@@ -0,0 +1,239 @@
+"""
+In-process request / stage metrics rendered in the Prometheus text format (also used by
+../predict_api.py). No client library: fixed-bucket histograms and counters behind one lock,
+~1 µs per observation, so it stays on in production. CAREER_METRICS=0 turns recording off.
+
+Each process keeps its own numbers; under gunicorn every worker reports its own counters
+(the `pid` label on career_process_info tells them apart).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Iterable
+
+# Seconds. Single-profile stages are tens of µs to a few ms; batches and loads run longer.
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+
+# (name, "gauge" | "counter", help, value, labels) for values read at scrape time.
+Sample = tuple[str, str, str, float, dict[str, str]]
+
+# Route template of the request being handled; stage timings recorded deeper in the call stack
+# (predictor / scoring helpers) are labelled with it. Thread pools copy the context along.
+_route: contextvars.ContextVar[str] = contextvars.ContextVar("career_metrics_route", default="none")
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "started")
+
+    def __init__(self, metrics: Metrics, stage: str) -> None:
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self) -> _StageTimer:
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.metrics.observe(self.stage, time.perf_counter() - self.started)
+
+
+class Metrics:
+    """Per-(route, stage) latency histograms plus request / error counters."""
+
+    def __init__(self, prefix: str = "career", enabled: bool = True) -> None:
+        self.prefix = prefix
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages: dict[tuple[str, str], _Histogram] = {}
+        self._requests: dict[tuple[str, str], _Histogram] = {}
+        self._responses: dict[tuple[str, str, int], int] = {}
+        self._errors: dict[tuple[str, str], int] = {}
+
+    @staticmethod
+    def bind_route(route: str) -> None:
+        _route.set(route)
+
+    def stage(self, name: str) -> _StageTimer:
+        """`with metrics.stage("transform"): ...` records the block under the current route."""
+        return _StageTimer(self, name)
+
+    def observe(self, stage: str, seconds: float, route: str | None = None) -> None:
+        if not self.enabled:
+            return
+        key = (route or _route.get(), stage)
+        with self._lock:
+            h = self._stages.get(key)
+            if h is None:
+                h = self._stages[key] = _Histogram()
+            _add(h, seconds)
+
+    def record_request(
+        self, route: str, method: str, status: int, seconds: float, code: str | None = None
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            h = self._requests.get((route, method))
+            if h is None:
+                h = self._requests[(route, method)] = _Histogram()
+            _add(h, seconds)
+            rkey = (route, method, status)
+            self._responses[rkey] = self._responses.get(rkey, 0) + 1
+            if code:
+                ekey = (route, code)
+                self._errors[ekey] = self._errors.get(ekey, 0) + 1
+
+    def render(self, samples: Iterable[Sample] = ()) -> str:
+        """
+        Prometheus text exposition. `samples` are (name, type, help, value, labels) read at scrape
+        time (model version, load duration, cache counters, ...); names get the metrics prefix.
+        """
+        p = self.prefix
+        with self._lock:
+            stages = {k: _copy(h) for k, h in self._stages.items()}
+            requests = {k: _copy(h) for k, h in self._requests.items()}
+            responses = dict(self._responses)
+            errors = dict(self._errors)
+
+        lines: list[str] = []
+        _histogram_lines(
+            lines, f"{p}_request_duration_seconds", "Request latency by route.",
+            {(("route", r), ("method", m)): h for (r, m), h in requests.items()},
+        )
+        _histogram_lines(
+            lines, f"{p}_stage_duration_seconds",
+            "Latency of each request stage (parse, preprocess, transform, predict, decode) by route.",
+            {(("route", r), ("stage", s)): h for (r, s), h in stages.items()},
+        )
+        lines.append(f"# HELP {p}_requests_total Responses by route, method and HTTP status.")
+        lines.append(f"# TYPE {p}_requests_total counter")
+        for (r, m, s), n in sorted(responses.items()):
+            lines.append(f"{p}_requests_total{_labels((('route', r), ('method', m), ('status', str(s))))} {n}")
+        lines.append(f"# HELP {p}_errors_total Error responses by route and error code.")
+        lines.append(f"# TYPE {p}_errors_total counter")
+        for (r, c), n in sorted(errors.items()):
+            lines.append(f"{p}_errors_total{_labels((('route', r), ('code', c)))} {n}")
+
+        seen: set[str] = set()
+        for name, kind, help_text, value, labels in samples:
+            full = f"{p}_{name}"
+            if full not in seen:
+                seen.add(full)
+                lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+            lines.append(f"{full}{_labels(tuple(labels.items()))} {_num(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _add(h: _Histogram, seconds: float) -> None:
+    h.counts[bisect_left(BUCKETS, seconds)] += 1
+    h.total += seconds
+    h.count += 1
+
+
+def _copy(h: _Histogram) -> _Histogram:
+    c = _Histogram()
+    c.counts, c.total, c.count = list(h.counts), h.total, h.count
+    return c
+
+
+def _histogram_lines(lines: list[str], name: str, help_text: str, series: dict[tuple, _Histogram]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, h in sorted(series.items()):
+        running = 0
+        for bound, n in zip(BUCKETS, h.counts):
+            running += n
+            lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {running}")
+        lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {h.count}")
+        lines.append(f"{name}_sum{_labels(labels)} {_num(h.total)}")
+        lines.append(f"{name}_count{_labels(labels)} {h.count}")
+
+
+def _labels(pairs: tuple[tuple[str, str], ...]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value: float) -> str:
+    return repr(float(value))
+
+
+def process_samples() -> list[Sample]:
+    return [("process_info", "gauge", "Serving process (one series per worker).", 1, {"pid": str(os.getpid())})]
+
+
+def cache_samples(stats: dict[str, Any]) -> list[Sample]:
+    """Samples for a PredictionCache.stats() dict."""
+    return [
+        ("cache_entries", "gauge", "Entries in the prediction cache.", stats.get("size", 0), {}),
+        ("cache_hits_total", "counter", "Prediction cache hits.", stats.get("hits", 0), {}),
+        ("cache_misses_total", "counter", "Prediction cache misses.", stats.get("misses", 0), {}),
+        ("cache_evictions_total", "counter", "Prediction cache evictions (LRU or TTL).", stats.get("evictions", 0), {}),
+    ]
+
+
+def executor_samples(stats: dict[str, Any]) -> list[Sample]:
+    """Samples for an InferenceExecutor.stats() dict."""
+    return [
+        ("executor_running", "gauge", "Predictions running in the bounded executor.", stats.get("running", 0), {}),
+        ("executor_queue_depth", "gauge", "Predictions waiting for an executor slot.", stats.get("queue_depth", 0), {}),
+        ("executor_max_concurrency", "gauge", "Executor slot limit (0 = unbounded).", stats.get("max_concurrency", 0), {}),
+        ("executor_max_queue", "gauge", "Executor queue limit.", stats.get("max_queue", 0), {}),
+        ("executor_rejected_total", "counter", "Requests shed with 429 because the queue was full.", stats.get("rejected", 0), {}),
+        ("executor_expired_total", "counter", "Queued predictions dropped after their deadline.", stats.get("expired", 0), {}),
+    ]
+
+
+def model_samples(status: dict[str, Any]) -> list[Sample]:
+    """Samples for an inference_engine.models_status() dict: routing counts and shadow agreement."""
+    samples: list[Sample] = [
+        ("model_routed_total", "counter", "Requests answered by each loaded model.", m["routed"], {"model": name})
+        for name, m in status.get("models", {}).items()
+    ]
+    shadow = status.get("shadow", {})
+    pairs = [
+        ({"model": name, "served": served}, pair)
+        for name, by_served in shadow.get("agreement", {}).items()
+        for served, pair in by_served.items()
+    ]
+    # One loop per metric: a family's series must be adjacent in the text format.
+    samples += [("shadow_compared_total", "counter", "Rows scored by a shadow model.", p["compared"], labels) for labels, p in pairs]
+    samples += [
+        ("shadow_agreed_total", "counter", "Shadow rows whose best label matched the served model's.", p["agreed"], labels)
+        for labels, p in pairs
+    ]
+    if shadow:
+        samples += [
+            ("shadow_queue_depth", "gauge", "Scored batches waiting for the shadow thread.", shadow["queue_depth"], {}),
+            ("shadow_dropped_total", "counter", "Batches not mirrored because the shadow queue was full.", shadow["dropped"], {}),
+            ("shadow_errors_total", "counter", "Shadow scoring failures.", shadow["errors"], {}),
+        ]
+    return samples
+
+
+def metrics_from_env(prefix: str = "career") -> Metrics:
+    return Metrics(prefix, enabled=os.environ.get("CAREER_METRICS", "1").lower() not in ("0", "false", "no"))
+
+
+# Process-wide registry shared by the route handlers and the scoring code they call.
+METRICS = metrics_from_env()
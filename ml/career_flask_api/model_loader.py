@@ -1,37 +1,178 @@
 """
 Load TF-IDF vectorizer, classifier, and label encoder from disk (Colab export).
-Path is set via CAREER_MODEL_DIR (default: ./models next to this package).
+Path is set via CAREER_MODEL_DIR (default: ./models next to this package); predict_api.py
+points it at ml/artifacts/ with set_artifacts_directory().
+
+The three objects are published together as one immutable ArtifactBundle. Reloads build a new
+bundle off the request path and swap the module reference in one assignment, so a request that
+grabbed a bundle always sees a matching vectorizer / model / encoder trio.
+
+The first load happens once per process (readiness.py runs it on a background thread); after it
+has begun, is_ready() / get_bundle() only read state and never block a request or health probe.
+
+Several named models can be served side by side (a candidate next to the live one); they are
+loaded and swapped together as one ModelSet:
+
+  CAREER_MODELS         served models as name[:weight], comma-separated, primary first (default:
+                        "default", the trio in the model directory itself). Other names are
+                        subdirectories of it; requests are routed by weight (inference_engine.py).
+  CAREER_SHADOW_MODELS  models that only score a copy of the traffic (shadow_scoring.py). A shadow
+                        that fails to load is left out; a served model that fails fails the load.
+
+Models whose vectorizer files are byte-identical share one vectorizer object (and compiled
+transform), so a shadow can reuse the served model's matrix instead of transforming again.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 import os
 import pickle
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import joblib
+import numpy as np
+
+from compact_artifacts import compact, float32_idf_enabled
+from compiled_scorer import build_scorer
+from fallback_ranking import RANKING_FILES, build_ranker
+from fast_tfidf import compile_vectorizer
+
+logger = logging.getLogger(__name__)
 
 # Default: folder named "models" alongside this file (copy your .pkl files here)
 _DEFAULT_DIR = Path(__file__).resolve().parent / "models"
 
+ARTIFACT_FILES = ("vectorizer.pkl", "career_model.pkl", "label_encoder.pkl")
+# Older joblib export (ml/HOWTO-USE-MODEL.md); used when the pickle trio is absent or fails to load.
+JOBLIB_ARTIFACT_FILES = ("tfidf_vectorizer.joblib", "interest_xgb_model.joblib", "target_label_encoder.joblib")
+ARTIFACT_SETS = (("pickle", ARTIFACT_FILES), ("joblib", JOBLIB_ARTIFACT_FILES))
+# Optional list of class names for the UI; defaults to label_encoder.classes_.
+CLASSES_FILE = "classes.json"
+# Compact cache written by fast_artifacts.py: <model dir>/.fastload/<source sha>/ holds each object
+# pickled without its numpy arrays (*.pkl) and those arrays as flat .npy files (arrays/), which are
+# memory-mapped on load; current.json points at the directory.
+FASTLOAD_DIRNAME = ".fastload"
+FASTLOAD_FORMAT = 2
+FASTLOAD_FILES = ("vectorizer.pkl", "career_model.pkl", "label_encoder.pkl")
+FASTLOAD_ARRAYS = "arrays"
+# Name of the model in the model directory itself (the only one unless CAREER_MODELS is set).
+DEFAULT_MODEL = "default"
+
+
+_dir_override: Path | None = None
+
 
 def _artifacts_dir() -> Path:
+    if _dir_override is not None:
+        return _dir_override
     raw = os.environ.get("CAREER_MODEL_DIR", "").strip()
     return Path(raw) if raw else _DEFAULT_DIR
 
 
-_vectorizer: Any | None = None
-_model: Any | None = None
-_label_encoder: Any | None = None
+@dataclass(frozen=True)
+class ArtifactBundle:
+    """One consistent load of the artifact trio plus its decoded label table."""
+
+    vectorizer: Any
+    model: Any
+    label_encoder: Any
+    class_labels: np.ndarray
+    # Raw model.classes_ value per predict_proba column (label_index in predict_api responses).
+    class_values: np.ndarray = field(repr=False)
+    # classes.json, else the label encoder's classes (the "classes" list of predict_api).
+    display_classes: tuple[str, ...] = field(repr=False)
+    label_by_value: dict[Any, str] = field(repr=False)
+    version: str
+    loaded_at: float
+    source: str = "pickle"  # "pickle", "joblib" or "fastload"
+    # Wall time of _read_bundle (unpickling + label table + compiled backends).
+    load_seconds: float = 0.0
+    # Compiled NumPy / native backend (compiled_scorer.py); None -> use model.predict_proba.
+    scorer: Any = field(default=None, repr=False)
+    scorer_note: str | None = None
+    # Top-k source for a model without predict_proba (fallback_ranking.py); None -> labels only.
+    ranker: Any = field(default=None, repr=False)
+    ranker_note: str | None = None
+    # Compiled TF-IDF transform (fast_tfidf.py); None -> use vectorizer.transform.
+    transformer: Any = field(default=None, repr=False)
+    transformer_note: str | None = None
+    # What compact_artifacts.py removed / downcast at load (fast-load caches: at export).
+    compaction_note: str | None = None
+    # sha1 of the vectorizer file, multi-model loads only (equal digests share one vectorizer).
+    vectorizer_digest: str | None = None
+
+    def transform(self, texts: list[str]) -> Any:
+        return (self.transformer or self.vectorizer).transform(texts)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return (self.scorer or self.model).predict_proba(X)
+
+    def label_for_value(self, value: Any) -> str:
+        """Decode one model.predict output via the precomputed table (str fallback for unknown values)."""
+        key = label_key(value)
+        return self.label_by_value.get(key, str(key))
+
+
+@dataclass(frozen=True)
+class ModelSet:
+    """Every model of one load, published together; `primary` answers unless routing picks another."""
+
+    bundles: dict[str, ArtifactBundle]
+    primary: str
+    # Served model -> relative routing weight (0 = only when asked for by name).
+    weights: dict[str, float]
+    shadows: tuple[str, ...]
+    # The primary's version for a single model, else a fingerprint of every member.
+    version: str
+    # Shadow model -> why it did not load.
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def primary_bundle(self) -> ArtifactBundle:
+        return self.bundles[self.primary]
+
+
+_models: ModelSet | None = None
 _load_error: str | None = None
+# Serializes loads; request handlers never take it (they only read _models).
+_load_lock = threading.Lock()
+# The first load is attempted once; after a failure, reload_artifacts() (or the watcher) retries.
+_load_begun = False
+_load_done = threading.Event()
+# Runs on every new bundle before it is published (readiness.py: warm-up pass); raising rejects it.
+_prepare_hook: Callable[[ArtifactBundle], None] | None = None
+_reload_guard = threading.Lock()
+_reload_state: dict[str, Any] = {
+    "in_progress": False,
+    "last_error": None,
+    "last_reload_at": None,
+    "reloads": 0,
+    "watch_interval_seconds": 0.0,
+    # On-disk fingerprint of the last failed reload; the watcher does not retry it.
+    "failed_version": None,
+}
+_watcher: threading.Thread | None = None
 
 
 def artifacts_directory() -> Path:
     return _artifacts_dir()
 
 
-def _load_pickle_or_joblib(path: Path) -> Any:
+def set_artifacts_directory(path: Path | str) -> None:
+    """Load from `path` instead of CAREER_MODEL_DIR; call before the first load."""
+    global _dir_override
+    _dir_override = Path(path)
+
+
+def load_pickle_or_joblib(path: Path) -> Any:
     """Colab often uses joblib.dump(..., '.pkl') — pickle.load then fails; joblib.load works."""
     with open(path, "rb") as f:
         try:
@@ -41,57 +182,549 @@ def _load_pickle_or_joblib(path: Path) -> Any:
             return joblib.load(f)
 
 
-def load_artifacts() -> None:
-    """Load pickles from CAREER_MODEL_DIR (or default models/). Idempotent."""
-    global _vectorizer, _model, _label_encoder, _load_error
-    if _vectorizer is not None and _model is not None and _label_encoder is not None:
-        return
+def artifact_fingerprint(paths: list[Path]) -> str:
+    """Short version id from file names, sizes and mtimes (cheap: no file contents are read)."""
+    h = hashlib.sha1()
+    for p in paths:
+        st = p.stat()
+        h.update(f"{p.name}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return h.hexdigest()[:12]
+
+
+def label_key(value: Any) -> Any:
+    """Normalize a class value (np.int64, np.str_, float 3.0, ...) to a hashable dict key."""
+    v = np.asarray(value).ravel()[0]
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return str(v)
+
+
+def _build_label_table(model: Any, label_encoder: Any) -> tuple[np.ndarray, np.ndarray, dict[Any, str]]:
+    """
+    Decode model.classes_ to career strings once, so predictions index into a table
+    instead of calling label_encoder.inverse_transform per returned class.
+    Column j of predict_proba -> labels[j] (raw value classes[j]); a model.predict value v -> by_value[v].
+    """
+    classes = getattr(model, "classes_", None)
+    if classes is None:
+        classes = np.arange(len(getattr(label_encoder, "classes_", [])))
+    classes = np.asarray(classes).ravel()
+    try:
+        decoded = label_encoder.inverse_transform(classes)
+    except Exception:  # noqa: BLE001 — model trained on raw strings, or encoder mismatch
+        decoded = classes
+    labels = np.array([str(x) for x in decoded], dtype=object)
+    by_value = {label_key(c): labels[j] for j, c in enumerate(classes)}
+    return classes, labels, by_value
+
+
+def _display_classes(base: Path, label_encoder: Any) -> tuple[str, ...]:
+    path = base / CLASSES_FILE
+    if path.is_file():
+        return tuple(str(c) for c in json.loads(path.read_text(encoding="utf-8")))
+    return tuple(str(c) for c in getattr(label_encoder, "classes_", []))
 
-    _vectorizer = _model = _label_encoder = None
-    _load_error = None
 
+def _complete_sets(base: Path) -> list[tuple[str, list[Path]]]:
+    """(source, paths) for every artifact set fully present in `base`, preferred first."""
+    out = []
+    for source, names in ARTIFACT_SETS:
+        paths = [base / name for name in names]
+        if all(p.is_file() for p in paths):
+            out.append((source, paths))
+    return out
+
+
+def artifact_paths(base: Path) -> list[Path]:
+    """The artifact files a load of `base` uses: the pickle trio unless only the joblib trio is present."""
+    sets = _complete_sets(base)
+    return sets[0][1] if sets else [base / name for name in ARTIFACT_FILES]
+
+
+def _version_paths(base: Path) -> list[Path]:
+    """
+    Files behind the bundle version: every complete set, so a fallback load still matches the
+    watcher, plus the optional ranking files (editing a calibration reloads like a new model).
+    """
+    sets = _complete_sets(base)
+    paths = [p for _, paths in sets for p in paths] if sets else artifact_paths(base)
+    return paths + [base / name for name in RANKING_FILES if (base / name).is_file()]
+
+
+def model_specs() -> tuple[list[tuple[str, float]], list[str]]:
+    """
+    (served (name, weight) pairs, primary first; shadow names) from CAREER_MODELS and
+    CAREER_SHADOW_MODELS. Raises RuntimeError on a malformed list.
+    """
+    served: list[tuple[str, float]] = []
+    for entry in _split(os.environ.get("CAREER_MODELS", "")):
+        name, _, raw_weight = entry.partition(":")
+        try:
+            weight = float(raw_weight) if raw_weight.strip() else 1.0
+        except ValueError:
+            raise RuntimeError(f"CAREER_MODELS: weight of {name.strip()!r} is not a number") from None
+        if weight < 0:
+            raise RuntimeError(f"CAREER_MODELS: weight of {name.strip()!r} is negative")
+        served.append((name.strip(), weight))
+    served = served or [(DEFAULT_MODEL, 1.0)]
+    shadows = _split(os.environ.get("CAREER_SHADOW_MODELS", ""))
+    names = [name for name, _ in served] + shadows
+    for name in names:
+        if not name or name != Path(name).name or name in (".", ".."):
+            raise RuntimeError(f"Invalid model name {name!r}: use a subdirectory name of the model directory")
+    if len(set(names)) != len(names):
+        raise RuntimeError("CAREER_MODELS / CAREER_SHADOW_MODELS list a model twice")
+    return served, shadows
+
+
+def _split(raw: str) -> list[str]:
+    return [part.strip() for part in raw.split(",") if part.strip()]
+
+
+def model_directory(base: Path, name: str) -> Path:
+    """Where model `name` is read from: `base` itself for DEFAULT_MODEL, else a subdirectory."""
+    return base if name == DEFAULT_MODEL else base / name
+
+
+def _set_version(versions: dict[str, str]) -> str:
+    """ModelSet.version from each member's version (insertion order: served, then shadows)."""
+    if list(versions) == [DEFAULT_MODEL]:
+        return versions[DEFAULT_MODEL]
+    return hashlib.sha1("".join(f"{n}={v};" for n, v in versions.items()).encode()).hexdigest()[:12]
+
+
+def _current_fingerprint() -> str | None:
+    """Fingerprint of the files on disk now, or None if a served model's files are missing."""
     base = _artifacts_dir()
-    v_path = base / "vectorizer.pkl"
-    m_path = base / "career_model.pkl"
-    le_path = base / "label_encoder.pkl"
+    try:
+        served, shadows = model_specs()
+        versions = {
+            name: artifact_fingerprint(_version_paths(model_directory(base, name))) for name, _ in served
+        }
+    except (OSError, RuntimeError):
+        return None
+    for name in shadows:
+        try:
+            versions[name] = artifact_fingerprint(_version_paths(model_directory(base, name)))
+        except OSError:
+            versions[name] = "missing"
+    return _set_version(versions)
+
+
+def source_stats(paths: list[Path]) -> dict[str, list[int]]:
+    """{file name: [size, mtime_ns]} — what a fast-load cache must match to count as fresh."""
+    out = {}
+    for p in paths:
+        st = p.stat()
+        out[p.name] = [st.st_size, st.st_mtime_ns]
+    return out
+
+
+def fresh_fastload_dir(base: Path) -> Path | None:
+    """Return the fast-load cache directory for `base` if it was built from the files on disk now."""
+    pointer = base / FASTLOAD_DIRNAME / "current.json"
+    if os.environ.get("CAREER_FASTLOAD", "1").lower() in ("0", "false", "no") or not pointer.is_file():
+        return None
+    try:
+        manifest = json.loads(pointer.read_text(encoding="utf-8"))
+        if manifest.get("format") != FASTLOAD_FORMAT or manifest.get("source") != source_stats(artifact_paths(base)):
+            return None
+        d = base / FASTLOAD_DIRNAME / manifest["dir"]
+    except (OSError, ValueError, KeyError):
+        return None
+    return d if all((d / name).is_file() for name in FASTLOAD_FILES) else None
+
+
+class _FlatUnpickler(pickle.Unpickler):
+    """
+    Resolves the persistent ids fast_artifacts.py writes: ("array", file) -> the .npy memory-mapped
+    read-only (shared through the page cache), ("vocabulary", file) -> term -> column dict.
+    """
 
+    def __init__(self, f: Any, arrays: Path) -> None:
+        super().__init__(f)
+        self._arrays = arrays
+
+    def persistent_load(self, pid: Any) -> Any:
+        kind, name = pid
+        if kind == "array":
+            return np.asarray(np.load(self._arrays / name, mmap_mode="r"))
+        if kind == "vocabulary":
+            terms = np.load(self._arrays / name).tolist()
+            return dict(zip(terms, range(len(terms))))
+        raise pickle.UnpicklingError(f"unknown fast-load reference {pid!r}")
+
+
+def load_fastload_trio(d: Path) -> tuple[Any, Any, Any]:
+    """Load (vectorizer, model, label_encoder) from a fast-load cache; large arrays are memory-mapped."""
+    loaded = []
+    for name in FASTLOAD_FILES:
+        with open(d / name, "rb") as f:
+            loaded.append(_FlatUnpickler(f, d / FASTLOAD_ARRAYS).load())
+    return tuple(loaded)  # type: ignore[return-value]
+
+
+def _vectorizer_path(base: Path) -> Path:
+    """The vectorizer file a load of `base` reads first (fast-load cache when fresh)."""
+    fast_dir = fresh_fastload_dir(base)
+    return fast_dir / FASTLOAD_FILES[0] if fast_dir is not None else artifact_paths(base)[0]
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class _VectorizerPool:
+    """
+    Within one multi-model load: one vectorizer object and compiled transform per distinct
+    vectorizer file content. Shared vectorizers are not pruned or downcast by compaction, since
+    that would tailor them to one model.
+    """
+
+    def __init__(self, dirs: list[Path]) -> None:
+        self._digests = {p: _file_digest(p) for p in map(_vectorizer_path, dirs) if p.is_file()}
+        counts = Counter(self._digests.values())
+        self._shared = {digest for digest, n in counts.items() if n > 1}
+        self._loaded: dict[str, tuple[Any, Any, str | None]] = {}
+
+    def digest(self, path: Path) -> str | None:
+        return self._digests.get(path)
+
+    def is_shared(self, path: Path) -> bool:
+        return self._digests.get(path) in self._shared
+
+    def get(self, path: Path) -> tuple[Any, Any, str | None] | None:
+        return self._loaded.get(self._digests.get(path, ""))
+
+    def put(self, path: Path, entry: tuple[Any, Any, str | None]) -> None:
+        self._loaded[self._digests[path]] = entry
+
+
+def _read_bundle(base: Path, pool: _VectorizerPool | None = None) -> ArtifactBundle:
+    """Load a fresh bundle from `base`; raises RuntimeError with an API-friendly message."""
+    started = time.perf_counter()
     if not base.is_dir():
-        _load_error = f"Model directory does not exist: {base}"
-        return
-    missing = [p.name for p in (v_path, m_path, le_path) if not p.is_file()]
-    if missing:
-        _load_error = f"Missing files in {base}: {', '.join(missing)}"
+        raise RuntimeError(f"Model directory does not exist: {base}")
+    sets = _complete_sets(base)
+    if not sets:
+        missing = [name for name in ARTIFACT_FILES if not (base / name).is_file()]
+        raise RuntimeError(f"Missing files in {base}: {', '.join(missing)}")
+
+    for n, (source, paths) in enumerate(sets):
+        # The fast-load cache is built from artifact_paths(base), i.e. the first complete set.
+        fast_dir = fresh_fastload_dir(base) if n == 0 else None
+        try:
+            if fast_dir is not None:
+                vectorizer, model, label_encoder = load_fastload_trio(fast_dir)
+                source = "fastload"
+                vectorizer_path = fast_dir / FASTLOAD_FILES[0]
+            else:
+                vectorizer, model, label_encoder = (load_pickle_or_joblib(p) for p in paths)
+                vectorizer_path = paths[0]
+            class_values, class_labels, label_by_value = _build_label_table(model, label_encoder)
+            display_classes = _display_classes(base, label_encoder)
+            break
+        except Exception as e:  # noqa: BLE001 — try the next set, then surface the failure to the API
+            error = e
+    else:
+        raise RuntimeError(f"Failed to load model files: {error}") from error
+    version = artifact_fingerprint(_version_paths(base))
+    shared = pool is not None and pool.is_shared(vectorizer_path)
+    loaded = pool.get(vectorizer_path) if shared else None
+    if loaded is not None:
+        # Same file as an earlier model of this load: drop the fresh copy, reuse that one.
+        vectorizer, transformer, transformer_note = loaded
+        vectorizer, model, compaction_note = _compact(vectorizer, model, source, shared=True)
+    else:
+        vectorizer, model, compaction_note = _compact(vectorizer, model, source, shared=shared)
+        transformer, transformer_note = compile_vectorizer(vectorizer)
+        if shared:
+            pool.put(vectorizer_path, (vectorizer, transformer, transformer_note))
+    scorer, scorer_note = build_scorer(model, vectorizer)
+    ranker, ranker_note = build_ranker(model, vectorizer, base, class_values)
+    return ArtifactBundle(
+        vectorizer=vectorizer,
+        model=model,
+        label_encoder=label_encoder,
+        class_labels=class_labels,
+        class_values=class_values,
+        display_classes=display_classes,
+        label_by_value=label_by_value,
+        version=version,
+        loaded_at=time.time(),
+        source=source,
+        load_seconds=time.perf_counter() - started,
+        scorer=scorer,
+        scorer_note=scorer_note,
+        ranker=ranker,
+        ranker_note=ranker_note,
+        transformer=transformer,
+        transformer_note=transformer_note,
+        compaction_note=compaction_note,
+        vectorizer_digest=pool.digest(vectorizer_path) if pool is not None else None,
+    )
+
+
+def _read_models(base: Path) -> ModelSet:
+    """Load (and warm up) every configured model; raises RuntimeError if a served one fails."""
+    served, shadows = model_specs()
+    names = [name for name, _ in served] + shadows
+    if names == [DEFAULT_MODEL]:
+        bundle = _prepare(_read_bundle(base))
+        return ModelSet({DEFAULT_MODEL: bundle}, DEFAULT_MODEL, {DEFAULT_MODEL: 1.0}, (), bundle.version)
+
+    pool = _VectorizerPool([model_directory(base, name) for name in names])
+    bundles: dict[str, ArtifactBundle] = {}
+    errors: dict[str, str] = {}
+    versions: dict[str, str] = {}
+    for name in names:
+        directory = model_directory(base, name)
+        try:
+            bundles[name] = _prepare(_read_bundle(directory, pool))
+            versions[name] = bundles[name].version
+        except RuntimeError as e:
+            if name not in shadows:
+                raise RuntimeError(f"Model {name!r}: {e}") from e
+            logger.warning("Shadow model %r not loaded: %s", name, e)
+            errors[name] = str(e)
+            try:
+                versions[name] = artifact_fingerprint(_version_paths(directory))
+            except OSError:
+                versions[name] = "missing"
+    return ModelSet(
+        bundles=bundles,
+        primary=served[0][0],
+        weights=dict(served),
+        shadows=tuple(name for name in shadows if name in bundles),
+        version=_set_version(versions),
+        errors=errors,
+    )
+
+
+def _compact(vectorizer: Any, model: Any, source: str, shared: bool = False) -> tuple[Any, Any, str]:
+    if source == "fastload":
+        return vectorizer, model, "at export (fast_artifacts.py)"
+    if os.environ.get("CAREER_COMPACT", "1").lower() in ("0", "false", "no"):
+        return vectorizer, model, "disabled"
+    try:
+        vectorizer, model, report = compact(
+            vectorizer, model, shared_vectorizer=shared, float32_idf=float32_idf_enabled()
+        )
+    except Exception as e:  # noqa: BLE001 — odd pickled internals: serve the objects as loaded
+        return vectorizer, model, f"failed: {e}"
+    return vectorizer, model, report.note
+
+
+def set_prepare_hook(hook: Callable[[ArtifactBundle], None] | None) -> None:
+    """Run `hook` on each newly loaded bundle before it serves requests (initial load and reloads)."""
+    global _prepare_hook
+    _prepare_hook = hook
+
+
+def _prepare(bundle: ArtifactBundle) -> ArtifactBundle:
+    if _prepare_hook is not None:
+        try:
+            _prepare_hook(bundle)
+        except Exception as e:  # noqa: BLE001 — a bundle that cannot predict is not published
+            raise RuntimeError(f"Warm-up failed: {e}") from e
+    return bundle
+
+
+def load_artifacts() -> None:
+    """
+    Load artifacts from CAREER_MODEL_DIR (or default models/), once: later calls return at once,
+    also after a failure (reload_artifacts() retries). Blocks while another thread is loading.
+    """
+    global _models, _load_error, _load_begun
+    if _load_done.is_set():
         return
+    _load_begun = True
+    with _load_lock:
+        if _load_done.is_set():
+            return
+        try:
+            _models = _read_models(_artifacts_dir())
+            _load_error = None
+            for name, bundle in _models.bundles.items():
+                logger.info(
+                    "Model artifacts loaded (model %s, version %s, source %s, scorer %s, tfidf %s)",
+                    name,
+                    bundle.version,
+                    bundle.source,
+                    bundle.scorer_note,
+                    bundle.transformer_note,
+                )
+        except RuntimeError as e:
+            _load_error = str(e)
+            logger.warning("Model artifacts not loaded: %s", e)
+        finally:
+            _load_done.set()
+
+
+def _ensure_load_begun() -> None:
+    """Lazy first load for callers that never started one (scripts, `flask run`); never waits on a running load."""
+    if not _load_begun:
+        load_artifacts()
 
+
+def mark_load_pending() -> None:
+    """
+    A first load is about to start on another thread (readiness.start()): until it runs, loading()
+    is True and the lazy callers above report "still loading" instead of loading on their own.
+    """
+    global _load_begun
+    _load_begun = True
+
+
+def loading() -> bool:
+    """True while the first load (including its warm-up) is still running."""
+    return _load_begun and not _load_done.is_set()
+
+
+def reload_artifacts(wait: bool = False) -> bool:
+    """
+    Load the current files into a new bundle on a background thread and swap it in.
+    The old bundle keeps serving until the swap; on failure it stays live and the error is
+    recorded in reload_status(). Returns False if a reload is already running.
+    """
+    if not _reload_guard.acquire(blocking=False):
+        return False
+    _reload_state["in_progress"] = True
+    t = threading.Thread(target=_reload_worker, name="artifact-reload", daemon=True)
+    t.start()
+    if wait:
+        t.join()
+    return True
+
+
+def _reload_worker() -> None:
+    global _models, _load_error
+    attempted = _current_fingerprint()
     try:
-        _vectorizer = _load_pickle_or_joblib(v_path)
-        _model = _load_pickle_or_joblib(m_path)
-        _label_encoder = _load_pickle_or_joblib(le_path)
-    except Exception as e:  # noqa: BLE001 — surface load failures to API
-        _vectorizer = _model = _label_encoder = None
-        _load_error = f"Failed to load model files: {e}"
+        with _load_lock:
+            new = _read_models(_artifacts_dir())
+            _models = new  # single reference assignment: readers see old or new, never a mix
+            _load_error = None
+        _reload_state["last_error"] = None
+        _reload_state["failed_version"] = None
+        _reload_state["reloads"] += 1
+        logger.info("Model artifacts reloaded (version %s)", new.version)
+    except RuntimeError as e:
+        _reload_state["last_error"] = str(e)
+        _reload_state["failed_version"] = attempted
+        if _models is None:
+            _load_error = str(e)
+        logger.warning("Model reload failed; keeping previous artifacts: %s", e)
+    finally:
+        _reload_state["last_reload_at"] = time.time()
+        _reload_state["in_progress"] = False
+        _reload_guard.release()
+
+
+def start_reload_watcher(interval_seconds: float | None = None) -> bool:
+    """
+    Poll the artifact files' size/mtime every CAREER_RELOAD_INTERVAL seconds (0 = off) and reload
+    when they change. A change must be seen on two consecutive polls before reloading, so a
+    half-copied export is not picked up. Files whose reload failed are not retried until they
+    change again (POST /admin/reload still forces a retry).
+    """
+    global _watcher
+    if interval_seconds is None:
+        interval_seconds = float(os.environ.get("CAREER_RELOAD_INTERVAL", "0") or 0)
+    if interval_seconds <= 0 or (_watcher is not None and _watcher.is_alive()):
+        return False
+
+    def _watch() -> None:
+        pending: str | None = None
+        while True:
+            time.sleep(interval_seconds)
+            current = _current_fingerprint()
+            live = _models.version if _models is not None else None
+            if current is None or current == live or current == _reload_state["failed_version"]:
+                pending = None
+                continue
+            if current == pending:
+                reload_artifacts()
+                pending = None
+            else:
+                pending = current
+
+    _reload_state["watch_interval_seconds"] = interval_seconds
+    _watcher = threading.Thread(target=_watch, name="artifact-watcher", daemon=True)
+    _watcher.start()
+    return True
+
+
+def reload_status() -> dict[str, Any]:
+    return {**_reload_state, "on_disk_version": _current_fingerprint()}
+
+
+def get_models() -> ModelSet:
+    """Return the live ModelSet or raise RuntimeError. Read it once per request and use only that."""
+    _ensure_load_begun()
+    models = _models
+    if models is None:
+        if loading():
+            raise RuntimeError("Model artifacts are still loading.")
+        raise RuntimeError(_load_error or "Model artifacts are not loaded.")
+    return models
+
+
+def peek_models() -> ModelSet | None:
+    """The live ModelSet, or None; never starts a load."""
+    return _models
+
+
+def get_bundle() -> ArtifactBundle:
+    """Return the primary model's live bundle or raise RuntimeError (see get_models)."""
+    return get_models().primary_bundle
+
+
+def peek_bundle() -> ArtifactBundle | None:
+    """The primary live bundle, or None; unlike get_bundle() it never starts a load (for probes)."""
+    models = _models
+    return models.primary_bundle if models is not None else None
 
 
 def get_artifacts():
     """Return (vectorizer, model, label_encoder) or raise RuntimeError."""
-    load_artifacts()
-    if _load_error:
-        raise RuntimeError(_load_error)
-    if _vectorizer is None or _model is None or _label_encoder is None:
-        raise RuntimeError("Model artifacts are not loaded.")
-    return _vectorizer, _model, _label_encoder
+    b = get_bundle()
+    return b.vectorizer, b.model, b.label_encoder
+
+
+def get_label_table() -> tuple[np.ndarray, dict[Any, str]]:
+    """Return (labels per predict_proba column, model.predict value -> label); built at load time."""
+    b = get_bundle()
+    return b.class_labels, b.label_by_value
+
+
+def label_for_value(value: Any) -> str:
+    """Decode one model.predict output via the precomputed table (str fallback for unknown values)."""
+    return get_bundle().label_for_value(value)
 
 
 def is_ready() -> bool:
-    load_artifacts()
-    return (
-        _load_error is None
-        and _vectorizer is not None
-        and _model is not None
-        and _label_encoder is not None
-    )
+    _ensure_load_begun()
+    return _models is not None
+
+
+def model_version() -> str | None:
+    """Fingerprint of the loaded artifact files (None when not loaded)."""
+    _ensure_load_begun()
+    models = _models
+    return models.primary_bundle.version if models is not None else None
 
 
 def last_load_error() -> str | None:
-    load_artifacts()
+    _ensure_load_begun()
+    return _load_error
+
+
+def peek_load_error() -> str | None:
+    """The first load's error, or None; never starts a load (for probes)."""
     return _load_error
@@ -0,0 +1,98 @@
+"""
+Bounded in-process prediction cache (LRU eviction + TTL) keyed on normalized text.
+Size and TTL come from CAREER_CACHE_SIZE / CAREER_CACHE_TTL; size 0 disables caching.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Sentinel returned by get() on a miss (None is a valid cached value).
+MISSING = object()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with per-entry TTL. Cleared whenever the model version changes."""
+
+    def __init__(self, maxsize: int = 2048, ttl_seconds: float = 600.0) -> None:
+        self.maxsize = max(0, int(maxsize))
+        self.ttl_seconds = float(ttl_seconds)
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def bind_version(self, version: str | None) -> None:
+        """Drop every entry when the artifacts behind the cached predictions change."""
+        if version == self._version:
+            return
+        with self._lock:
+            if version != self._version:
+                self._data.clear()
+                self._version = version
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING on a miss / expired entry."""
+        if not self.enabled:
+            return MISSING
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return MISSING
+            expires, value = item
+            if self.ttl_seconds > 0 and now >= expires:
+                del self._data[key]
+                self.misses += 1
+                self.evictions += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            size = len(self._data)
+        return {
+            "enabled": self.enabled,
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "model_version": self._version,
+        }
+
+
+def cache_from_env() -> PredictionCache:
+    """Build a cache from CAREER_CACHE_SIZE (default 2048, 0 = off) and CAREER_CACHE_TTL (seconds, default 600)."""
+    size = int(os.environ.get("CAREER_CACHE_SIZE", "2048"))
+    ttl = float(os.environ.get("CAREER_CACHE_TTL", "600"))
+    return PredictionCache(maxsize=size, ttl_seconds=ttl)
@@ -1,80 +1,71 @@
 """
 Preprocess user text, TF-IDF transform, and predict career label(s).
+
+Thin adapter over inference_engine.InferenceEngine (shared with ../predict_api.py): this module
+only maps engine results to the Flask API's response shapes.
 """
 
 from __future__ import annotations
 
 from typing import Any
 
-import numpy as np
-
-from model_loader import get_artifacts
-
-
-def preprocess_text(text: str) -> str:
-    """Normalize input: strip and lowercase."""
-    return (text or "").strip().lower()
-
-
-def _decode_from_model_prediction(label_encoder: Any, model: Any, pred_value: Any) -> str:
-    """Decode sklearn model.predict output to string career label."""
-    v = int(np.asarray(pred_value).ravel()[0])
-    try:
-        return str(label_encoder.inverse_transform(np.array([v]))[0])
-    except Exception:  # noqa: BLE001
-        pass
-    if hasattr(model, "classes_") and model.classes_ is not None and 0 <= v < len(model.classes_):
-        cls_val = model.classes_[v]
-        try:
-            return str(label_encoder.inverse_transform(np.array([cls_val]))[0])
-        except Exception:  # noqa: BLE001
-            return str(cls_val)
-    return str(v)
+from inference_engine import (  # noqa: F401 — prediction_cache / preprocess_text re-exported
+    InferenceEngine,
+    Prediction,
+    get_engine,
+    prediction_cache,
+    preprocess_text,
+)
 
 
-def _decode_proba_column(label_encoder: Any, model: Any, column_index: int) -> str:
-    """Decode column j of predict_proba (aligns with model.classes_[j])."""
-    j = int(column_index)
-    if not hasattr(model, "classes_") or model.classes_ is None:
-        return str(j)
-    cls_val = model.classes_[j]
-    try:
-        return str(label_encoder.inverse_transform(np.array([cls_val]))[0])
-    except Exception:  # noqa: BLE001
-        return str(cls_val)
+def _recommendations(pred: Prediction) -> list[dict[str, float | str]]:
+    return [{"career": label, "probability": p} for label, p in pred.top or ()]
 
 
-def predict_best_career(text: str) -> str:
-    """Return single best career label."""
-    vectorizer, model, label_encoder = get_artifacts()
-    processed = preprocess_text(text)
-    if not processed:
+def predict_best_career(text: str, engine: InferenceEngine | None = None) -> str:
+    """Return single best career label (from `engine`, e.g. the routed model; default: the primary)."""
+    pred = (engine or get_engine()).predict([text])[0]
+    if pred is None:
         raise ValueError("EMPTY_TEXT")
-
-    X = vectorizer.transform([processed])
-    pred = model.predict(X)
-    return _decode_from_model_prediction(label_encoder, model, pred[0])
+    return pred.label
+
+
+def predict_top(
+    text: str, k: int = 3, min_probability: float | None = None, engine: InferenceEngine | None = None
+) -> list[dict[str, float | str]]:
+    """
+    Return up to k careers with probabilities, highest first (requires predict_proba).
+    With min_probability, careers below it are left out (the list may be shorter, or empty).
+    """
+    engine = engine or get_engine()
+    if not preprocess_text(text):
+        raise ValueError("EMPTY_TEXT")
+    return _recommendations(engine.predict_topk([text], k, min_probability)[0])
 
 
 def predict_top3(text: str) -> list[dict[str, float | str]]:
     """Return top 3 careers with probabilities (requires predict_proba)."""
-    vectorizer, model, label_encoder = get_artifacts()
-    processed = preprocess_text(text)
-    if not processed:
-        raise ValueError("EMPTY_TEXT")
-
-    if not hasattr(model, "predict_proba"):
-        raise RuntimeError("MODEL_NO_PROBA")
-
-    X = vectorizer.transform([processed])
-    probs = model.predict_proba(X)[0]
-    k = min(3, len(probs))
-    order = np.argsort(probs)[-k:][::-1]
-
-    return [
-        {
-            "career": _decode_proba_column(label_encoder, model, int(j)),
-            "probability": float(probs[int(j)]),
-        }
-        for j in order
-    ]
+    return predict_top(text, 3)
+
+
+def predict_batch(
+    texts: list[str],
+    k: int = 3,
+    min_probability: float | None = None,
+    engine: InferenceEngine | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Score many texts with one TF-IDF transform and one predict_proba over the whole matrix.
+    Empty rows come back inline as {"error", "code"} instead of failing the batch.
+    Rows already in the prediction cache are not re-scored. Pass `engine` to keep several calls
+    (the chunks of one streamed response) on the same model across a reload.
+    """
+    results: list[dict[str, Any]] = []
+    for pred in (engine or get_engine()).predict_batch(texts, k, min_probability):
+        if pred is None:
+            results.append({"error": 'Field "text" must not be empty.', "code": "EMPTY_TEXT"})
+        elif pred.top is None:
+            results.append({"best_career": pred.label})
+        else:
+            results.append({"best_career": pred.label, "recommendations": _recommendations(pred)})
+    return results
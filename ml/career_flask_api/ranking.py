@@ -0,0 +1,66 @@
+"""
+Top-k selection over predict_proba output (shared with ../predict_api.py).
+
+np.argpartition picks the k winners in O(n_classes) and only those k are sorted, instead of
+fully sorting every probability row. Small matrices (few classes or few rows) are cheaper to
+sort outright: argpartition's extra passes cost more than they save there.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Below this many classes, or this many probabilities in total, a stable full sort is faster.
+_PARTITION_MIN_CLASSES = 32
+_PARTITION_MIN_SIZE = 8192
+
+
+def top_k_indices(probs: np.ndarray, k: int) -> np.ndarray:
+    """
+    Column indices of the k largest probabilities, highest first; ties go to the lower index
+    (same as argmax). 1-D probs -> shape (k,); 2-D (rows x classes) -> shape (rows, k).
+    k is clipped to the number of classes.
+    """
+    probs = np.asarray(probs)
+    rows = probs.reshape(-1, probs.shape[-1])
+    n = rows.shape[1]
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.empty(probs.shape[:-1] + (0,), dtype=np.intp)
+    if n <= _PARTITION_MIN_CLASSES or rows.size < _PARTITION_MIN_SIZE:
+        return np.argsort(-rows, axis=1, kind="stable")[:, :k].reshape(probs.shape[:-1] + (k,))
+    if k < n:
+        winners = np.argpartition(rows, n - k, axis=1)[:, n - k :]
+        _fix_boundary_ties(rows, winners)
+        winners.sort(axis=1)
+    else:
+        winners = np.broadcast_to(np.arange(n), rows.shape)
+    # Stable sort on the index-ordered winners keeps the lower index first on ties.
+    order = np.argsort(-np.take_along_axis(rows, winners, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(winners, order, axis=1).reshape(probs.shape[:-1] + (k,))
+
+
+def _fix_boundary_ties(rows: np.ndarray, winners: np.ndarray) -> None:
+    """
+    argpartition picks arbitrarily among values tied with the k-th largest. For the (usually few)
+    rows where such a tie straddles the cut, re-pick the tied slots lowest index first, in place.
+    """
+    k = winners.shape[1]
+    kth = np.take_along_axis(rows, winners, axis=1).min(axis=1, keepdims=True)
+    tied = rows == kth
+    inside = (np.take_along_axis(rows, winners, axis=1) == kth).sum(axis=1)
+    bad = np.flatnonzero(tied.sum(axis=1) > inside)
+    if bad.size == 0:
+        return
+    sub, tied = rows[bad], tied[bad]
+    above = sub > kth[bad]
+    slots = k - above.sum(axis=1, keepdims=True)
+    selected = above | (tied & (np.cumsum(tied, axis=1) <= slots))
+    winners[bad] = np.nonzero(selected)[1].reshape(bad.size, k)
+
+
+def above_threshold(row: np.ndarray, cols: np.ndarray, min_probability: float | None) -> np.ndarray:
+    """Drop the selected columns whose probability is below min_probability (None = keep all)."""
+    if not min_probability:
+        return cols
+    return cols[row[cols] >= min_probability]
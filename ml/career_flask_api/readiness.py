@@ -0,0 +1,153 @@
+"""
+Startup and readiness shared by app.py and ../predict_api.py.
+
+start() loads the artifacts once, on a background thread by default, so the server accepts
+connections (and answers GET /livez) straight away. Every new bundle, at startup and on reloads,
+first gets a warm-up pass: synthetic texts from the fitted vocabulary go through the best-label,
+top-k and batch paths, so sklearn / XGBoost lazy initialization is paid before real traffic.
+A bundle is only published once warmed up, so "model loaded" and ready are the same thing and
+GET /readyz turns green exactly then. CAREER_WARMUP=0 skips the pass.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable
+
+from compiled_scorer import check_corpus
+from inference_engine import InferenceEngine
+from metrics import METRICS
+from model_loader import (
+    ArtifactBundle,
+    is_ready,
+    last_load_error,
+    load_artifacts,
+    loading,
+    mark_load_pending,
+    peek_bundle,
+    peek_load_error,
+    set_prepare_hook,
+)
+
+logger = logging.getLogger(__name__)
+
+# Texts in the warm-up batch; single-text paths use the first one.
+WARMUP_BATCH = 16
+
+_started_at: float | None = None
+_ready_at: float | None = None
+_warming_up = False
+_last_warmup: dict[str, Any] | None = None
+_start_lock = threading.Lock()
+_thread: threading.Thread | None = None
+
+
+def warmup_enabled() -> bool:
+    return os.environ.get("CAREER_WARMUP", "1").lower() not in ("0", "false", "no")
+
+
+def warm_up(bundle: ArtifactBundle) -> dict[str, float]:
+    """Score synthetic texts through every engine path of `bundle`; returns milliseconds per path."""
+    engine = InferenceEngine(bundle)  # no cache: every call is scored
+    texts = check_corpus(bundle.vectorizer, WARMUP_BATCH)
+    timings: dict[str, float] = {}
+
+    def timed(name: str, fn: Callable[[], object]) -> None:
+        started = time.perf_counter()
+        fn()
+        timings[f"{name}_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    timed("best", lambda: engine.predict(texts[:1]))
+    if engine.can_rank:
+        timed("top_k", lambda: engine.predict_topk(texts[:1], 3))
+    timed("batch", lambda: engine.predict_batch(texts, 3))
+    return timings
+
+
+def _warm_up_as_route(bundle: ArtifactBundle) -> dict[str, float]:
+    METRICS.bind_route("warmup")
+    return warm_up(bundle)
+
+
+def _warm_up_hook(bundle: ArtifactBundle) -> None:
+    """model_loader prepare hook: runs before `bundle` serves; an exception keeps it out."""
+    global _warming_up, _last_warmup
+    _warming_up = True
+    started = time.perf_counter()
+    try:
+        # Own context: stage metrics are labelled route="warmup" without rebinding the caller's route.
+        timings = contextvars.copy_context().run(_warm_up_as_route, bundle)
+    finally:
+        _warming_up = False
+    total = round((time.perf_counter() - started) * 1000, 3)
+    _last_warmup = {"model_version": bundle.version, **timings, "total_ms": total, "finished_at": time.time()}
+    logger.info("Warm-up of version %s done in %.1f ms (%s)", bundle.version, total, timings)
+
+
+def _run() -> None:
+    global _ready_at
+    load_artifacts()
+    if is_ready():
+        _ready_at = time.time()
+        logger.info("Ready %.2f s after startup began", _ready_at - (_started_at or _ready_at))
+    else:
+        logger.warning("Not ready: %s", last_load_error())
+
+
+def start(background: bool = True) -> bool:
+    """
+    Begin the one startup load (with warm-up unless CAREER_WARMUP=0). Returns False if it was
+    already started. background=False loads in the calling thread (gunicorn master, before fork).
+    """
+    global _started_at, _thread
+    with _start_lock:
+        if _started_at is not None:
+            return False
+        _started_at = time.time()
+        mark_load_pending()  # before the thread runs: a probe in between sees "loading", not "failed"
+        if warmup_enabled():
+            set_prepare_hook(_warm_up_hook)
+        if background:
+            _thread = threading.Thread(target=_run, name="artifact-startup", daemon=True)
+            _thread.start()
+            return True
+    _run()
+    return True
+
+
+def wait(timeout: float | None = None) -> bool:
+    """Block until a background start() has finished; True when ready."""
+    if _thread is not None:
+        _thread.join(timeout)
+    return ready()
+
+
+def ready() -> bool:
+    """True once a (warmed-up) bundle is serving. Never loads or waits."""
+    return peek_bundle() is not None
+
+
+def status() -> dict[str, Any]:
+    """Readiness details for GET /readyz. Never loads or waits."""
+    bundle = peek_bundle()
+    if bundle is not None:
+        phase = "ready"
+    elif loading():
+        phase = "warming_up" if _warming_up else "loading"
+    elif _started_at is None:
+        phase = "not_started"
+    else:
+        phase = "failed"
+    return {
+        "ready": bundle is not None,
+        "phase": phase,
+        "error": peek_load_error() if phase == "failed" else None,
+        "model_version": bundle.version if bundle else None,
+        "load_seconds": round(bundle.load_seconds, 4) if bundle else None,
+        "warmup": _last_warmup,
+        "startup_seconds": round(_ready_at - _started_at, 4) if _ready_at and _started_at else None,
+    }
@@ -0,0 +1,232 @@
+"""
+Opt-in per-request profiling for app.py and ../predict_api.py.
+
+Off unless CAREER_PROFILE_DIR is set. Then a request is profiled with cProfile when it sends
+X-Career-Profile: 1, or at random with probability CAREER_PROFILE_SAMPLE. Each profile is
+written to the directory as <id>.prof (pstats format: `python -m pstats`, snakeviz) plus
+<id>.json (route, status, duration, hottest functions), and the response carries its id in
+X-Career-Profile-Id. GET /admin/profiles lists the newest summaries.
+
+  CAREER_PROFILE_DIR     where profiles are written (default: unset = profiling off)
+  CAREER_PROFILE_SAMPLE  fraction of requests profiled without the header (default 0)
+  CAREER_PROFILE_KEEP    newest profiles kept in the directory; older ones are deleted (default 200)
+
+app.py profiles the whole request on its thread. predict_api.py profiles the prediction work
+(preprocess, transform, model call, decode) on the thread that runs it: callers wrap the
+function with profiled(). One request is profiled at a time per process; a request that would
+be profiled while another one is gets skipped (counted). Requests that are not profiled pay one
+attribute check, or one context-variable read in profiled().
+"""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+R = TypeVar("R")
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Career-Profile"
+PROFILE_ID_HEADER = "X-Career-Profile-Id"
+
+# Functions listed per profile in its .json summary, by own (not cumulative) time.
+_HOTSPOTS = 10
+
+_current: contextvars.ContextVar[ProfileSession | None] = contextvars.ContextVar("career_profile", default=None)
+
+
+class ProfileSession:
+    """One profiled request: a cProfile.Profile enabled around the parts being measured."""
+
+    def __init__(self, route: str, method: str, trigger: str) -> None:
+        now = time.time()
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now)) + f"{int(now * 1000) % 1000:03d}"
+        self.id = f"{stamp}-{os.getpid()}-{secrets.token_hex(3)}"
+        self.route = route
+        self.method = method
+        self.trigger = trigger
+        self.started_at = now
+        self.started = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._enabled = False
+        self._token: contextvars.Token | None = None
+
+    def enable(self) -> None:
+        if not self._enabled:
+            self._profile.enable()
+            self._enabled = True
+
+    def disable(self) -> None:
+        if self._enabled:
+            self._profile.disable()
+            self._enabled = False
+
+    @contextmanager
+    def section(self) -> Iterator[None]:
+        """Profile the enclosed code (a no-op when the whole request is already profiled)."""
+        if self._enabled:
+            yield
+            return
+        self.enable()
+        try:
+            yield
+        finally:
+            self.disable()
+
+
+class RequestProfiler:
+    """Decides which requests to profile and writes / lists their profiles."""
+
+    def __init__(self, directory: str | Path | None, sample_rate: float = 0.0, keep: int = 200) -> None:
+        self.directory = Path(directory) if directory else None
+        self.enabled = self.directory is not None
+        self.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+        self.keep = max(1, int(keep))
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+        self.profiled = 0
+        self.skipped_busy = 0
+        self.errors = 0
+
+    def start(self, route: str, method: str, header_value: str | None) -> ProfileSession | None:
+        """A session if this request is to be profiled, else None. Callers check .enabled first."""
+        if header_value is not None and header_value.strip().lower() in ("1", "true", "yes"):
+            trigger = "header"
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            trigger = "sampled"
+        else:
+            return None
+        if not self._busy.acquire(blocking=False):
+            with self._lock:
+                self.skipped_busy += 1
+            return None
+        session = ProfileSession(route, method, trigger)
+        session._token = _current.set(session)
+        return session
+
+    def finish(self, session: ProfileSession, status: int) -> None:
+        """Stop profiling, write <id>.prof / <id>.json and drop profiles beyond `keep`."""
+        try:
+            session.disable()
+            duration = time.perf_counter() - session.started
+            try:
+                _current.reset(session._token)
+            except ValueError:  # finished from another context (e.g. a Flask teardown)
+                _current.set(None)
+            self._write(session, status, duration)
+        except Exception as e:  # noqa: BLE001 — profiling must never fail the request
+            with self._lock:
+                self.errors += 1
+            logger.warning("Could not write profile %s: %s", session.id, e)
+        finally:
+            self._busy.release()
+
+    def _write(self, session: ProfileSession, status: int, duration: float) -> None:
+        assert self.directory is not None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        prof_path: Path | None = None
+        rows: list = []
+        profiled_seconds = 0.0
+        session._profile.create_stats()
+        if session._profile.stats:  # empty when the request failed before any profiled work
+            prof_path = self.directory / f"{session.id}.prof"
+            stats = pstats.Stats(session._profile)
+            stats.dump_stats(str(prof_path))
+            rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:_HOTSPOTS]
+            profiled_seconds = stats.total_tt
+        summary = {
+            "id": session.id,
+            "route": session.route,
+            "method": session.method,
+            "status": status,
+            "trigger": session.trigger,
+            "duration_ms": round(duration * 1000, 3),
+            "profiled_ms": round(profiled_seconds * 1000, 3),
+            "started_at": round(session.started_at, 3),
+            "pid": os.getpid(),
+            "file": prof_path.name if prof_path is not None else None,
+            "hotspots": [
+                {
+                    "function": f"{Path(file).name}:{line}({name})",
+                    "calls": calls,
+                    "own_ms": round(own * 1000, 3),
+                    "cumulative_ms": round(cumulative * 1000, 3),
+                }
+                for (file, line, name), (_primitive, calls, own, cumulative, _callers) in rows
+            ],
+        }
+        (self.directory / f"{session.id}.json").write_text(json.dumps(summary, indent=1), encoding="utf-8")
+        with self._lock:
+            self.profiled += 1
+        for old in sorted(self.directory.glob("*.json"))[: -self.keep]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".prof").unlink(missing_ok=True)
+
+    def index(self, limit: int = 50) -> list[dict[str, Any]]:
+        """Newest profile summaries first, from every process writing to the directory."""
+        if self.directory is None or not self.directory.is_dir():
+            return []
+        out: list[dict[str, Any]] = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True)[: max(0, limit)]:
+            try:
+                out.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue  # deleted or half-written by another worker
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "directory": str(self.directory) if self.directory else None,
+            "sample_rate": self.sample_rate,
+            "keep": self.keep,
+            "profiled": self.profiled,
+            "skipped_busy": self.skipped_busy,
+            "errors": self.errors,
+        }
+
+
+def active_session() -> ProfileSession | None:
+    """The session profiling the current request, if any."""
+    return _current.get()
+
+
+def profiled(fn: Callable[..., R]) -> Callable[..., R]:
+    """
+    fn, wrapped to run under the current request's profiler; fn itself when the request is not
+    profiled. Call it in the request's context; the wrapper may then run on any thread.
+    """
+    session = _current.get()
+    if session is None:
+        return fn
+
+    def run(*args: Any, **kwargs: Any) -> R:
+        with session.section():
+            return fn(*args, **kwargs)
+
+    return run
+
+
+def profiler_from_env() -> RequestProfiler:
+    """Build a profiler from CAREER_PROFILE_DIR / CAREER_PROFILE_SAMPLE / CAREER_PROFILE_KEEP."""
+    return RequestProfiler(
+        os.environ.get("CAREER_PROFILE_DIR", "").strip() or None,
+        sample_rate=float(os.environ.get("CAREER_PROFILE_SAMPLE", "0")),
+        keep=int(os.environ.get("CAREER_PROFILE_KEEP", "200")),
+    )
+
+
+# Process-wide, shared by every route of the server that imports it.
+PROFILER = profiler_from_env()
@@ -0,0 +1,204 @@
+"""
+Bulk-score a JSONL or CSV file of profiles offline with the loaded artifacts (no HTTP).
+Run from this folder:
+
+  python score_profiles.py profiles.jsonl -o scores.jsonl
+  python score_profiles.py users.csv -o scores.jsonl --workers 4 --top-k 5 --id-field user_id
+
+Each input row is either {"text": ...} (scored like /recommend-batch) or profile fields
+interests / skills / certificate_course_title / ug_course / ug_specialization (camelCase
+accepted), combined like predict_api's /predict/json. Rows are read and scored in chunks of
+--chunk-size as one matrix each; at most 2 x --workers chunks are in flight, so memory stays
+flat however large the input is. Output is one JSON object per input row, in input order:
+
+  {"row": 1, "id": "u42", "best_career": "...", "recommendations": [...]}
+  {"row": 2, "id": "u43", "error": "...", "code": "EMPTY_TEXT"}
+
+Set CAREER_MODEL_DIR as for app.py. Throughput is printed to stderr at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Iterator
+
+# Offline scoring sees each profile once: skip the request cache (must be set before predictor import).
+os.environ.setdefault("CAREER_CACHE_SIZE", "0")
+
+from model_loader import is_ready, last_load_error, load_artifacts  # noqa: E402
+from predictor import predict_batch  # noqa: E402
+
+# Same fields and aliases as predict_api.PredictBody; joined in this order.
+PROFILE_FIELDS = (
+    ("interests",),
+    ("skills",),
+    ("certificate_course_title", "certificateCourseTitle", "certificate_course_titles"),
+    ("ug_course", "ugCourse"),
+    ("ug_specialization", "ugSpecialization"),
+)
+
+
+def profile_text(record: dict[str, Any]) -> str:
+    """The text to score: "text" if present, else the combined profile fields."""
+    text = record.get("text")
+    if isinstance(text, str):
+        return text
+    parts = []
+    for names in PROFILE_FIELDS:
+        value = next((record[n] for n in names if record.get(n) is not None), "")
+        value = str(value).strip()
+        if value:
+            parts.append(value)
+    return " ".join(parts)
+
+
+def read_rows(path: str, fmt: str) -> Iterator[tuple[int, dict[str, Any] | None]]:
+    """Yield (row number, record) lazily; record is None for a JSONL line that does not parse."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            for n, rec in enumerate(csv.DictReader(stream), start=1):
+                yield n, rec
+            return
+        n = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            n += 1
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                rec = None
+            yield n, rec if isinstance(rec, dict) else None
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def chunked(rows: Iterator, size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_texts(texts: list[str], k: int, min_probability: float | None) -> list[dict[str, Any]]:
+    """Worker entry point: one transform + one predict_proba over the chunk."""
+    return predict_batch(texts, k=k, min_probability=min_probability)
+
+
+def _init_worker() -> None:
+    # Forked workers inherit the parent's loaded bundle; spawned ones (Windows/macOS) load their own.
+    load_artifacts()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk-score profiles from JSONL/CSV into JSONL.")
+    parser.add_argument("input", help="profiles .jsonl / .csv, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output .jsonl (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="input format (default: from the file suffix)")
+    parser.add_argument("--id-field", default="id", help="copied to each output row when present (default: id)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=1, help="scoring processes (default 1: score in-process)")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--min-probability", type=float)
+    args = parser.parse_args()
+    if args.chunk_size < 1 or args.workers < 1 or args.top_k < 1:
+        parser.error("--chunk-size, --workers and --top-k must be positive")
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+
+    load_artifacts()
+    if not is_ready():
+        print(f"Model not loaded: {last_load_error()}", file=sys.stderr)
+        return 2
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="\n")
+    pool = ProcessPoolExecutor(args.workers, initializer=_init_worker) if args.workers > 1 else None
+    # (chunk rows, Future or finished results), oldest first -> output keeps input order.
+    pending: deque[tuple[list, Future | list]] = deque()
+    counts = {"rows": 0, "errors": 0}
+    started = time.perf_counter()
+
+    def write(rows: list, results: list[dict[str, Any]]) -> None:
+        buf = io.StringIO()
+        for (n, rec), r in zip(rows, results):
+            line: dict[str, Any] = {"row": n}
+            if rec is not None and rec.get(args.id_field) is not None:
+                line["id"] = rec[args.id_field]
+            line.update(r)
+            counts["errors"] += "error" in r
+            buf.write(json.dumps(line, ensure_ascii=False))
+            buf.write("\n")
+        out.write(buf.getvalue())
+        counts["rows"] += len(rows)
+
+    def drain(limit: int) -> None:
+        while len(pending) > limit:
+            rows, job = pending.popleft()
+            results = job.result() if isinstance(job, Future) else job
+            write(rows, _merge_invalid(rows, results))
+
+    try:
+        for rows in chunked(read_rows(args.input, fmt), args.chunk_size):
+            texts = [profile_text(rec) for _, rec in rows if rec is not None]
+            if pool is not None:
+                job = pool.submit(score_texts, texts, args.top_k, args.min_probability)
+            else:
+                job = score_texts(texts, args.top_k, args.min_probability)
+            pending.append((rows, job))
+            drain(2 * args.workers - 1)
+        drain(0)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Scored {counts['rows']} rows ({counts['errors']} errors) in {elapsed:.2f}s "
+        f"-> {counts['rows'] / elapsed if elapsed else 0:.0f} rows/s with {args.workers} worker(s)"
+        + (f", peak RSS {rss} MB (main process)" if (rss := _peak_rss_mb()) is not None else ""),
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _merge_invalid(rows: list, results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Re-insert inline errors for rows that were not valid JSON objects (they were not scored)."""
+    if all(rec is not None for _, rec in rows):
+        return results
+    scored = iter(results)
+    return [
+        next(scored) if rec is not None else {"error": "Row is not a JSON object.", "code": "INVALID_JSON"}
+        for _, rec in rows
+    ]
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except BrokenPipeError:  # output piped into head / less that exited early
+        sys.stderr.close()
+        sys.exit(0)
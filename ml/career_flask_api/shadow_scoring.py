@@ -0,0 +1,135 @@
+"""
+Off-path shadow scoring (CAREER_SHADOW_MODELS, see model_loader.py).
+
+When a served model scores a batch, inference_engine.py hands the preprocessed texts, their
+matrix and the served labels to SHADOW.submit(), which only enqueues them (no waiting, no model
+work). One background thread then scores the batch with each shadow model and records how often
+its best label agrees with the served one. A shadow whose vectorizer is shared with the served
+model reuses the served matrix; others transform the texts themselves.
+
+  CAREER_SHADOW_SAMPLE  fraction of scored batches mirrored to the shadows (default 1.0)
+  CAREER_SHADOW_QUEUE   batches waiting for the shadow thread (default 256); when it is full,
+                        new batches are dropped (counted) instead of slowing requests down
+
+Rows answered from the prediction cache are never mirrored: only scored rows are compared.
+Agreement is kept per (shadow, served) model pair and restarts when either version changes.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class ShadowScorer:
+    """Bounded queue plus one daemon thread that scores queued batches with the shadow engines."""
+
+    def __init__(self, sample_rate: float = 1.0, max_queue: int = 256) -> None:
+        self.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+        self.max_queue = max(1, int(max_queue))
+        self._queue: queue.Queue[tuple[Any, list[str], Any, list[str], list[Any]]] = queue.Queue(self.max_queue)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        # (shadow name, served name) -> running agreement counters.
+        self._pairs: dict[tuple[str, str], dict[str, Any]] = {}
+        self.submitted = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def submit(self, served: Any, texts: list[str], X: Any, labels: list[str], shadows: list[Any]) -> None:
+        """Queue one batch `served` just scored (labels = its best labels); never blocks."""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((served, texts, X, labels, shadows))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        with self._lock:
+            self.submitted += 1
+
+    def _ensure_worker(self) -> None:
+        # Started on first use, so a gunicorn master that preloads never forks with it running.
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="shadow-scoring", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            served, texts, X, labels, shadows = self._queue.get()
+            for shadow in shadows:
+                started = time.perf_counter()
+                shared = shadow.bundle.vectorizer is served.bundle.vectorizer
+                try:
+                    got = shadow.best_labels(X if shared else shadow.bundle.transform(texts))
+                except Exception as e:  # noqa: BLE001 — a broken candidate must not stop the thread
+                    with self._lock:
+                        self.errors += 1
+                    logger.warning("Shadow model %r failed on a batch: %s", shadow.name, e)
+                    continue
+                self._record(shadow, served, labels, got, time.perf_counter() - started, shared)
+
+    def _record(self, shadow: Any, served: Any, expected: list[str], got: list[str], seconds: float, shared: bool) -> None:
+        agreed = sum(a == b for a, b in zip(expected, got))
+        with self._lock:
+            pair = self._pairs.get((shadow.name, served.name))
+            if pair is None or pair["shadow_version"] != shadow.version or pair["served_version"] != served.version:
+                pair = self._pairs[(shadow.name, served.name)] = {
+                    "shadow_version": shadow.version,
+                    "served_version": served.version,
+                    "shared_matrix": shared,
+                    "batches": 0,
+                    "compared": 0,
+                    "agreed": 0,
+                    "seconds": 0.0,
+                }
+            pair["batches"] += 1
+            pair["compared"] += len(expected)
+            pair["agreed"] += agreed
+            pair["seconds"] += seconds
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            pairs = {key: dict(pair) for key, pair in self._pairs.items()}
+            submitted, dropped, errors = self.submitted, self.dropped, self.errors
+        agreement: dict[str, dict[str, Any]] = {}
+        for (shadow, served), pair in sorted(pairs.items()):
+            seconds = pair.pop("seconds")
+            agreement.setdefault(shadow, {})[served] = {
+                **pair,
+                "agreement": round(pair["agreed"] / pair["compared"], 6) if pair["compared"] else None,
+                "avg_batch_ms": round(seconds / pair["batches"] * 1000, 3) if pair["batches"] else None,
+            }
+        return {
+            "sample_rate": self.sample_rate,
+            "max_queue": self.max_queue,
+            "queue_depth": self._queue.qsize(),
+            "submitted": submitted,
+            "dropped": dropped,
+            "errors": errors,
+            "agreement": agreement,
+        }
+
+
+def shadow_scorer_from_env() -> ShadowScorer:
+    """Build a scorer from CAREER_SHADOW_SAMPLE / CAREER_SHADOW_QUEUE."""
+    return ShadowScorer(
+        sample_rate=float(os.environ.get("CAREER_SHADOW_SAMPLE", "1")),
+        max_queue=int(os.environ.get("CAREER_SHADOW_QUEUE", "256")),
+    )
+
+
+# Process-wide; fed by every served engine that has shadows (inference_engine.py).
+SHADOW = shadow_scorer_from_env()
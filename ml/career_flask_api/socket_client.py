@@ -0,0 +1,114 @@
+"""
+Reference client for socket_server.py: the framing and request shapes the .NET back end
+implements, in Python. One persistent connection; predict_many() pipelines frames (writes them
+all, then reads the answers in order).
+
+  from socket_client import CareerSocketClient
+
+  with CareerSocketClient("/tmp/career-api.sock") as client:
+      rows = client.predict(["python sql statistics"], k=3)
+      batches = client.predict_many([{"texts": ["..."]}, {"texts": ["..."], "k": 2}])
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import socket
+from typing import Any, Callable
+
+# Kept free of server imports (no model stack) so it can be copied next to any caller.
+DEFAULT_PATH = "/tmp/career-api.sock"
+
+
+def _codec(name: str) -> tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    if name == "json":
+        return (lambda obj: json.dumps(obj, separators=(",", ":")).encode()), json.loads
+    import msgpack
+
+    return (lambda obj: msgpack.packb(obj, use_bin_type=True)), (lambda data: msgpack.unpackb(data, raw=False))
+
+
+def _frame(payload: bytes) -> bytes:
+    return len(payload).to_bytes(4, "big") + payload
+
+
+class CareerSocketError(Exception):
+    """A frame answered with "ok": false; .code is the server's error code (e.g. OVERLOADED)."""
+
+    def __init__(self, code: str, message: str, response: dict[str, Any] | None = None) -> None:
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.response = response or {}
+
+
+class CareerSocketClient:
+    """Not thread-safe: use one client (connection) per thread, or a pool of them."""
+
+    def __init__(self, path: str = DEFAULT_PATH, codec_name: str = "msgpack", timeout: float | None = 30.0) -> None:
+        self._encode, self._decode = _codec(codec_name)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+        self._buf = bytearray()
+        self._ids = itertools.count(1)
+
+    def predict(
+        self, texts: list[str], k: int = 0, min_probability: float | None = None, model: str | None = None
+    ) -> list[dict[str, Any]]:
+        """One row per text: {"best_career"[, "recommendations"]} or an inline {"error", "code"}."""
+        return self.predict_many([{"texts": texts, "k": k, "min_probability": min_probability, "model": model}])[0]
+
+    def predict_many(self, requests: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        """
+        Send every request ({"texts", "k", "min_probability", "model"}) before reading any answer;
+        returns their "results" in order. Raises CareerSocketError for the first failed one.
+        """
+        responses = self.call([{"op": "predict", **r} for r in requests])
+        return [_results(r) for r in responses]
+
+    def info(self) -> dict[str, Any]:
+        """Model name / version / classes and the answering worker's pid."""
+        (response,) = self.call([{"op": "info"}])
+        if not response.get("ok"):
+            raise CareerSocketError(response.get("code", "ERROR"), response.get("error", ""), response)
+        return response
+
+    def call(self, requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Raw pipelined round trip: one frame per request, responses matched by id."""
+        ids = [next(self._ids) for _ in requests]
+        self._sock.sendall(b"".join(_frame(self._encode({**r, "id": i})) for r, i in zip(requests, ids)))
+        responses = [self._read() for _ in ids]
+        for request_id, response in zip(ids, responses):
+            if response.get("id") != request_id:
+                # Frames the server could not decode (or an oversized one) are answered without an id.
+                raise CareerSocketError(response.get("code", "ERROR"), response.get("error", "out-of-order response"), response)
+        return responses
+
+    def _read(self) -> dict[str, Any]:
+        while True:
+            if len(self._buf) >= 4:
+                size = int.from_bytes(self._buf[:4], "big")
+                if len(self._buf) >= 4 + size:
+                    payload = bytes(self._buf[4 : 4 + size])
+                    del self._buf[: 4 + size]
+                    return self._decode(payload)
+            data = self._sock.recv(1 << 16)
+            if not data:
+                raise ConnectionError("career socket server closed the connection")
+            self._buf += data
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self) -> CareerSocketClient:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _results(response: dict[str, Any]) -> list[dict[str, Any]]:
+    if not response.get("ok"):
+        raise CareerSocketError(response.get("code", "ERROR"), response.get("error", ""), response)
+    return response["results"]
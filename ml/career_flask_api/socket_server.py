@@ -0,0 +1,332 @@
+"""
+Optional low-overhead transport for the .NET back end (Linux/macOS): a Unix-domain-socket
+listener taking length-prefixed msgpack frames, scored with the same predictor functions as
+app.py. No TCP, HTTP parsing or per-request Flask validation; one frame can carry many texts.
+Run from this folder, next to (or instead of) app.py:
+
+  python socket_server.py [--path /tmp/career-api.sock] [--workers 2] [--codec msgpack|json]
+
+Each frame is a 4-byte big-endian length followed by one msgpack map (JSON with --codec json):
+
+  request   {"id": 7, "op": "predict", "texts": ["..."], "k": 3, "min_probability": null, "model": null}
+            {"id": 8, "op": "info"}
+  response  {"id": 7, "ok": true, "model": "default", "results": [{"best_career": "...", "recommendations": [...]}]}
+            {"id": 7, "ok": false, "error": "...", "code": "OVERLOADED"}
+
+"results" holds one /recommend-batch row per text (without "index"); k 0 or missing returns
+best_career only. Items that are not strings, or are empty, get inline {"error", "code"} rows.
+Connections are persistent and pipelined: a client may write many frames before reading, and
+answers come back in request order carrying the request's id. Predict frames that arrive
+together with the same k / min_probability / model are scored as one matrix.
+
+  CAREER_SOCKET_PATH       socket path (default /tmp/career-api.sock; --path overrides)
+  CAREER_SOCKET_MAX_FRAME  largest accepted frame in bytes (default 16 MiB)
+
+Model, cache and executor settings are app.py's (CAREER_MODEL_DIR, CAREER_MAX_BATCH,
+CAREER_MODELS, CAREER_MAX_CONCURRENCY, ...). The model is loaded and warmed up before the
+socket is bound, so a successful connect means ready. With --workers N > 1 the loaded process
+forks N workers that accept on the same socket and share the model copy-on-write, like
+gunicorn.conf.py. socket_client.py is the reference client.
+"""
+
+from __future__ import annotations
+
+import os
+
+# As in gunicorn.conf.py: parallelism comes from workers, not BLAS / OpenMP threads.
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import argparse  # noqa: E402
+import gc  # noqa: E402
+import logging  # noqa: E402
+import signal  # noqa: E402
+import socket  # noqa: E402
+import socketserver  # noqa: E402
+import stat  # noqa: E402
+import sys  # noqa: E402
+from typing import Any, Callable  # noqa: E402
+
+import fast_json  # noqa: E402
+import readiness  # noqa: E402
+from inference_engine import UnknownModel, get_engine, route_engine  # noqa: E402
+from inference_executor import Overloaded, executor_from_env  # noqa: E402
+from metrics import METRICS  # noqa: E402
+from model_loader import is_ready, last_load_error, model_version, start_reload_watcher  # noqa: E402
+from predictor import predict_batch  # noqa: E402
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = "/tmp/career-api.sock"
+MAX_FRAME = int(os.environ.get("CAREER_SOCKET_MAX_FRAME", str(16 * 1024 * 1024)))
+# Same limit as /recommend-batch, per frame.
+MAX_BATCH_SIZE = int(os.environ.get("CAREER_MAX_BATCH", "1000"))
+EXECUTOR = executor_from_env()
+
+Encoder = Callable[[Any], bytes]
+Decoder = Callable[[bytes], Any]
+
+
+def codec(name: str) -> tuple[Encoder, Decoder]:
+    """(encode, decode) for "msgpack" (needs the msgpack package) or "json"."""
+    if name == "json":
+        return fast_json.dumps, fast_json.loads
+    try:
+        import msgpack
+    except ImportError:
+        raise RuntimeError("msgpack is not installed: pip install msgpack, or use --codec json") from None
+    return (lambda obj: msgpack.packb(obj, use_bin_type=True)), (lambda data: msgpack.unpackb(data, raw=False))
+
+
+def frame(payload: bytes) -> bytes:
+    return len(payload).to_bytes(4, "big") + payload
+
+
+def split_frames(buf: bytearray, max_frame: int = MAX_FRAME) -> list[bytes]:
+    """Remove and return every complete frame at the start of buf; ValueError if one is too large."""
+    frames = []
+    while len(buf) >= 4:
+        size = int.from_bytes(buf[:4], "big")
+        if size > max_frame:
+            raise ValueError(f"Frame of {size} bytes exceeds the {max_frame}-byte limit.")
+        if len(buf) < 4 + size:
+            break
+        frames.append(bytes(buf[4 : 4 + size]))
+        del buf[: 4 + size]
+    return frames
+
+
+def _error(request_id: Any, message: str, code: str, **extra: Any) -> dict[str, Any]:
+    return {"id": request_id, "ok": False, "error": message, "code": code, **extra}
+
+
+def _validate(req: Any) -> tuple[tuple | None, dict[str, Any] | None]:
+    """((k, min_probability, model) grouping key, None) for a valid predict frame, else (None, error)."""
+    request_id = req.get("id")
+    texts = req.get("texts")
+    if not isinstance(texts, list):
+        return None, _error(request_id, 'Field "texts" must be a list of strings.', "INVALID_FIELD")
+    if not texts:
+        return None, _error(request_id, 'Field "texts" must not be empty.', "EMPTY_BATCH")
+    if len(texts) > MAX_BATCH_SIZE:
+        return None, _error(request_id, f'Field "texts" has {len(texts)} items; maximum is {MAX_BATCH_SIZE}.', "BATCH_TOO_LARGE")
+    k = req.get("k") or None
+    if k is not None and (isinstance(k, bool) or not isinstance(k, int) or k < 0):
+        return None, _error(request_id, 'Field "k" must be a non-negative integer.', "INVALID_FIELD")
+    min_probability = req.get("min_probability")
+    if min_probability is not None and (
+        isinstance(min_probability, bool)
+        or not isinstance(min_probability, (int, float))
+        or not 0.0 <= min_probability <= 1.0
+    ):
+        return None, _error(request_id, 'Field "min_probability" must be a number from 0 to 1.', "INVALID_FIELD")
+    model = req.get("model")
+    if model is not None and not isinstance(model, str):
+        return None, _error(request_id, 'Field "model" must be a string.', "INVALID_FIELD")
+    return (k, float(min_probability) if min_probability is not None else None, model), None
+
+
+def answer(requests: list[Any]) -> list[dict[str, Any]]:
+    """
+    One response per decoded request frame, in order. Valid predict frames with the same
+    (k, min_probability, model) are scored together through EXECUTOR as one matrix.
+    """
+    out: list[dict[str, Any] | None] = [None] * len(requests)
+    groups: dict[tuple, list[int]] = {}
+    for i, req in enumerate(requests):
+        if not isinstance(req, dict):
+            out[i] = _error(None, "Frame must be a map.", "INVALID_FRAME")
+        elif req.get("op") == "info":
+            out[i] = _info(req.get("id"))
+        elif req.get("op", "predict") != "predict":
+            out[i] = _error(req.get("id"), f"Unknown op {req.get('op')!r}.", "UNKNOWN_OP")
+        else:
+            key, error = _validate(req)
+            if error is not None:
+                out[i] = error
+            else:
+                groups.setdefault(key, []).append(i)
+    for (k, min_probability, model), members in groups.items():
+        for i, response in zip(members, _score_group([requests[i] for i in members], k, min_probability, model)):
+            out[i] = response
+    return out  # type: ignore[return-value]
+
+
+def _score_group(reqs: list[dict[str, Any]], k: int | None, min_probability: float | None, model: str | None) -> list[dict[str, Any]]:
+    ids = [r.get("id") for r in reqs]
+    if not is_ready():
+        return [_error(i, last_load_error() or "Model not loaded.", "MODEL_NOT_LOADED") for i in ids]
+    try:
+        engine = route_engine(model)
+    except UnknownModel as e:
+        return [_error(i, str(e), "UNKNOWN_MODEL") for i in ids]
+    except RuntimeError as e:  # unloaded between the check and here
+        return [_error(i, str(e), "MODEL_NOT_LOADED") for i in ids]
+    # Non-string items are answered inline; every other text of the group goes into one matrix.
+    valid = [[j for j, t in enumerate(r["texts"]) if isinstance(t, str)] for r in reqs]
+    texts = [r["texts"][j] for r, js in zip(reqs, valid) for j in js]
+    try:
+        scored = iter(EXECUTOR.run(predict_batch, texts, k, min_probability, engine) if texts else [])
+    except Overloaded as e:
+        return [_error(i, str(e), "OVERLOADED", retry_after=e.retry_after) for i in ids]
+    except RuntimeError as e:
+        logger.exception("Socket prediction failed: %s", e)
+        return [_error(i, str(e), "PREDICTION_ERROR") for i in ids]
+    except Exception:  # noqa: BLE001
+        logger.exception("Unexpected error in socket prediction")
+        return [_error(i, "Internal server error during prediction.", "SERVER_ERROR") for i in ids]
+    responses = []
+    for request_id, r, js in zip(ids, reqs, valid):
+        results: list[dict[str, Any]] = [{"error": "Item must be a string.", "code": "INVALID_FIELD"} for _ in r["texts"]]
+        for j in js:
+            results[j] = next(scored)
+        responses.append({"id": request_id, "ok": True, "model": engine.name, "results": results})
+    return responses
+
+
+def _info(request_id: Any) -> dict[str, Any]:
+    try:
+        engine = get_engine()
+    except RuntimeError as e:
+        return _error(request_id, str(e), "MODEL_NOT_LOADED")
+    return {
+        "id": request_id,
+        "ok": True,
+        "model": engine.name,
+        "model_version": model_version(),
+        "classes": list(engine.bundle.display_classes),
+        "pid": os.getpid(),
+        "executor": EXECUTOR.stats(),
+    }
+
+
+class _Connection(socketserver.BaseRequestHandler):
+    """One persistent client connection: read frames, answer everything that has arrived, repeat."""
+
+    def handle(self) -> None:
+        encode, decode = self.server.codec  # type: ignore[attr-defined]
+        METRICS.bind_route("socket")
+        sock: socket.socket = self.request
+        buf = bytearray()
+        while True:
+            try:
+                data = sock.recv(1 << 16)
+            except OSError:
+                return
+            if not data:
+                return
+            buf += data
+            try:
+                frames = split_frames(buf)
+            except ValueError as e:
+                sock.sendall(frame(encode(_error(None, str(e), "FRAME_TOO_LARGE"))))
+                return  # the stream cannot be resynchronized
+            if not frames:
+                continue
+            requests = []
+            for payload in frames:
+                try:
+                    requests.append(decode(payload))
+                except Exception:  # noqa: BLE001 — any codec error means a malformed frame
+                    requests.append(None)
+            responses = answer(requests)
+            for i, payload in enumerate(requests):
+                if payload is None:
+                    responses[i] = _error(None, "Frame could not be decoded.", "INVALID_FRAME")
+            sock.sendall(b"".join(frame(encode(r)) for r in responses))
+
+
+class SocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A thread per connection; connections are long-lived, like a pooled client's."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, codec_name: str) -> None:
+        self.codec = codec(codec_name)
+        _remove_stale_socket(path)
+        super().__init__(path, _Connection)
+
+
+def _remove_stale_socket(path: str) -> None:
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise RuntimeError(f"{path} exists and is not a socket")
+    os.unlink(path)
+
+
+def _serve_forked(server: SocketServer, workers: int) -> None:
+    """Fork `workers` processes that accept on the already bound socket; stop them on SIGTERM/SIGINT."""
+    gc.collect()
+    gc.freeze()  # keep the model's pages shared (see gunicorn.conf.py)
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            start_reload_watcher()
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def stop(_signum, _frame) -> None:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for pid in children:
+        while True:
+            try:
+                os.waitpid(pid, 0)
+                break
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                break
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve career predictions over a Unix socket (length-prefixed msgpack).")
+    parser.add_argument("--path", default=os.environ.get("CAREER_SOCKET_PATH", DEFAULT_PATH))
+    parser.add_argument("--workers", type=int, default=1, help="forked worker processes (POSIX)")
+    parser.add_argument("--codec", choices=("msgpack", "json"), default="msgpack")
+    args = parser.parse_args()
+
+    codec(args.codec)  # fail before loading the model if msgpack is missing
+    readiness.start(background=False)
+    if is_ready():
+        logger.info("Model artifacts loaded (version %s)", model_version())
+    else:
+        logger.warning("Model not loaded: %s", last_load_error())
+
+    server = SocketServer(args.path, args.codec)
+    logger.info("Listening on %s (%s, %d worker(s))", args.path, args.codec, args.workers)
+    try:
+        if args.workers > 1:
+            _serve_forked(server, args.workers)
+        else:
+            signal.signal(signal.SIGTERM, lambda _signum, _frame: sys.exit(0))  # unlink the socket below
+            start_reload_watcher()
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(args.path)
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+#!/usr/bin/env sh
+# Start the career Flask API in pre-fork production mode (Linux/macOS). Windows: use start-career-api.ps1.
+# Model is loaded once in the gunicorn master and shared copy-on-write by the workers.
+# Tune with HOST, PORT, CAREER_WORKERS, CAREER_THREADS, CAREER_TIMEOUT (see gunicorn.conf.py).
+set -eu
+cd "$(dirname "$0")"
+
+if [ -f .venv/bin/activate ]; then
+    . .venv/bin/activate
+fi
+
+exec gunicorn -c gunicorn.conf.py app:app
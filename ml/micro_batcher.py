@@ -0,0 +1,108 @@
+"""
+Async micro-batching for predict_api: concurrent single-profile requests are queued and scored
+together as one matrix, flushed after `max_delay` seconds or once `max_size` items are waiting.
+The scoring function runs off the event loop (by default in Starlette's threadpool; predict_api
+passes its bounded executor, so each flushed batch takes one of its concurrency slots).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Route each submit() through a shared batch call of `score_batch(items) -> results` (same order)."""
+
+    def __init__(
+        self,
+        score_batch: Callable[[list[T]], list[R]],
+        max_size: int = 32,
+        max_delay: float = 0.003,
+        runner: Callable[[Callable[[list[T]], list[R]], list[T]], Awaitable[list[R]]] = run_in_threadpool,
+    ) -> None:
+        self.score_batch = score_batch
+        # runner(score_batch, items) scores one flushed batch off the event loop.
+        self.runner = runner
+        self.max_size = max(1, int(max_size))
+        self.max_delay = max(0.0, float(max_delay))
+        self._queue: asyncio.Queue[tuple[T, asyncio.Future, float]] | None = None
+        self._worker: asyncio.Task | None = None
+        self._batches = 0
+        self._items = 0
+        self._max_batch = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._size_histogram: dict[int, int] = {}
+
+    async def submit(self, item: T) -> R:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, fut, time.perf_counter()))
+        return await fut
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = time.perf_counter() + self.max_delay
+            while len(batch) < self.max_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple[T, asyncio.Future, float]]) -> None:
+        # Waiters cancelled while queued (deadline passed, client gone) are not scored.
+        batch = [entry for entry in batch if not entry[1].done()]
+        if not batch:
+            return
+        started = time.perf_counter()
+        waits = [started - enq for _, _, enq in batch]
+        self._record(len(batch), waits)
+        try:
+            results = await self.runner(self.score_batch, [item for item, _, _ in batch])
+        except Exception as e:  # noqa: BLE001 — every waiter gets the failure
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut, _), result in zip(batch, results):
+            if not fut.done():  # client may have disconnected / been cancelled
+                fut.set_result(result)
+
+    def _record(self, size: int, waits: list[float]) -> None:
+        self._batches += 1
+        self._items += size
+        self._max_batch = max(self._max_batch, size)
+        self._wait_total += sum(waits)
+        self._wait_max = max(self._wait_max, max(waits))
+        self._size_histogram[size] = self._size_histogram.get(size, 0) + 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": True,
+            "max_size": self.max_size,
+            "max_delay_ms": self.max_delay * 1000,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": (self._items / self._batches) if self._batches else 0.0,
+            "max_batch_size": self._max_batch,
+            "avg_queue_wait_ms": (self._wait_total / self._items * 1000) if self._items else 0.0,
+            "max_queue_wait_ms": self._wait_max * 1000,
+            "batch_size_histogram": dict(sorted(self._size_histogram.items())),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+        }
@@ -14,19 +14,85 @@ Run: uvicorn predict_api:app --host 127.0.0.1 --port 5055
 
 from __future__ import annotations
 
-import json
-import pickle
+import hmac
+import os
+import sys
+import time
 from pathlib import Path
+from typing import AsyncIterator
 
-import joblib
-import numpy as np
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, ValidationError
+from starlette.requests import ClientDisconnect
+
+from micro_batcher import MicroBatcher
+
+# CAREER_ARTIFACTS_DIR overrides the default ml/artifacts/ (e.g. benchmarks on synthetic artifacts).
+ARTIFACTS_DIR = Path(os.environ.get("CAREER_ARTIFACTS_DIR") or Path(__file__).resolve().parent / "artifacts")
+
+# Shared helpers live next to the Flask service (career_flask_api/); make them importable from here.
+sys.path.insert(0, str(Path(__file__).resolve().parent / "career_flask_api"))
+
+import fast_json  # noqa: E402
+import readiness  # noqa: E402
+from inference_engine import (  # noqa: E402
+    MODEL_HEADER,
+    InferenceEngine,
+    Prediction,
+    UnknownModel,
+    get_engine,
+    models_status,
+    prediction_cache,
+    route_engine,
+)
+from inference_executor import (  # noqa: E402
+    TIMEOUT_HEADER,
+    DeadlineExceeded,
+    Overloaded,
+    executor_from_env,
+    request_deadline,
+)
+from metrics import METRICS, cache_samples, executor_samples, model_samples, process_samples  # noqa: E402
+from model_loader import (  # noqa: E402
+    ARTIFACT_FILES,
+    JOBLIB_ARTIFACT_FILES,
+    is_ready,
+    loading,
+    set_artifacts_directory,
+    start_reload_watcher,
+)
+from prediction_cache import MISSING  # noqa: E402
+from request_profiler import PROFILE_HEADER, PROFILE_ID_HEADER, PROFILER, active_session, profiled  # noqa: E402
+
 
-ARTIFACTS_DIR = Path(__file__).resolve().parent / "artifacts"
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by fast_json (orjson when installed); same compact UTF-8 output."""
 
-app = FastAPI(title="Career interest predictor", version="1.1.0")
+    def render(self, content) -> bytes:
+        return fast_json.dumps(content)
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that leaves receive() to the endpoint, so the body iterator can still read
+    the request body while results go out. Starlette otherwise listens for a disconnect on
+    receive() alongside the stream (ASGI spec < 2.4) and would swallow the body messages; here a
+    disconnect surfaces as ClientDisconnect from request.stream() or as a failed send.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except ClientDisconnect:
+            pass  # the client left while its body was still being read; nobody to answer
+        except OSError:
+            raise ClientDisconnect() from None
+
+
+app = FastAPI(title="Career interest predictor", version="1.1.0", default_response_class=FastJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -38,68 +104,109 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[MODEL_HEADER, PROFILE_ID_HEADER],
 )
 
-_vectorizer = None
-_model = None
-_label_encoder = None
-_classes: list[str] | None = None
-_artifact_format: str = "none"
+# predict_api answers errors with {"detail"} only, so the Flask API's "code" for career_errors_total
+# is set where the error is raised (_http_error and the exception handlers put it in
+# request.state.error_code). These cover the errors FastAPI raises on its own.
+_ERROR_CODES = {
+    404: "NOT_FOUND",
+    405: "METHOD_NOT_ALLOWED",
+    422: "VALIDATION_ERROR",
+    500: "SERVER_ERROR",
+}
+
+
+class _RequestMetrics:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware task hop): route latency, status and error code,
+    and the request's profile session when it is profiled (request_profiler.py).
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self._routes: set[str] | None = None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self._routes is None:
+            self._routes = {getattr(r, "path", "") for r in app.routes}
+        route = scope["path"] if scope["path"] in self._routes else "unmatched"
+        METRICS.bind_route(route)
+        started = time.perf_counter()
+        status = 500
+        state = scope.setdefault("state", {})  # request.state: the raise site's error_code
+        session = None
+        if PROFILER.enabled:
+            header = dict(scope["headers"]).get(PROFILE_HEADER.lower().encode())
+            session = PROFILER.start(route, scope["method"], header.decode("latin-1") if header else None)
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if session is not None:
+                    profile_id = (PROFILE_ID_HEADER.lower().encode(), session.id.encode())
+                    message["headers"] = [*message.get("headers", []), profile_id]
+            await send(message)
 
-
-def _load_pickle_or_joblib(path: Path):
-    """Colab often uses joblib.dump(..., '.pkl') — pickle.load fails; joblib.load works."""
-    with open(path, "rb") as f:
         try:
-            return pickle.load(f)
-        except Exception:
-            f.seek(0)
-            return joblib.load(f)
+            await self.app(scope, receive, send_with_status)
+        finally:
+            code = None
+            if status >= 400:
+                code = state.get("error_code") or _ERROR_CODES.get(status, f"HTTP_{status}")
+            METRICS.record_request(route, scope["method"], status, time.perf_counter() - started, code)
+            if session is not None:
+                PROFILER.finish(session, status)
 
 
-def _load_artifacts() -> None:
-    global _vectorizer, _model, _label_encoder, _classes, _artifact_format
-    _vectorizer = _model = _label_encoder = None
-    _classes = None
-    _artifact_format = "none"
+app.add_middleware(_RequestMetrics)
 
-    cls_path = ARTIFACTS_DIR / "classes.json"
+# Artifact loading, caching and scoring live in career_flask_api/ (model_loader.py and
+# inference_engine.py), shared with the Flask service; this module only maps HTTP <-> engine.
+# Loading starts in the startup event, once, on a background thread (see readiness.py).
+set_artifacts_directory(ARTIFACTS_DIR)
+
+# Bounds concurrent predictions per process (see inference_executor.py); excess requests get 429.
+_executor = executor_from_env()
+
+
+def _http_error(request: Request, status_code: int, code: str, detail: str) -> HTTPException:
+    """HTTPException counted in career_errors_total under `code` (the Flask API's "code" for the same error)."""
+    request.state.error_code = code
+    return HTTPException(status_code=status_code, detail=detail)
 
-    # A) Pickle bundle (matches Downloads/untitled5.py Colab export)
-    vp = ARTIFACTS_DIR / "vectorizer.pkl"
-    mp = ARTIFACTS_DIR / "career_model.pkl"
-    lep = ARTIFACTS_DIR / "label_encoder.pkl"
-    if vp.is_file() and mp.is_file() and lep.is_file():
-        try:
-            _vectorizer = _load_pickle_or_joblib(vp)
-            _model = _load_pickle_or_joblib(mp)
-            _label_encoder = _load_pickle_or_joblib(lep)
-            _artifact_format = "pickle_colab"
-        except Exception:
-            _vectorizer = _model = _label_encoder = None
-            _artifact_format = "none"
 
-    # B) Joblib bundle (if .pkl trio missing or failed to load)
-    if _label_encoder is None:
-        v_path = ARTIFACTS_DIR / "tfidf_vectorizer.joblib"
-        m_path = ARTIFACTS_DIR / "interest_xgb_model.joblib"
-        le_path = ARTIFACTS_DIR / "target_label_encoder.joblib"
-        if v_path.is_file() and m_path.is_file() and le_path.is_file():
-            _vectorizer = joblib.load(v_path)
-            _model = joblib.load(m_path)
-            _label_encoder = joblib.load(le_path)
-            _artifact_format = "joblib"
+@app.exception_handler(Overloaded)
+async def _overloaded(request: Request, e: Overloaded) -> JSONResponse:
+    request.state.error_code = "OVERLOADED"
+    return JSONResponse(status_code=429, content={"detail": str(e)}, headers={"Retry-After": str(e.retry_after)})
 
-    if _label_encoder is None:
-        return
 
-    if cls_path.is_file():
-        _classes = json.loads(cls_path.read_text(encoding="utf-8"))
-    else:
-        _classes = list(getattr(_label_encoder, "classes_", []) or [])
+@app.exception_handler(DeadlineExceeded)
+async def _deadline_exceeded(request: Request, e: DeadlineExceeded) -> JSONResponse:
+    request.state.error_code = "DEADLINE_EXCEEDED"
+    return JSONResponse(status_code=504, content={"detail": str(e)})
 
 
-_load_artifacts()
+@app.exception_handler(UnknownModel)
+async def _unknown_model(request: Request, e: UnknownModel) -> JSONResponse:
+    request.state.error_code = "UNKNOWN_MODEL"
+    return JSONResponse(status_code=404, content={"detail": str(e)})
+
+
+# Profiles scored (and written out) at a time by /predict/batch/stream.
+STREAM_CHUNK_SIZE = int(os.environ.get("CAREER_STREAM_CHUNK", "256"))
+# Same limit as the Flask /recommend-batch and the socket server; /predict/batch/stream has none.
+MAX_BATCH_SIZE = int(os.environ.get("CAREER_MAX_BATCH", "1000"))
+NDJSON = "application/x-ndjson"
+
+# /health "artifact_format" per model_loader source.
+_ARTIFACT_FORMATS = {"pickle": "pickle_colab", "fastload": "pickle_colab_fastload", "joblib": "joblib"}
 
 
 class PredictBody(BaseModel):
@@ -127,8 +234,26 @@ class PredictBody(BaseModel):
     )
     top_k: int | None = Field(
         default=None,
-        description="If set (e.g. 3) and model supports predict_proba, return top_predictions",
+        description="If set (e.g. 3), return top_predictions (without predict_proba: when the model can be ranked, see fallback_ranking.py)",
     )
+    min_probability: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="With top_k: leave out top_predictions below this probability",
+    )
+
+
+class PredictBatchBody(BaseModel):
+    """Many PredictBody rows scored as one matrix; each row keeps its own top_k / min_probability."""
+
+    items: list[PredictBody] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+
+
+class PredictStreamBody(BaseModel):
+    """A JSON /predict/batch/stream body: PredictBatchBody without the size limit (scored chunk by chunk)."""
+
+    items: list[PredictBody] = Field(default_factory=list)
 
 
 def _combined_text(b: PredictBody) -> str:
@@ -142,70 +267,341 @@ def _combined_text(b: PredictBody) -> str:
     return " ".join(p for p in parts if p).lower()
 
 
+def _require_model(request: Request, pick=route_engine) -> InferenceEngine:
+    """
+    Engine for this request: the X-Career-Model header's model, else one picked by CAREER_MODELS
+    weight (UnknownModel -> 404); pick=get_engine takes the primary instead. Routes echo its
+    name in the response's X-Career-Model header.
+    """
+    try:
+        engine = pick(request.headers.get(MODEL_HEADER))
+    except RuntimeError as e:
+        if loading():
+            raise _http_error(request, 503, "NOT_READY", str(e)) from None
+        raise _http_error(
+            request,
+            503,
+            "MODEL_NOT_LOADED",
+            "Model files missing. Place EITHER pickle files (vectorizer.pkl, career_model.pkl, label_encoder.pkl) "
+            "OR joblib files in ml/artifacts/ — see ml/HOWTO-USE-MODEL.md",
+        ) from None
+    return engine
+
+
+def _lean(request: Request) -> dict[str, str] | None:
+    """
+    Response headers for a lean response (no "classes"; fetch them once from GET /classes), or
+    None for a full one. Asked for with ?lean=1 or a "Prefer: return=minimal" header.
+    """
+    if "return=minimal" in request.headers.get("prefer", "").replace(" ", ""):
+        return {"Preference-Applied": "return=minimal"}
+    if request.query_params.get("lean", "").lower() in ("1", "true", "yes"):
+        return {}
+    return None
+
+
+def _json_response(engine: InferenceEngine, payload: dict, request: Request) -> FastJSONResponse:
+    """Prediction payload (plus "classes" unless lean) serialized directly, skipping jsonable_encoder."""
+    headers = _lean(request)
+    if headers is None:
+        payload["classes"] = engine.bundle.display_classes
+        headers = {}
+    headers[MODEL_HEADER] = engine.name
+    return FastJSONResponse(payload, headers=headers)
+
+
+def _top_k(body: PredictBody) -> int | None:
+    """top_predictions are returned for top_k > 1 only."""
+    return body.top_k if body.top_k is not None and body.top_k > 1 else None
+
+
+def _response(pred: Prediction) -> dict:
+    out: dict = {"predicted_category": pred.label, "label_index": pred.label_value}
+    if pred.top is not None:
+        out["top_predictions"] = [{"label": label, "probability": p} for label, p in pred.top]
+    return out
+
+
 @app.on_event("startup")
 def startup() -> None:
-    _load_artifacts()
+    readiness.start()
+    start_reload_watcher()
+
+
+@app.get("/livez")
+def livez() -> dict:
+    """Liveness: the process answers. No model work, so it stays fast while artifacts load."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readyz(request: Request):
+    """Readiness: 200 once the artifacts are loaded and warmed up, else 503 (never blocks)."""
+    readiness.start()  # no-op once started
+    status = readiness.status()
+    if not status["ready"]:
+        request.state.error_code = "NOT_READY"
+        detail = status["error"] or f"Model is {status['phase'].replace('_', ' ')}."
+        return JSONResponse(status_code=503, content={"detail": detail, **status})
+    return status
 
 
 @app.get("/health")
 def health() -> dict:
-    ok = _vectorizer is not None and _model is not None and _label_encoder is not None
+    try:
+        engine = get_engine()
+    except RuntimeError:
+        engine = None
+    bundle = engine.bundle if engine is not None else None
     return {
-        "ok": ok,
-        "artifact_format": _artifact_format,
+        "ok": bundle is not None,
+        "artifact_format": _ARTIFACT_FORMATS.get(bundle.source, bundle.source) if bundle else "none",
         "artifacts_dir": str(ARTIFACTS_DIR),
-        "expected_pickle": ["vectorizer.pkl", "career_model.pkl", "label_encoder.pkl"],
-        "expected_joblib": [
-            "tfidf_vectorizer.joblib",
-            "interest_xgb_model.joblib",
-            "target_label_encoder.joblib",
-        ],
-        "classes": _classes or (list(_label_encoder.classes_) if _label_encoder else []),
+        "expected_pickle": list(ARTIFACT_FILES),
+        "expected_joblib": list(JOBLIB_ARTIFACT_FILES),
+        "classes": bundle.display_classes if bundle else [],
+        "model_version": bundle.version if bundle else None,
+        "json_backend": fast_json.BACKEND,
+        "compiled_scorer": bundle.scorer_note if bundle else None,
+        "fallback_ranking": bundle.ranker_note if bundle else None,
+        "fast_tfidf": bundle.transformer_note if bundle else None,
+        "compaction": bundle.compaction_note if bundle else None,
+        "cache": prediction_cache().stats(),
+        "microbatch": _batcher.stats() if _batcher is not None else {"enabled": False},
+        "executor": _executor.stats(),
+        "models": models_status(),
+        "profiling": PROFILER.stats(),
     }
 
 
-@app.post("/predict/json")
-def predict_json(body: PredictBody) -> dict:
-    if _vectorizer is None or _model is None or _label_encoder is None:
-        raise HTTPException(
-            status_code=503,
-            detail=(
-                "Model files missing. Place EITHER pickle files (vectorizer.pkl, career_model.pkl, label_encoder.pkl) "
-                "OR joblib files in ml/artifacts/ — see ml/HOWTO-USE-MODEL.md"
-            ),
+def _score_micro_batch(
+    items: list[tuple[InferenceEngine, str, int | None, float | None]],
+) -> list[Prediction | None]:
+    """MicroBatcher callback: queued requests scored as one matrix per routed model (all cache misses)."""
+    results: list[Prediction | None] = [None] * len(items)
+    for engine in dict.fromkeys(item[0] for item in items):
+        rows = [i for i, item in enumerate(items) if item[0] is engine]
+        preds = engine.predict_uncached(
+            [items[i][1] for i in rows], [items[i][2] for i in rows], [items[i][3] for i in rows]
         )
+        for i, pred in zip(rows, preds):
+            results[i] = pred
+    return results
+
+
+_batcher: MicroBatcher | None = None
+if os.environ.get("CAREER_MICROBATCH", "").lower() in ("1", "true", "yes"):
+    _batcher = MicroBatcher(
+        _score_micro_batch,
+        max_size=int(os.environ.get("CAREER_MICROBATCH_MAX_SIZE", "32")),
+        max_delay=float(os.environ.get("CAREER_MICROBATCH_MAX_DELAY_MS", "3")) / 1000,
+        # Its requests are admitted one by one (await_admitted); each flushed batch takes a slot.
+        runner=_executor.run_admitted_async,
+    )
+
+
+def _require_admin(request: Request) -> None:
+    """403 unless CAREER_ADMIN_TOKEN is set, 401 unless the X-Admin-Token header matches it."""
+    token = os.environ.get("CAREER_ADMIN_TOKEN", "")
+    if not token:
+        raise _http_error(request, 403, "ADMIN_DISABLED", "Set CAREER_ADMIN_TOKEN to enable admin endpoints.")
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token):
+        raise _http_error(request, 401, "UNAUTHORIZED", "Invalid admin token.")
+
+
+@app.get("/admin/profiles")
+def admin_profiles(request: Request, limit: int = Query(50, ge=0)) -> dict:
+    """Newest request profiles with durations and hottest functions (see request_profiler.py)."""
+    _require_admin(request)
+    return {**PROFILER.stats(), "profiles": PROFILER.index(limit)}
+
+
+@app.get("/classes")
+def classes(request: Request) -> Response:
+    """
+    Display class names of the primary model (or the X-Career-Model header's), with an ETag:
+    clients revalidate with If-None-Match and get 304 until a reload changes the classes.
+    """
+    engine = _require_model(request, pick=get_engine)
+    body, tag = engine.classes_document()
+    headers = {"ETag": tag, "Cache-Control": "no-cache", "Vary": MODEL_HEADER, MODEL_HEADER: engine.name}
+    if fast_json.etag_matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Prometheus text format: per-route / per-stage latency, error codes, model load info."""
+    loaded = is_ready()
+    samples = process_samples() + cache_samples(prediction_cache().stats()) + executor_samples(_executor.stats())
+    samples += model_samples(models_status())
+    samples.append(("model_loaded", "gauge", "1 if model artifacts are loaded.", 1 if loaded else 0, {}))
+    if loaded:
+        bundle = get_engine().bundle
+        samples += [
+            (
+                "model_info",
+                "gauge",
+                "Loaded artifact version and inference backends.",
+                1,
+                {
+                    "version": bundle.version,
+                    "source": _ARTIFACT_FORMATS.get(bundle.source, bundle.source),
+                    "compiled_scorer": bundle.scorer_note or "",
+                    "fast_tfidf": bundle.transformer_note or "",
+                },
+            ),
+            ("model_load_duration_seconds", "gauge", "Time to load the current artifacts.", bundle.load_seconds, {}),
+            ("model_loaded_timestamp_seconds", "gauge", "Unix time the current artifacts were loaded.", bundle.loaded_at, {}),
+        ]
+    if _batcher is not None:
+        stats = _batcher.stats()
+        samples += [
+            ("microbatch_batches_total", "counter", "Micro-batches scored.", stats["batches"], {}),
+            ("microbatch_items_total", "counter", "Requests scored through micro-batches.", stats["items"], {}),
+            ("microbatch_queue_depth", "gauge", "Requests waiting for the next micro-batch.", stats["queue_depth"], {}),
+        ]
+    return PlainTextResponse(METRICS.render(samples), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/predict/json")
+async def predict_json(body: PredictBody, request: Request) -> FastJSONResponse:
+    engine = _require_model(request)
     text = _combined_text(body)
     if not text.strip():
-        raise HTTPException(status_code=400, detail="Provide at least one non-empty text field.")
-
-    X = _vectorizer.transform([text])
-    pred = _model.predict(X)
-    idx = int(pred[0])
+        raise _http_error(request, 400, "EMPTY_TEXT", "Provide at least one non-empty text field.")
+
+    k = _top_k(body)
+    pred = engine.cached(text, k, body.min_probability)
+    if pred is MISSING:
+        # Cache hits above skip the executor; misses are admitted (or shed with 429) here.
+        deadline = request_deadline(request.headers.get(TIMEOUT_HEADER), None)
+        if _batcher is not None and active_session() is None:
+            pred = await _executor.await_admitted(_batcher.submit((engine, text, k, body.min_probability)), deadline)
+        else:
+            # A profiled request is scored on its own, so the profile holds only its work.
+            preds = await _executor.run_async(
+                profiled(engine.predict_uncached), [text], k, body.min_probability, deadline=deadline
+            )
+            pred = preds[0]
+    return _json_response(engine, _response(pred), request)
+
+
+@app.post("/predict/batch")
+def predict_batch(body: PredictBatchBody, request: Request) -> FastJSONResponse:
+    """
+    Score many profiles with one transform and (when available) one predict_proba.
+    The argmax label and each row's top_k both come from that single probability matrix;
+    rows already in the prediction cache are not re-scored.
+    """
+    engine = _require_model(request)
+    texts = [_combined_text(b) for b in body.items]
+    preds = _executor.run(
+        profiled(engine.predict_batch),
+        texts,
+        [_top_k(b) for b in body.items],
+        [b.min_probability for b in body.items],
+        deadline=request_deadline(request.headers.get(TIMEOUT_HEADER), None),
+    )
+    results = [
+        _response(pred) if pred is not None else {"error": "Provide at least one non-empty text field."}
+        for pred in preds
+    ]
+    return _json_response(engine, {"results": results}, request)
+
+
+@app.post("/predict/batch/stream")
+async def predict_batch_stream(request: Request) -> StreamingResponse:
+    """
+    /predict/batch answered as NDJSON: one {"index", ...} line per profile, written chunk by chunk
+    (STREAM_CHUNK_SIZE profiles, one matrix each) as soon as it is scored; no "classes" (see
+    /classes). An application/x-ndjson body (one PredictBody object per line) is parsed line by
+    line while the results go out, with invalid lines answered inline, so the first result and
+    peak memory do not depend on the batch size. A JSON {"items": [...]} body is read in full.
+    """
+    engine = _require_model(request)  # one engine for the whole stream, also across a reload
+    if request.headers.get("content-type", "").split(";")[0].strip() == NDJSON:
+        lines = _stream_results(engine, _ndjson_profiles(request))
+        await lines.__anext__()  # admission: a 429 must go out before the 200 headers do
+        return _DuplexStreamingResponse(lines, media_type=NDJSON, headers={MODEL_HEADER: engine.name})
     try:
-        label = _label_encoder.inverse_transform(np.asarray(pred).ravel())[0]
-    except Exception:
-        label = str(idx)
-
-    out: dict = {
-        "predicted_category": str(label),
-        "label_index": idx,
-        "classes": _classes or list(_label_encoder.classes_),
-    }
+        body = PredictStreamBody.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors()) from None
+    lines = _stream_results(engine, _iterate(body.items))
+    await lines.__anext__()  # admission: a 429 must go out before the 200 headers do
+    return StreamingResponse(lines, media_type=NDJSON, headers={MODEL_HEADER: engine.name})
 
-    k = body.top_k
-    if k is not None and k > 1 and hasattr(_model, "predict_proba"):
-        try:
-            probs = _model.predict_proba(X)[0]
-            order = np.argsort(probs)[-k:][::-1]
-            top = []
-            for i in order:
-                try:
-                    lab = _label_encoder.inverse_transform(np.array([int(i)]).ravel())[0]
-                except Exception:
-                    lab = str(int(i))
-                top.append({"label": str(lab), "probability": float(probs[int(i)])})
-            out["top_predictions"] = top
-        except Exception:
-            pass
 
-    return out
+async def _iterate(items: list[PredictBody]) -> AsyncIterator[PredictBody]:
+    for item in items:
+        yield item
+
+
+async def _ndjson_profiles(request: Request) -> AsyncIterator[PredictBody | dict]:
+    """PredictBody per NDJSON line as the body arrives; invalid lines become inline {"error"}."""
+    pending = b""
+    async for data in request.stream():
+        *complete, pending = (pending + data).split(b"\n")
+        for line in complete:
+            if line.strip():
+                yield _parse_profile(line)
+    if pending.strip():
+        yield _parse_profile(pending)
+
+
+def _parse_profile(line: bytes) -> PredictBody | dict:
+    try:
+        return PredictBody.model_validate_json(line)
+    except ValidationError:
+        return {"error": "Line is not a valid profile object."}
+
+
+async def _stream_results(engine: InferenceEngine, items: AsyncIterator[PredictBody | dict]) -> AsyncIterator[bytes]:
+    """
+    NDJSON result lines per chunk. The stream holds one executor admission while open and takes
+    a slot per chunk; the first, empty yield is admission.
+    """
+    with _executor.admit():
+        yield b""
+        index = 0
+        chunk: list[PredictBody | dict] = []
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) < STREAM_CHUNK_SIZE:
+                continue
+            yield await _score_chunk(engine, chunk, index)
+            index += len(chunk)
+            chunk = []
+        if chunk:
+            yield await _score_chunk(engine, chunk, index)
+
+
+async def _score_chunk(engine: InferenceEngine, chunk: list[PredictBody | dict], start: int) -> bytes:
+    """
+    One NDJSON line per item of the chunk. If scoring fails, each of its profiles gets an error
+    line instead (the 200 is already out), so there is always one line per input.
+    """
+    profiles = [b for b in chunk if isinstance(b, PredictBody)]
+    results: list[dict] = []
+    if profiles:
+        try:
+            preds = await _executor.run_admitted_async(
+                profiled(engine.predict_batch),
+                [_combined_text(b) for b in profiles],
+                [_top_k(b) for b in profiles],
+                [b.min_probability for b in profiles],
+            )
+            results = [
+                _response(p) if p is not None else {"error": "Provide at least one non-empty text field."}
+                for p in preds
+            ]
+        except Exception as e:  # noqa: BLE001
+            results = [{"error": f"Prediction failed: {e}"}] * len(profiles)
+    scored = iter(results)
+    out = [
+        fast_json.dumps({"index": i, **(next(scored) if isinstance(item, PredictBody) else item)})
+        for i, item in enumerate(chunk, start)
+    ]
+    return b"\n".join(out) + b"\n"
@@ -0,0 +1,17 @@
+"""
+Shared setup for the ml/ tests: ml/ itself (predict_api.py, micro_batcher.py), and
+career_flask_api/ and benchmarks/, which use flat imports, go on sys.path the same way the
+benchmark scripts and ../predict_api.py add them.
+
+  cd ml && python -m pytest tests
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ML_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ML_DIR))
+for sub in ("career_flask_api", "benchmarks"):
+    sys.path.insert(0, str(ML_DIR / sub))
@@ -0,0 +1,49 @@
+"""
+Request metrics of the Flask app for a streamed response: the latency must cover the whole body,
+not only the time until the route returned its generator.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import model_loader
+import readiness
+from synthetic_artifacts import write_synthetic_artifacts
+
+
+def test_streamed_request_latency_covers_the_body(tmp_path, monkeypatch) -> None:
+    for name, value in (("_started_at", None), ("_ready_at", None), ("_thread", None)):
+        monkeypatch.setattr(readiness, name, value)
+    monkeypatch.setattr(model_loader, "_models", None)
+    monkeypatch.setattr(model_loader, "_load_error", None)
+    monkeypatch.setattr(model_loader, "_load_begun", False)
+    monkeypatch.setattr(model_loader, "_load_done", threading.Event())
+    monkeypatch.setenv("CAREER_WARMUP", "0")
+    monkeypatch.setattr(model_loader, "_dir_override", write_synthetic_artifacts(tmp_path / "lr", "lr", 4, docs_per_class=20))
+
+    import app as flask_app
+    import inference_engine
+
+    readiness.start(background=False)
+    predict_batch = inference_engine.InferenceEngine.predict_batch
+
+    def slow_predict_batch(self, *args, **kwargs):
+        time.sleep(0.2)
+        return predict_batch(self, *args, **kwargs)
+
+    monkeypatch.setattr(inference_engine.InferenceEngine, "predict_batch", slow_predict_batch)
+    recorded: list[tuple[str, int, float]] = []
+    monkeypatch.setattr(
+        flask_app.METRICS,
+        "record_request",
+        lambda route, method, status, seconds, code=None: recorded.append((route, status, seconds)),
+    )
+
+    with flask_app.app.test_client().post("/recommend-batch/stream", json={"texts": ["python", "sql"]}) as r:
+        assert r.status_code == 200
+        assert recorded == []  # headers are out, the body is not
+        assert len(r.get_data(as_text=True).splitlines()) == 2
+    assert [(route, status) for route, status, _ in recorded] == [("/recommend-batch/stream", 200)]
+    assert recorded[0][2] >= 0.2
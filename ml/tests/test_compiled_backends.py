@@ -0,0 +1,106 @@
+"""
+The compiled TF-IDF transform (fast_tfidf.py) and scorers (compiled_scorer.py) against the
+sklearn / XGBoost objects they replace, on synthetic artifacts and texts the load-time parity
+checks never see. A backend that silently falls back to the slow path fails here too.
+"""
+
+from __future__ import annotations
+
+import pickle
+
+import numpy as np
+import pytest
+
+from compiled_scorer import build_scorer
+from fast_tfidf import compile_vectorizer
+from synthetic_artifacts import synthetic_profiles, write_synthetic_artifacts
+
+N_CLASSES = 8
+SCORER_KINDS = {"lr": "linear", "rf": "forest", "xgb": "xgboost"}
+
+# Unseen profiles (another seed) plus text the tokenizer has to normalize.
+TEXTS = synthetic_profiles(200, N_CLASSES, seed=99)[0] + [
+    "",
+    "   ",
+    "Python, SQL & Machine-Learning!! python python",
+    "Café résumé naïve — DATA   science\tand\nanalytics",
+    "a b c 1 22 333",
+    "unknownword anotherunknownword",
+]
+
+
+@pytest.fixture(scope="module", params=list(SCORER_KINDS))
+def artifacts(request, tmp_path_factory) -> tuple[str, object, object]:
+    kind = request.param
+    if kind == "xgb":
+        pytest.importorskip("xgboost")
+    out = write_synthetic_artifacts(tmp_path_factory.mktemp(kind), kind, N_CLASSES, docs_per_class=40, seed=0)
+    with open(out / "vectorizer.pkl", "rb") as f:
+        vectorizer = pickle.load(f)
+    with open(out / "career_model.pkl", "rb") as f:
+        model = pickle.load(f)
+    return kind, vectorizer, model
+
+
+@pytest.fixture(autouse=True)
+def _backends_enabled(monkeypatch) -> None:
+    monkeypatch.delenv("CAREER_FAST_TFIDF", raising=False)
+    monkeypatch.delenv("CAREER_COMPILED_SCORER", raising=False)
+
+
+def test_compiled_tfidf_is_bit_identical(artifacts) -> None:
+    _, vectorizer, _ = artifacts
+    compiled, note = compile_vectorizer(vectorizer)
+    assert compiled is not None, note
+    assert note == "compiled"
+
+    expected = vectorizer.transform(TEXTS)
+    expected.sort_indices()
+    got = compiled.transform(TEXTS)
+    assert got.shape == expected.shape
+    assert got.data.dtype == expected.data.dtype
+    assert got.data.tobytes() == expected.data.tobytes()
+    np.testing.assert_array_equal(got.indices, expected.indices)
+    np.testing.assert_array_equal(got.indptr, expected.indptr)
+
+
+def test_compiled_tfidf_one_text_at_a_time(artifacts) -> None:
+    _, vectorizer, _ = artifacts
+    compiled, _ = compile_vectorizer(vectorizer)
+    for text in TEXTS[:20] + TEXTS[-6:]:
+        expected = vectorizer.transform([text])
+        expected.sort_indices()
+        got = compiled.transform([text])
+        assert got.data.tobytes() == expected.data.tobytes(), text
+        np.testing.assert_array_equal(got.indices, expected.indices)
+
+
+def test_compiled_scorer_matches_model(artifacts) -> None:
+    kind, vectorizer, model = artifacts
+    scorer, note = build_scorer(model, vectorizer)
+    assert scorer is not None, note
+    assert note == SCORER_KINDS[kind]
+
+    X = vectorizer.transform(TEXTS)
+    expected = np.asarray(model.predict_proba(X))
+    got = scorer.predict_proba(X)
+    assert got.shape == expected.shape
+    np.testing.assert_array_equal(got.argmax(axis=1), expected.argmax(axis=1))
+    np.testing.assert_allclose(got, expected, rtol=0, atol=1e-6)
+
+
+def test_compiled_scorer_on_compiled_tfidf(artifacts) -> None:
+    """The serving path: compiled transform feeding the compiled scorer."""
+    _, vectorizer, model = artifacts
+    compiled, _ = compile_vectorizer(vectorizer)
+    scorer, _ = build_scorer(model, vectorizer)
+    expected = np.asarray(model.predict_proba(vectorizer.transform(TEXTS)))
+    np.testing.assert_allclose(scorer.predict_proba(compiled.transform(TEXTS)), expected, rtol=0, atol=1e-6)
+
+
+def test_backends_can_be_disabled(artifacts, monkeypatch) -> None:
+    _, vectorizer, model = artifacts
+    monkeypatch.setenv("CAREER_FAST_TFIDF", "0")
+    monkeypatch.setenv("CAREER_COMPILED_SCORER", "0")
+    assert compile_vectorizer(vectorizer) == (None, "disabled")
+    assert build_scorer(model, vectorizer) == (None, "disabled")
@@ -0,0 +1,82 @@
+"""
+fast_artifacts.convert() on synthetic artifacts: the cache holds flat .npy arrays (memory-mapped
+on load) and a bundle loaded from it predicts like one loaded from the .pkl files.
+"""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+import model_loader
+from compiled_scorer import FlatForestClassifier
+from fast_artifacts import convert
+from synthetic_artifacts import synthetic_profiles, write_synthetic_artifacts
+
+N_CLASSES = 6
+TEXTS = synthetic_profiles(60, N_CLASSES, seed=7)[0] + ["", "python sql"]
+
+
+@pytest.fixture(params=["lr", "rf", "xgb"])
+def converted(request, tmp_path, monkeypatch):
+    if request.param == "xgb":
+        pytest.importorskip("xgboost")
+    monkeypatch.delenv("CAREER_FASTLOAD", raising=False)
+    monkeypatch.delenv("CAREER_COMPACT_FLOAT32", raising=False)
+    base = write_synthetic_artifacts(tmp_path / request.param, request.param, N_CLASSES, docs_per_class=30)
+    target, _ = convert(base)
+    return request.param, base, target
+
+
+def _probabilities(base, monkeypatch, fastload: str) -> tuple[str, np.ndarray]:
+    monkeypatch.setenv("CAREER_FASTLOAD", fastload)
+    bundle = model_loader._read_bundle(base)
+    X = bundle.transformer.transform(TEXTS) if bundle.transformer else bundle.vectorizer.transform(TEXTS)
+    scorer = bundle.scorer or bundle.model
+    return bundle.source, np.asarray(scorer.predict_proba(X))
+
+
+def test_cache_layout(converted) -> None:
+    kind, base, target = converted
+    manifest = json.loads((target.parent / "current.json").read_text(encoding="utf-8"))
+    assert manifest["format"] == model_loader.FASTLOAD_FORMAT
+    assert model_loader.fresh_fastload_dir(base) == target
+
+    vectorizer, model, _ = model_loader.load_fastload_trio(target)
+    assert isinstance(vectorizer.vocabulary_, dict) and vectorizer.vocabulary_
+    idf = vectorizer.idf_
+    assert idf.dtype == np.float64 and isinstance(idf.base, np.memmap)  # float32 is opt-in
+    if kind == "rf":
+        assert isinstance(model, FlatForestClassifier)
+        assert isinstance(model.scorer.value.base, np.memmap)
+    if kind == "lr":
+        assert isinstance(model.coef_.base, np.memmap)
+
+
+def test_fastload_bundle_matches_pickle(converted, monkeypatch) -> None:
+    _, base, _ = converted
+    source, fast = _probabilities(base, monkeypatch, "1")
+    assert source == "fastload"
+    source, slow = _probabilities(base, monkeypatch, "0")
+    assert source == "pickle"
+    np.testing.assert_array_equal(fast.argmax(axis=1), slow.argmax(axis=1))
+    np.testing.assert_allclose(fast, slow, rtol=0, atol=1e-6)
+
+
+def test_float32_idf_is_opt_in(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("CAREER_COMPACT_FLOAT32", "1")
+    base = write_synthetic_artifacts(tmp_path / "lr", "lr", N_CLASSES, docs_per_class=30)
+    target, report = convert(base)
+    assert "idf float32" in report.applied
+    manifest = json.loads((target.parent / "current.json").read_text(encoding="utf-8"))
+    assert manifest["idf_dtype"] == "float32"
+    assert "synthetic" in manifest["compaction"]["check_corpus"]
+
+
+def test_stale_cache_is_ignored(converted) -> None:
+    _, base, _ = converted
+    pickled = model_loader.artifact_paths(base)[1]
+    pickled.write_bytes(pickled.read_bytes())  # same bytes, new mtime
+    assert model_loader.fresh_fastload_dir(base) is None
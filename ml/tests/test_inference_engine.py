@@ -0,0 +1,31 @@
+"""
+InferenceEngine with the process-wide prediction cache shared by several models.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+
+import model_loader
+from inference_engine import InferenceEngine
+from prediction_cache import PredictionCache
+from synthetic_artifacts import synthetic_profiles, write_synthetic_artifacts
+
+
+def test_models_with_the_same_fingerprint_do_not_share_cache_entries(tmp_path, monkeypatch) -> None:
+    """Copied model directories can fingerprint alike; one model's cached answer must not serve the other."""
+    monkeypatch.setenv("CAREER_FASTLOAD", "0")
+    bundles = [
+        dataclasses.replace(model_loader._read_bundle(write_synthetic_artifacts(tmp_path / name, "lr", n)), version="same")
+        for name, n in (("a", 4), ("b", 6))
+    ]
+    cache = PredictionCache(100)
+    a, b = (InferenceEngine(bundle, cache, name) for bundle, name in zip(bundles, ("a", "b")))
+    texts = synthetic_profiles(5, 6, seed=3)[0]
+
+    from_a = a.predict_batch(texts, 3)
+    from_b = b.predict_batch(texts, 3)
+    assert from_b == InferenceEngine(bundles[1]).predict_batch(texts, 3)
+    assert from_b != from_a
+    assert cache.hits == 0
+    assert b.predict_batch(texts, 3) == from_b and cache.hits == len(texts)
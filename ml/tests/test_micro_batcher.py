@@ -0,0 +1,63 @@
+"""
+MicroBatcher flushing through the bounded InferenceExecutor, as predict_api wires it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from inference_executor import InferenceExecutor, Overloaded
+from micro_batcher import MicroBatcher
+
+
+def test_flushed_batch_takes_an_executor_slot() -> None:
+    executor = InferenceExecutor(1, max_queue=2)
+    running: list[int] = []
+
+    def score(items: list[int]) -> list[int]:
+        running.append(executor.stats()["running"])
+        return [i * 10 for i in items]
+
+    batcher = MicroBatcher(score, max_size=8, max_delay=0.01, runner=executor.run_admitted_async)
+
+    async def requests() -> list[int]:
+        return await asyncio.gather(*(executor.await_admitted(batcher.submit(i)) for i in range(3)))
+
+    assert asyncio.run(requests()) == [0, 10, 20]
+    assert running == [1]
+    assert executor.stats()["completed"] == 1 and executor.stats()["queue_depth"] == 0
+
+
+def test_queued_calls_are_shed_with_overloaded() -> None:
+    executor = InferenceExecutor(1, max_queue=1)
+    batcher = MicroBatcher(lambda items: items, max_size=8, max_delay=0.05, runner=executor.run_admitted_async)
+
+    async def requests() -> list:
+        return await asyncio.gather(
+            *(executor.await_admitted(batcher.submit(i)) for i in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(requests())
+    assert results[:2] == [0, 1]
+    assert isinstance(results[2], Overloaded)
+    assert executor.stats()["rejected"] == 1
+
+
+def test_batch_waits_for_a_busy_slot() -> None:
+    """While the only slot is taken (e.g. by a streamed chunk), a flushed batch waits for it."""
+    executor = InferenceExecutor(1, max_queue=4)
+    batcher = MicroBatcher(lambda items: items, max_size=1, max_delay=0, runner=executor.run_admitted_async)
+
+    async def scenario() -> None:
+        executor._slots.acquire()
+        pending = asyncio.ensure_future(executor.await_admitted(batcher.submit(7)))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+        executor._slots.release()
+        assert await pending == 7
+
+    asyncio.run(scenario())
+    with pytest.raises(ValueError):
+        executor._slots.release()  # the batch gave its slot back
@@ -0,0 +1,67 @@
+"""
+ranking.top_k_indices against a stable full argsort, with ties at the k-th boundary on both the
+full-sort path (small matrices) and the argpartition path.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import ranking
+from ranking import top_k_indices
+
+
+def _tied_probs(rows: int, n_classes: int, seed: int = 0) -> np.ndarray:
+    """Probability rows built from a few distinct values, so most rows tie across any cut."""
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, 4, size=(rows, n_classes)).astype(float)
+    counts[counts.sum(axis=1) == 0, 0] = 1.0
+    return counts / counts.sum(axis=1, keepdims=True)
+
+
+def _expected(probs: np.ndarray, k: int) -> np.ndarray:
+    return np.argsort(-probs, axis=-1, kind="stable")[..., :k]
+
+
+# (rows, classes): full sort (few classes; few values) and argpartition (> 32 classes, >= 8192 values).
+SHAPES = [(50, 12), (20, 64), (256, 40), (300, 100)]
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("k", [1, 3, "n_classes", "more"])
+def test_matches_stable_argsort_with_ties(shape, k) -> None:
+    rows, n = shape
+    k = {"n_classes": n, "more": n + 5}.get(k, k)
+    probs = _tied_probs(rows, n)
+    got = top_k_indices(probs, k)
+    assert got.shape == (rows, min(k, n))
+    np.testing.assert_array_equal(got, _expected(probs, k))
+
+
+def test_argpartition_path_is_taken() -> None:
+    rows, n = SHAPES[-1]
+    assert n > ranking._PARTITION_MIN_CLASSES and rows * n >= ranking._PARTITION_MIN_SIZE
+
+
+@pytest.mark.parametrize("k", [1, 5, 40])
+def test_all_equal_rows_keep_index_order(k) -> None:
+    probs = np.full((256, 40), 1 / 40)
+    np.testing.assert_array_equal(top_k_indices(probs, k), np.tile(np.arange(k), (256, 1)))
+
+
+def test_tie_straddling_the_cut() -> None:
+    """k=2 where the 2nd and 3rd largest tie: the lower index wins, as with argmax."""
+    probs = np.zeros((256, 40))
+    probs[:, 39] = 0.5
+    probs[:, [30, 7, 20]] = 0.125
+    probs /= probs.sum(axis=1, keepdims=True)
+    np.testing.assert_array_equal(top_k_indices(probs, 2), np.tile([39, 7], (256, 1)))
+    np.testing.assert_array_equal(top_k_indices(probs, 1)[:, 0], probs.argmax(axis=1))
+
+
+def test_one_dimensional_and_zero_k() -> None:
+    row = _tied_probs(1, 64)[0]
+    np.testing.assert_array_equal(top_k_indices(row, 3), _expected(row, 3))
+    assert top_k_indices(row, 0).shape == (0,)
+    assert top_k_indices(_tied_probs(5, 12), 0).shape == (5, 0)
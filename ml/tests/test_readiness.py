@@ -0,0 +1,44 @@
+"""
+readiness.start() / status() on a fresh process: a probe that arrives before the background
+thread has begun loading must see "loading" and must not load on its own thread.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import model_loader
+import readiness
+
+
+def test_probe_before_background_load_runs(monkeypatch) -> None:
+    for name, value in (("_started_at", None), ("_ready_at", None), ("_thread", None)):
+        monkeypatch.setattr(readiness, name, value)
+    monkeypatch.setattr(model_loader, "_models", None)
+    monkeypatch.setattr(model_loader, "_load_error", None)
+    monkeypatch.setattr(model_loader, "_load_begun", False)
+    monkeypatch.setattr(model_loader, "_load_done", threading.Event())
+    monkeypatch.setenv("CAREER_WARMUP", "0")
+
+    release = threading.Event()
+    loaded_on: list[str] = []
+
+    def gated_load() -> None:
+        loaded_on.append(threading.current_thread().name)
+        release.wait(5)
+        model_loader._load_error = "no artifacts"
+        model_loader._load_done.set()
+
+    monkeypatch.setattr(readiness, "load_artifacts", gated_load)
+    monkeypatch.setattr(model_loader, "load_artifacts", gated_load)
+
+    assert readiness.start() is True
+    status = readiness.status()
+    assert status["phase"] == "loading" and status["error"] is None
+    assert model_loader.last_load_error() is None  # lazy getters do not load either
+
+    release.set()
+    readiness.wait(5)
+    assert loaded_on == ["artifact-startup"]
+    status = readiness.status()
+    assert status["phase"] == "failed" and status["error"] == "no artifacts"